@@ -76,6 +76,95 @@ def test(ctx, verbose=False, types=False, nocov=False, provider=None, path=None)
     ctx.run(cmd, pty=True)
 
 
+@task
+def bench_listing(ctx, count=10000, batch_size=None):
+    """Time serializing and encoding a folder listing of ``count`` files for a few providers whose
+    metadata can be built from a plain dict, the way ``get_folder`` does it.
+
+    :param ctx: the ``invoke`` context
+    :param count: number of files in the listing
+    :param batch_size: entries encoded at a time, ``LISTING_BATCH_SIZE`` by default
+    """
+    import time
+
+    from waterbutler.core.path import WaterButlerPath
+    from waterbutler.server.utils import encode_listing
+    from waterbutler.providers.s3.metadata import S3FileMetadata
+    from waterbutler.providers.box.metadata import BoxFileMetadata
+    from waterbutler.providers.dropbox.metadata import DropboxFileMetadata
+    from waterbutler.providers.filesystem.metadata import FileSystemFileMetadata
+
+    modified = '2017-04-18T18:30:01.000Z'
+    factories = {
+        's3': lambda i: S3FileMetadata({
+            'Key': 'folder/file {}.txt'.format(i), 'LastModified': modified,
+            'ETag': '"{:032x}"'.format(i), 'Size': str(i), 'StorageClass': 'STANDARD',
+        }),
+        'box': lambda i: BoxFileMetadata({
+            'id': str(i), 'name': 'file {}.txt'.format(i), 'size': i, 'modified_at': modified,
+            'created_at': modified, 'etag': '0', 'sha1': '{:040x}'.format(i),
+        }, WaterButlerPath('/folder/file {}.txt'.format(i), _ids=('0', '1', str(i)))),
+        'dropbox': lambda i: DropboxFileMetadata({
+            'path_display': '/folder/file {}.txt'.format(i), 'size': i,
+            'server_modified': modified, 'rev': '{:x}'.format(i), 'id': 'id:{}'.format(i),
+            'content_hash': '{:064x}'.format(i),
+        }, '/', 'dropbox'),
+        'filesystem': lambda i: FileSystemFileMetadata({
+            'path': '/folder/file {}.txt'.format(i), 'size': i, 'modified': modified,
+            'modified_utc': modified, 'created_utc': modified, 'mime_type': 'text/plain',
+        }, '/'),
+    }
+
+    count, batch_size = int(count), batch_size and int(batch_size)
+    for name, factory in factories.items():
+        items = [factory(i) for i in range(count)]
+        start = time.perf_counter()
+        size = sum(len(chunk) for chunk in encode_listing(items, 'guid0', batch_size=batch_size))
+        elapsed = time.perf_counter() - start
+        print('{:<12} {:>8} items {:>12} bytes {:>8.3f}s {:>8.1f}us/item'.format(
+            name, count, size, elapsed, elapsed / count * 1e6))
+
+
+@task
+def bench_chunking(ctx, size=64 * 1024 * 1024):
+    """Compare fixed chunk sizes with ``AdaptiveChunkSize`` for a ``size`` byte transfer over a few
+    simulated links.  Each chunk costs a fixed overhead plus its size over the link's bandwidth,
+    and is fed back to the controller the way ``write_stream`` does after a flush.  Reports the
+    total time, the mean chunk size, and the longest a single chunk held up the transfer.
+
+    :param ctx: the ``invoke`` context
+    :param size: bytes to transfer
+    """
+    from waterbutler.core.chunking import AdaptiveChunkSize
+
+    links = (  # name, bytes per second, seconds of overhead per chunk
+        ('lan', 1e9, 0.0005),
+        ('broadband', 12.5e6, 0.001),
+        ('mobile', 250e3, 0.002),
+    )
+    strategies = (
+        ('fixed 16KB', lambda: AdaptiveChunkSize('download', minimum=16384, maximum=16384)),
+        ('fixed 64KB', lambda: AdaptiveChunkSize('download', minimum=65536, maximum=65536)),
+        ('fixed 1MB', lambda: AdaptiveChunkSize('download', minimum=2 ** 20, maximum=2 ** 20)),
+        ('adaptive', lambda: AdaptiveChunkSize('download')),
+    )
+
+    size = int(size)
+    for link, bandwidth, overhead in links:
+        for name, factory in strategies:
+            chunking = factory()
+            elapsed = longest = 0.0
+            sent = chunks = 0
+            while sent < size:
+                chunk = min(chunking.size, size - sent)
+                seconds = overhead + chunk / bandwidth
+                chunking.record(chunk, seconds)
+                elapsed, longest = elapsed + seconds, max(longest, seconds)
+                sent, chunks = sent + chunk, chunks + 1
+            print('{:<10} {:<11} {:>9.2f}s {:>8} chunks {:>9.0f} bytes/chunk {:>8.3f}s longest'
+                  .format(link, name, elapsed, chunks, sent / chunks, longest))
+
+
 @task
 def celery(ctx, loglevel='INFO', hostname='%h'):
 
@@ -1,3 +1,5 @@
+import asyncio
+import threading
 from unittest import mock
 
 import pytest
@@ -8,8 +10,9 @@ from tests.server.api.v1.utils import ServerTestCase
 
 from waterbutler.auth.osf import settings
 from waterbutler.core.auth import AuthType
-from waterbutler.auth.osf.handler import OsfAuthHandler, EXPORT_DATA_FAKE_NODE_ID
-from waterbutler.core.exceptions import (UnsupportedHTTPMethodError,
+from waterbutler.auth.osf.handler import OsfAuthHandler, EXPORT_DATA_FAKE_NODE_ID, run_crypto
+from waterbutler.core.exceptions import (AuthError,
+                                            UnsupportedHTTPMethodError,
                                             UnsupportedActionError)
 from waterbutler.settings import MFR_IDENTIFYING_HEADER
 
@@ -199,3 +202,134 @@ class TestActionMapping:
         request.headers = {settings.MFR_ACTION_HEADER: 'bad-action'}
         with pytest.raises(UnsupportedActionError):
             await handler.get('test', 'test', request)
+
+
+class TestAuthCache:
+
+    def _request(self, method='get', authorization='Bearer token'):
+        request = mock.Mock()
+        request.method = method
+        request.headers = {'Authorization': authorization}
+        request.query_arguments = {}
+        request.cookies = {}
+        request.uri = '/'
+        return request
+
+    def _handler(self):
+        handler = OsfAuthHandler()
+        handler.make_request = utils.MockCoroutine(
+            side_effect=lambda *_: {'auth': {}, 'credentials': {}, 'callback_url': 'dummy'}
+        )
+        return handler
+
+    @pytest.mark.asyncio
+    async def test_cached(self):
+        handler = self._handler()
+
+        first = await handler.get('test', 'test', self._request())
+        first['credentials']['mutated'] = True
+        second = await handler.get('test', 'test', self._request())
+
+        assert handler.make_request.call_count == 1
+        assert second == {'auth': {'callback_url': 'dummy'}, 'credentials': {},
+                          'callback_url': 'dummy'}
+
+    @pytest.mark.asyncio
+    async def test_callback_log_applied_to_cached(self):
+        handler = self._handler()
+
+        await handler.get('test', 'test', self._request())
+        payload = await handler.get('test', 'test', self._request(), callback_log=False)
+
+        assert handler.make_request.call_count == 1
+        assert payload['auth']['callback_url'] == ''
+
+    @pytest.mark.asyncio
+    async def test_keyed_by_identity_and_action(self):
+        handler = self._handler()
+
+        await handler.get('test', 'test', self._request())
+        await handler.get('test', 'test', self._request(authorization='Bearer other'))
+        await handler.get('test', 'test', self._request(method='head'))
+        await handler.get('other', 'test', self._request())
+
+        assert handler.make_request.call_count == 4
+
+    @pytest.mark.asyncio
+    async def test_keyed_by_path_and_version(self):
+        handler = self._handler()
+
+        await handler.get('test', 'test', self._request(), path='/a')
+        await handler.get('test', 'test', self._request(), path='/a')
+        await handler.get('test', 'test', self._request(), path='/b')
+        await handler.get('test', 'test', self._request(), path='/a', version='2')
+
+        assert handler.make_request.call_count == 3
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('method', ['put', 'delete'])
+    async def test_write_actions_bypass(self, method):
+        handler = self._handler()
+
+        await handler.get('test', 'test', self._request(method=method))
+        await handler.get('test', 'test', self._request(method=method))
+
+        assert handler.make_request.call_count == 2
+        assert len(handler.cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_not_cached(self):
+        handler = self._handler()
+        handler.make_request.side_effect = [AuthError('nope', code=403),
+                                            {'auth': {}, 'callback_url': 'dummy'}]
+
+        with pytest.raises(AuthError):
+            await handler.get('test', 'test', self._request())
+        await handler.get('test', 'test', self._request())
+
+        assert handler.make_request.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_coalesced(self, monkeypatch):
+        handler = self._handler()
+        monkeypatch.setattr(handler.cache, 'ttl', 0)
+
+        calls = []
+
+        async def slow_request(*args):
+            calls.append(args)
+            await asyncio.sleep(0.01)
+            return {'auth': {}, 'callback_url': 'dummy'}
+
+        handler.make_request = slow_request
+        results = await asyncio.gather(*[handler.get('test', 'test', self._request())
+                                         for _ in range(3)])
+
+        assert len(calls) == 1
+        assert all(result['auth']['callback_url'] == 'dummy' for result in results)
+
+
+class TestCrypto:
+
+    @pytest.mark.asyncio
+    async def test_payload_round_trip(self):
+        handler = OsfAuthHandler()
+        params = await handler.build_payload_async({'nid': 'test'}, view_only='abc', cookie='c')
+
+        assert params['view_only'] == 'abc'
+        data = handler.decode_payload(params['payload'])
+        assert data['data'] == {'nid': 'test', 'cookie': 'c'}
+
+    @pytest.mark.asyncio
+    async def test_run_crypto_inline(self, monkeypatch):
+        monkeypatch.setattr(settings, 'CRYPTO_OFFLOAD_SIZE', 100)
+        thread_names = []
+
+        def work():
+            thread_names.append(threading.current_thread().name)
+            return 1
+
+        assert await run_crypto(10, work) == 1
+        assert await run_crypto(100, work) == 1
+        assert thread_names[0] == threading.current_thread().name
+        assert thread_names[1].startswith('osf-auth-crypto')
@@ -8,6 +8,10 @@ settings.config['TASKS_CONFIG'] = {
 
 import aiohttpretty
 
+from waterbutler.auth.osf.handler import auth_cache
+from waterbutler.core.cache import path_id_cache, metadata_cache
+from waterbutler.core.circuitbreaker import circuit_breakers
+
 
 def pytest_configure(config):
     config.addinivalue_line(
@@ -17,6 +21,13 @@ def pytest_configure(config):
 
 
 def pytest_runtest_setup(item):
+    # Mocked upstream failures must not trip the process-wide circuit breakers for later tests
+    circuit_breakers.clear()
+    # ... and ids resolved against one test's mocked responses must not leak into another
+    path_id_cache.clear()
+    metadata_cache.clear()
+    # ... nor OSF auth answers
+    auth_cache.clear()
     if 'aiohttpretty' in item.keywords:
         aiohttpretty.clear()
         aiohttpretty.activate()
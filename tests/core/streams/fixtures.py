@@ -1,3 +1,4 @@
+import asyncio
 from http import HTTPStatus
 
 import pytest
@@ -35,6 +36,33 @@ class MockResponseNoContent:
     release = MockCoroutine()
 
 
+class MockRangedResponse:
+    """Response to a ``GET`` for ``data[start:end + 1]``."""
+
+    def __init__(self, data, start, end, status=HTTPStatus.PARTIAL_CONTENT, etag='"etag"'):
+        body = data[start:end + 1]
+        self.status = status
+        self.headers = {
+            'ETag': etag,
+            'Content-Type': 'text/plain',
+            'Content-Length': str(len(body)),
+            'Content-Range': 'bytes {}-{}/{}'.format(start, end, len(data)),
+        }
+        self.content = asyncio.StreamReader()
+        self.content.feed_data(body)
+        self.content.feed_eof()
+        self.released = False
+
+    async def read(self):
+        return (await self.content.read())
+
+    async def release(self):
+        self.released = True
+
+    def close(self):
+        self.released = True
+
+
 @pytest.fixture
 def mock_response_stream_reader():
     return ResponseStreamReader(MockResponse(), size=None, name='test stream')
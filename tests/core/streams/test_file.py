@@ -1,4 +1,8 @@
+import io
 import os
+import asyncio
+import tempfile
+from unittest import mock
 
 import pytest
 
@@ -75,6 +79,85 @@ class TestFileStreamReader:
             at_eof = reader.at_eof()
             assert at_eof
 
+    @pytest.mark.asyncio
+    async def test_file_stream_reader_binary(self):
+        with open(DUMMY_FILE, 'rb') as fp:
+            fp.seek(3)
+            reader = streams.FileStreamReader(fp)
+            assert reader.preadable
+
+            chunks = []
+            while True:
+                chunk = await reader.read(10)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+
+            assert chunks == [b'abcdefghij', b'klmnopqrst', b'uvwxyz\n']
+            assert reader.at_eof()
+            assert fp.tell() == 3  # reads go around the file object
+
+    @pytest.mark.asyncio
+    async def test_file_stream_reader_read_ahead(self):
+        with open(DUMMY_FILE, 'rb') as fp:
+            reader = streams.FileStreamReader(fp)
+
+            assert await reader.read(5) == b'abcde'
+            assert [(offset, size) for offset, size, _ in reader.read_ahead] == [(5, 5), (10, 5)]
+
+            assert await reader.read(5) == b'fghij'
+            assert [(offset, size) for offset, size, _ in reader.read_ahead] == [(10, 5), (15, 5)]
+
+            # a read of another size starts the queue over
+            assert await reader.read(8) == b'klmnopqr'
+            assert [(offset, size) for offset, size, _ in reader.read_ahead] == [(18, 8), (26, 8)]
+
+            assert await reader.read() == b'stuvwxyz\n'
+            assert await reader.read() == b''
+
+    @pytest.mark.asyncio
+    async def test_file_stream_reader_unflushed(self):
+        with tempfile.TemporaryFile() as fp:
+            fp.write(b'not flushed yet')
+            reader = streams.FileStreamReader(fp)
+
+            assert await reader.read() == b'not flushed yet'
+
+    @pytest.mark.asyncio
+    async def test_file_stream_reader_close_while_reading_ahead(self):
+        fp = open(DUMMY_FILE, 'rb')
+        reader = streams.FileStreamReader(fp)
+        await reader.read(5)
+
+        reader.close()
+
+        assert not reader.read_ahead
+        assert reader.at_eof()
+        for _ in range(100):
+            if fp.closed:
+                break
+            await asyncio.sleep(0.01)
+        assert fp.closed
+
+    @pytest.mark.asyncio
+    async def test_file_range(self):
+        with open(DUMMY_FILE, 'rb') as fp:
+            reader = streams.FileStreamReader(fp)
+            assert reader.file_range() == (fp, 0, 27)
+
+            await reader.read(5)
+            assert reader.file_range() is None
+
+    def test_file_range_teed(self):
+        with open(DUMMY_FILE, 'rb') as fp:
+            reader = streams.FileStreamReader(fp)
+            reader.add_writer('hash', mock.Mock())
+            assert reader.file_range() is None
+
+    def test_file_range_no_descriptor(self):
+        reader = streams.FileStreamReader(io.BytesIO(b'abc'))
+        assert reader.file_range() is None
+
 
 class TestPartialFileStreamReader:
 
@@ -133,3 +216,28 @@ class TestPartialFileStreamReader:
             assert data == b''
             at_eof = reader.at_eof()
             assert at_eof
+
+    @pytest.mark.parametrize('byte_range,expected', [
+        ((0, 26), 27),
+        ((3, 10), 8),
+        ((3, 30), None),
+    ])
+    def test_file_range(self, byte_range, expected):
+        with open(DUMMY_FILE, 'rb') as fp:
+            reader = streams.PartialFileStreamReader(fp, byte_range)
+            if expected is None:
+                assert reader.file_range() is None
+            else:
+                assert reader.file_range() == (fp, byte_range[0], expected)
+
+    @pytest.mark.asyncio
+    async def test_partial_file_stream_reader_binary(self):
+        with open(DUMMY_FILE, 'rb') as fp:
+            reader = streams.PartialFileStreamReader(fp, (2, 12))
+
+            assert await reader.read(4) == b'cdef'
+            assert [(offset, size) for offset, size, _ in reader.read_ahead] == [(6, 4), (10, 3)]
+            assert await reader.read(4) == b'ghij'
+            assert await reader.read(4) == b'klm'
+            assert await reader.read(4) == b''
+            assert reader.at_eof()
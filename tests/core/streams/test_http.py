@@ -1,12 +1,35 @@
+import asyncio
 from unittest import mock
 
 import pytest
 
+from waterbutler.core import exceptions
+from waterbutler.core.streams import RangedResponseStream
 from tests.core.streams.fixtures import (mock_content_eof, MockResponseNoContent,
                                          mock_content, MockResponseNoContentLength,
                                          mock_response_stream_reader, MockResponse,
                                          mock_response_stream_reader_no_size,
-                                         mock_response_stream_reader_no_content)
+                                         mock_response_stream_reader_no_content,
+                                         MockRangedResponse)
+
+DATA = bytes(range(95))
+
+
+def ranged_fetch(calls, data=DATA, short=False, **kwargs):
+    async def fetch(byte_range):
+        calls.append(byte_range)
+        await asyncio.sleep(0)
+        start, end = byte_range
+        response = MockRangedResponse(data, start, end, **kwargs)
+        if short:
+            response.content = MockRangedResponse(data, start, end - 1).content
+        return response
+    return fetch
+
+
+def ranged_stream(fetch, first_end=19):
+    return RangedResponseStream(MockRangedResponse(DATA, 0, first_end), fetch, len(DATA),
+                                part_size=10, concurrency=2, name='test stream')
 
 
 class TestResponseStreamReader:
@@ -36,3 +59,166 @@ class TestResponseStreamReader:
         assert (await mock_response_stream_reader_no_content.read()) is None
         mock_response_stream_reader_no_content.feed_eof.assert_called_once_with()
         MockResponseNoContent.release.assert_called_once_with()
+
+
+class TestRangedResponseStream:
+
+    @pytest.mark.asyncio
+    async def test_reads_in_order(self):
+        calls = []
+        stream = ranged_stream(ranged_fetch(calls))
+
+        assert stream.name == 'test stream'
+        assert stream.size == 95
+        assert not stream.partial
+        assert stream.content_type == 'text/plain'
+
+        chunks = []
+        chunk = await stream.read(7)
+        while chunk:
+            chunks.append(chunk)
+            chunk = await stream.read(7)
+
+        assert b''.join(chunks) == DATA
+        assert max(len(chunk) for chunk in chunks) == 7
+        assert calls == [(20, 29), (30, 39), (40, 49), (50, 59), (60, 69), (70, 79), (80, 89),
+                         (90, 94)]
+        assert stream.at_eof()
+
+    @pytest.mark.asyncio
+    async def test_fetches_window(self):
+        calls = []
+        stream = ranged_stream(ranged_fetch(calls))
+
+        assert await stream.read(5) == DATA[:5]
+        await asyncio.sleep(0)
+
+        assert calls == [(20, 29), (30, 39)]
+        assert len(stream.parts) == 2
+
+    @pytest.mark.asyncio
+    async def test_read_all(self):
+        calls = []
+        stream = ranged_stream(ranged_fetch(calls))
+        first = stream.response
+
+        assert await stream.read() == DATA
+        assert first.released
+        assert len(calls) == 8
+
+    @pytest.mark.asyncio
+    async def test_first_response_is_everything(self):
+        calls = []
+        stream = ranged_stream(ranged_fetch(calls), first_end=94)
+
+        assert await stream.read() == DATA
+        assert calls == []
+
+    @pytest.mark.asyncio
+    async def test_changed_while_downloading(self):
+        stream = ranged_stream(ranged_fetch([], etag='"changed"'))
+
+        assert await stream.read(20) == DATA[:20]
+        with pytest.raises(exceptions.DownloadError):
+            await stream.read(20)
+
+    @pytest.mark.asyncio
+    async def test_range_ignored(self):
+        stream = ranged_stream(ranged_fetch([], status=200))
+
+        with pytest.raises(exceptions.DownloadError):
+            await stream.read()
+
+    @pytest.mark.asyncio
+    async def test_short_part(self):
+        stream = ranged_stream(ranged_fetch([], short=True))
+
+        assert await stream.read(20) == DATA[:20]
+        with pytest.raises(exceptions.DownloadError) as exc:
+            await stream.read(20)
+
+        assert exc.value.message == 'Expected 10 bytes at offset 20 but got 9'
+        assert not stream.parts
+
+    @pytest.mark.asyncio
+    async def test_close(self):
+        stream = ranged_stream(ranged_fetch([]))
+        first = stream.response
+
+        await stream.read(5)
+        parts = [part for _, part in stream.parts]
+        stream.close()
+        await asyncio.sleep(0)
+
+        assert first.released
+        assert stream.response is None
+        assert all(part.cancelled() for part in parts)
+
+    @pytest.mark.asyncio
+    async def test_buffer_budget(self, monkeypatch):
+        monkeypatch.setattr(RangedResponseStream, 'buffered', 0)
+        monkeypatch.setattr('waterbutler.settings.PARALLEL_DOWNLOAD_MAX_BUFFER', 25)
+        calls = []
+        first, second = ranged_stream(ranged_fetch(calls)), ranged_stream(ranged_fetch(calls))
+
+        await first.read(5)
+        await second.read(5)
+
+        # the first stream takes two parts, which leaves no room for the second
+        assert (len(first.parts), len(second.parts)) == (2, 0)
+        assert RangedResponseStream.buffered == 20
+
+        assert await second.read(15) == DATA[5:20]
+        assert await second.read(10) == DATA[20:30]
+        # the part is read as it arrives rather than buffered
+        assert second.response is not None
+        assert RangedResponseStream.buffered == 20
+
+        assert await first.read() == DATA[5:]
+        assert await second.read() == DATA[30:]
+        assert RangedResponseStream.buffered == 0
+
+    @pytest.mark.asyncio
+    async def test_streamed_part_checked(self, monkeypatch):
+        monkeypatch.setattr('waterbutler.settings.PARALLEL_DOWNLOAD_MAX_BUFFER', 0)
+        stream = ranged_stream(ranged_fetch([], etag='"changed"'))
+
+        assert await stream.read(20) == DATA[:20]
+        with pytest.raises(exceptions.DownloadError):
+            await stream.read(20)
+        assert stream.response is None
+
+    @pytest.mark.asyncio
+    async def test_short_streamed_part(self, monkeypatch):
+        monkeypatch.setattr('waterbutler.settings.PARALLEL_DOWNLOAD_MAX_BUFFER', 0)
+        stream = ranged_stream(ranged_fetch([], short=True))
+
+        assert await stream.read(20) == DATA[:20]
+        assert await stream.read(20) == DATA[20:29]
+        with pytest.raises(exceptions.DownloadError) as exc:
+            await stream.read(20)
+
+        assert exc.value.message == 'Expected 10 bytes at offset 20 but got 9'
+
+    @pytest.mark.asyncio
+    async def test_close_releases_budget(self, monkeypatch):
+        monkeypatch.setattr(RangedResponseStream, 'buffered', 0)
+        stream = ranged_stream(ranged_fetch([]))
+
+        await stream.read(5)
+        assert RangedResponseStream.buffered == 20
+        stream.close()
+
+        assert RangedResponseStream.buffered == 0
+
+    @pytest.mark.asyncio
+    async def test_abandoned_part_error_retrieved(self):
+        stream = ranged_stream(ranged_fetch([], status=200))
+
+        await stream.read(5)
+        parts = [part for _, part in stream.parts]
+        await asyncio.wait(parts)
+
+        # nobody awaits the failed parts, they mustn't log 'exception was never retrieved'
+        assert all(not part._log_traceback for part in parts)
+        stream.close()
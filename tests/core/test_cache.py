@@ -0,0 +1,256 @@
+from unittest import mock
+
+import pytest
+
+from waterbutler.core.path import WaterButlerPath
+from waterbutler.core.cache import TTLCache, PathIdCache, MetadataCache
+
+from tests.utils import MockCoroutine, MockProvider
+
+
+@pytest.fixture
+def cache():
+    return TTLCache(maxsize=2, ttl=10)
+
+
+class TestTTLCache:
+
+    def test_get_set(self, cache):
+        assert cache.get('a') is None
+        cache.set('a', 1)
+
+        assert cache.get('a') == 1
+        assert cache.stats() == {'size': 1, 'hits': 1, 'misses': 1}
+
+    def test_expiry(self, cache):
+        cache.set('a', 1, ttl=-1)
+
+        assert cache.get('a', 'default') == 'default'
+        assert len(cache) == 0
+
+    def test_lru_eviction(self, cache):
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert cache.get('c') == 3
+
+    def test_invalidate(self, cache):
+        cache.set(('x', 1), 1)
+        cache.set(('y', 1), 2)
+
+        assert cache.invalidate(lambda key: key[0] == 'x') == 1
+        assert cache.get(('x', 1)) is None
+        assert cache.get(('y', 1)) == 2
+
+    def test_pop(self, cache):
+        cache.set('a', 1)
+
+        assert cache.pop('a') == 1
+        assert cache.pop('a', 'gone') == 'gone'
+
+    @pytest.mark.parametrize('maxsize,ttl', [(0, 10), (10, 0)])
+    def test_disabled(self, maxsize, ttl):
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        cache.set('a', 1)
+
+        assert not cache.enabled
+        assert cache.get('a') is None
+
+
+class TestPathIdCache:
+
+    @pytest.fixture
+    def id_cache(self):
+        return PathIdCache(maxsize=10, ttl=10)
+
+    def test_lookup_store(self, id_cache):
+        provider = MockProvider(creds={'token': 'naps'})
+        assert id_cache.lookup(provider, 'root', 'foo', 'folder') is None
+
+        id_cache.store(provider, 'root', 'foo', 'folder', 'foo-id', {'id': 'foo-id'})
+
+        assert id_cache.lookup(provider, 'root', 'foo', 'folder') == {'id': 'foo-id'}
+        assert id_cache.lookup(provider, 'root', 'foo', 'file') is None
+        assert id_cache.lookup(provider, 'other', 'foo', 'folder') is None
+
+    def test_scoped_by_credentials(self, id_cache):
+        id_cache.store(MockProvider(creds={'token': 'naps'}), 'root', 'foo', None, 'foo-id', 'foo-id')
+
+        assert id_cache.lookup(MockProvider(creds={'token': 'naps'}), 'root', 'foo') == 'foo-id'
+        assert id_cache.lookup(MockProvider(creds={'token': 'other'}), 'root', 'foo') is None
+
+    def test_copies_values(self, id_cache):
+        provider = MockProvider()
+        value = {'id': 'foo-id'}
+        id_cache.store(provider, 'root', 'foo', None, 'foo-id', value)
+        value['id'] = 'changed'
+        id_cache.lookup(provider, 'root', 'foo')['id'] = 'changed'
+
+        assert id_cache.lookup(provider, 'root', 'foo') == {'id': 'foo-id'}
+
+    def test_forget(self, id_cache):
+        provider = MockProvider(creds={'token': 'naps'})
+        other_user = MockProvider(creds={'token': 'other'})
+        id_cache.store(provider, 'root', 'foo', None, 'foo-id', 'foo-id')
+        id_cache.store(other_user, 'root', 'foo', None, 'foo-id', 'foo-id')
+        id_cache.store(provider, 'foo-id', 'bar', None, 'bar-id', 'bar-id')
+        id_cache.store(provider, 'root', 'baz', None, 'baz-id', 'baz-id')
+
+        assert id_cache.forget(provider, 'foo-id') == 3
+        assert id_cache.lookup(provider, 'root', 'foo') is None
+        assert id_cache.lookup(other_user, 'root', 'foo') is None
+        assert id_cache.lookup(provider, 'foo-id', 'bar') is None
+        assert id_cache.lookup(provider, 'root', 'baz') == 'baz-id'
+
+
+class TestMetadataCache:
+
+    @pytest.fixture
+    def metadata_cache(self):
+        return MetadataCache(maxsize=10, ttl=10, max_age=300)
+
+    @pytest.fixture
+    def folder(self):
+        return WaterButlerPath('/folder/')
+
+    @pytest.mark.asyncio
+    async def test_listing(self, metadata_cache, folder):
+        provider = MockProvider()
+        fetch = MockCoroutine(return_value={'data': []})
+
+        assert await metadata_cache.listing(provider, folder, ('key', ), fetch) == {'data': []}
+        assert await metadata_cache.listing(provider, folder, ('key', ), fetch) == {'data': []}
+        await metadata_cache.listing(provider, folder, ('other', ), fetch)
+
+        assert fetch.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_scoped_by_credentials(self, metadata_cache, folder):
+        fetch = MockCoroutine(return_value={'data': []})
+
+        await metadata_cache.listing(MockProvider(creds={'token': 'naps'}), folder, (), fetch)
+        await metadata_cache.listing(MockProvider(creds={'token': 'other'}), folder, (), fetch)
+
+        assert fetch.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_scope(self, metadata_cache, folder):
+        provider = MockProvider(creds={'token': 'naps'})
+        other_user = MockProvider(creds={'token': 'other'})
+        fetch = MockCoroutine(return_value={'data': []})
+        await metadata_cache.listing(provider, folder, (), fetch)
+        await metadata_cache.listing(other_user, folder, (), fetch)
+
+        assert metadata_cache.invalidate_scope(provider) == 1
+
+        await metadata_cache.listing(provider, folder, (), fetch)
+        await metadata_cache.listing(other_user, folder, (), fetch)
+        assert fetch.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_none_not_cached(self, metadata_cache, folder):
+        fetch = MockCoroutine(return_value=None)
+
+        assert await metadata_cache.listing(MockProvider(), folder, (), fetch) is None
+
+        assert len(metadata_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_invalidated_while_fetching(self, metadata_cache, folder):
+        provider = MockProvider()
+
+        async def fetch():
+            # a write finishes while the listing is in flight
+            metadata_cache.invalidate_scope(provider)
+            return {'data': []}
+
+        await metadata_cache.listing(provider, folder, (), fetch)
+
+        assert len(metadata_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_expires_without_validator(self, metadata_cache, folder):
+        provider = MockProvider()
+        fetch = MockCoroutine(return_value={'data': []})
+
+        with mock.patch('time.monotonic', return_value=100):
+            await metadata_cache.listing(provider, folder, (), fetch)
+        with mock.patch('time.monotonic', return_value=111):
+            await metadata_cache.listing(provider, folder, (), fetch)
+
+        assert fetch.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_revalidates(self, metadata_cache, folder):
+        provider = MockProvider()
+        provider.folder_validator = MockCoroutine(return_value='etag-1')
+        fetch = MockCoroutine(return_value={'data': []})
+
+        with mock.patch('time.monotonic', return_value=100):
+            await metadata_cache.listing(provider, folder, (), fetch)
+        with mock.patch('time.monotonic', return_value=200):
+            await metadata_cache.listing(provider, folder, (), fetch)
+
+        assert fetch.call_count == 1
+        assert metadata_cache.stats()['revalidated'] == 1
+
+        provider.folder_validator.return_value = 'etag-2'
+        with mock.patch('time.monotonic', return_value=300):
+            await metadata_cache.listing(provider, folder, (), fetch)
+
+        assert fetch.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_evicts_by_bytes(self, folder):
+        metadata_cache = MetadataCache(maxsize=10, ttl=10, max_age=300, max_bytes=10)
+        provider = MockProvider()
+
+        for key, listing in (('one', [b'12345']), ('two', [b'1234'])):
+            await metadata_cache.listing(provider, folder, (key, ),
+                                         MockCoroutine(return_value=listing))
+        assert metadata_cache.bytes == 9
+
+        await metadata_cache.listing(provider, folder, ('three', ),
+                                     MockCoroutine(return_value=[b'123']))
+
+        assert len(metadata_cache) == 2
+        assert metadata_cache.bytes == 7
+        assert metadata_cache.stats()['bytes'] == 7
+
+    @pytest.mark.asyncio
+    async def test_refuses_listing_over_max_bytes(self, folder):
+        metadata_cache = MetadataCache(maxsize=10, ttl=10, max_age=300, max_bytes=10)
+        provider = MockProvider()
+        fetch = MockCoroutine(return_value=[b'123456', b'789012'])
+
+        assert await metadata_cache.listing(provider, folder, (), fetch) == [b'123456', b'789012']
+
+        assert len(metadata_cache) == 0
+        assert metadata_cache.bytes == 0
+
+    @pytest.mark.asyncio
+    async def test_bytes_released(self, metadata_cache, folder):
+        provider = MockProvider()
+        await metadata_cache.listing(provider, folder, (), MockCoroutine(return_value=[b'123']))
+        assert metadata_cache.bytes == 3
+
+        metadata_cache.invalidate_scope(provider)
+
+        assert metadata_cache.bytes == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, folder):
+        metadata_cache = MetadataCache(maxsize=10, ttl=0)
+        provider = MockProvider()
+        provider.folder_validator = MockCoroutine(return_value='etag-1')
+        fetch = MockCoroutine(return_value={'data': []})
+
+        await metadata_cache.listing(provider, folder, (), fetch)
+        await metadata_cache.listing(provider, folder, (), fetch)
+
+        assert fetch.call_count == 2
+        assert not provider.folder_validator.called
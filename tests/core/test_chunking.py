@@ -0,0 +1,108 @@
+from unittest import mock
+
+import pytest
+
+from waterbutler.core import chunking
+from waterbutler.core import streams
+from waterbutler.core.metrics import HistogramFamily
+from waterbutler.core.chunking import AdaptiveChunkSize, read_chunk
+
+
+@pytest.fixture
+def sizes(monkeypatch):
+    family = HistogramFamily('test_bytes', 'Test', ('direction', ), buckets=(16384, 65536))
+    monkeypatch.setattr(chunking, 'chunk_sizes', family)
+    return family
+
+
+@pytest.fixture
+def controller(sizes):
+    return AdaptiveChunkSize('download', minimum=16384, maximum=262144, target=0.05)
+
+
+class TestAdaptiveChunkSize:
+
+    def test_starts_at_chunk_size(self, controller):
+        assert controller.size == 65536
+
+    def test_start_clamped(self, sizes):
+        assert AdaptiveChunkSize('download', minimum=131072, maximum=262144).size == 131072
+        assert AdaptiveChunkSize('download', minimum=4096, maximum=16384).size == 16384
+
+    def test_grows_on_fast_link(self, controller):
+        # 64KB in 1ms: way under the target
+        assert controller.record(65536, 0.001) == 131072
+        assert controller.record(131072, 0.001) == 262144
+        assert controller.record(262144, 0.001) == 262144
+
+    def test_shrinks_on_slow_link(self, controller):
+        # 64KB in 1s: way over the target
+        assert controller.record(65536, 1) == 32768
+        assert controller.record(32768, 1) == 16384
+        assert controller.record(16384, 1) == 16384
+
+    def test_holds_near_target(self, controller):
+        assert controller.record(65536, 0.05) == 65536
+        assert controller.record(65536, 0.09) == 65536
+        assert controller.record(65536, 0.03) == 65536
+
+    def test_rate_scales_to_current_size(self, controller):
+        # 1MB flushed in 0.1s is ~6ms per 64KB chunk
+        assert controller.record(1048576, 0.1) == 131072
+
+    def test_full_backlog_shrinks(self, controller):
+        assert controller.record(65536, 0.001, backlog=1) == 32768
+
+    def test_partial_backlog_holds(self, controller):
+        assert controller.record(65536, 0.001, backlog=0.5) == 65536
+
+    def test_nothing_sent(self, controller):
+        assert controller.record(0, 1) == 65536
+
+    def test_disabled(self, sizes):
+        with mock.patch('waterbutler.server.settings.ADAPTIVE_CHUNK_SIZE', False):
+            controller = AdaptiveChunkSize('download', minimum=16384, maximum=262144)
+
+        assert controller.size == 65536
+        assert controller.record(65536, 0.001) == 65536
+        assert controller.record(65536, 1) == 65536
+
+    def test_observes_sizes(self, controller, sizes):
+        controller.record(65536, 1)
+        controller.record(32768, 1)
+
+        histogram = sizes.labels('download')
+        assert histogram.count == 2
+        assert histogram.sum == 65536 + 32768
+        assert histogram.cumulative() == [(16384, 0), (65536, 2), (float('inf'), 2)]
+
+    def test_laps(self, controller):
+        with mock.patch('waterbutler.core.chunking.time.monotonic', side_effect=[10, 11]):
+            controller.end_lap()
+            controller.start_lap(65536)
+            controller.end_lap()
+            controller.end_lap()
+
+        assert controller.size == 32768
+
+
+class TestReadChunk:
+
+    @pytest.mark.asyncio
+    async def test_sizes_upload_chunks(self, sizes):
+        stream = streams.StringStream(b'x' * 200000)
+
+        chunks = [chunk async for chunk in stream]
+
+        assert b''.join(chunks) == b'x' * 200000
+        assert stream._chunking.direction == 'upload'
+        assert len(chunks[0]) == 65536
+        # each chunk is recorded when the next one is asked for
+        assert sizes.labels('upload').count == len(chunks)
+
+    @pytest.mark.asyncio
+    async def test_uses_controller_size(self, sizes):
+        stream = streams.StringStream(b'x' * 100)
+        stream._chunking = AdaptiveChunkSize('upload', minimum=16, maximum=16)
+
+        assert await read_chunk(stream) == b'x' * 16
@@ -0,0 +1,213 @@
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+
+from tests import utils
+from waterbutler.core import exceptions
+from waterbutler.core.retry import RetryPolicy
+from waterbutler.core.circuitbreaker import CircuitBreaker, CircuitBreakerRegistry
+
+
+@pytest.fixture
+def breaker():
+    return CircuitBreaker(failure_threshold=3, recovery_timeout=30)
+
+
+@pytest.fixture
+def registry():
+    return CircuitBreakerRegistry(failure_threshold=2, recovery_timeout=30)
+
+
+class TestCircuitBreaker:
+
+    def test_opens_after_threshold(self, breaker):
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow_request()
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+        assert breaker.rejected == 1
+
+    def test_success_resets_failures(self, breaker):
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.failures == 1
+
+    def test_half_open_allows_single_trial(self, breaker):
+        for _ in range(3):
+            breaker.record_failure()
+        breaker.opened_at -= 30
+
+        assert breaker.allow_request()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow_request()
+
+    def test_half_open_stale_trial(self, breaker):
+        for _ in range(3):
+            breaker.record_failure()
+        breaker.opened_at -= 30
+        assert breaker.allow_request()
+
+        breaker.trial_at -= 30
+        assert breaker.allow_request()
+
+    def test_half_open_success_closes(self, breaker):
+        for _ in range(3):
+            breaker.record_failure()
+        breaker.opened_at -= 30
+        breaker.allow_request()
+
+        breaker.record_success()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow_request()
+
+    def test_half_open_failure_reopens(self, breaker):
+        for _ in range(3):
+            breaker.record_failure()
+        breaker.opened_at -= 30
+        breaker.allow_request()
+
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+
+
+class TestCircuitBreakerRegistry:
+
+    def test_is_failure(self):
+        assert CircuitBreakerRegistry.is_failure(500)
+        assert CircuitBreakerRegistry.is_failure(503)
+        assert not CircuitBreakerRegistry.is_failure(501)
+        assert not CircuitBreakerRegistry.is_failure(401)
+        assert not CircuitBreakerRegistry.is_failure(403)
+        assert not CircuitBreakerRegistry.is_failure(404)
+        assert not CircuitBreakerRegistry.is_failure(200)
+
+    def test_per_host(self, registry):
+        registry.record('down.example.com', 503)
+        registry.record('down.example.com', 502)
+
+        assert not registry.allow_request('down.example.com')
+        assert registry.allow_request('up.example.com')
+        assert registry.stats() == {
+            'down.example.com': {'state': 'open', 'failures': 2, 'rejected': 1},
+        }
+
+    def test_summary(self, registry):
+        registry.record('down.example.com', 503)
+        registry.record('down.example.com', 502)
+        registry.record('flaky.example.com', 500)
+        registry.allow_request('down.example.com')
+
+        assert registry.summary() == {'closed': 1, 'open': 1, 'half-open': 0, 'rejected': 1}
+
+    def test_success_drops_breaker(self, registry):
+        registry.record('example.com', 500)
+        registry.record('example.com', 200)
+
+        assert registry.stats() == {}
+
+    def test_disabled(self):
+        registry = CircuitBreakerRegistry(failure_threshold=0)
+        for _ in range(10):
+            registry.record_failure('example.com')
+
+        assert registry.allow_request('example.com')
+        assert registry.stats() == {}
+
+
+def mock_response(status):
+    async def read():
+        return b''
+
+    async def release():
+        pass
+
+    return SimpleNamespace(status=status, method='GET', headers={}, read=read, json=read,
+                           release=release)
+
+
+class TestProviderCircuitBreaker:
+
+    @pytest.fixture
+    def registry(self, monkeypatch):
+        registry = CircuitBreakerRegistry(failure_threshold=3)
+        monkeypatch.setattr('waterbutler.core.provider.circuit_breakers', registry)
+        return registry
+
+    @pytest.fixture
+    def provider(self, monkeypatch):
+        provider = utils.MockProvider1({}, {}, {})
+        provider.responses = []
+
+        async def get(*args, **kwargs):
+            response = provider.responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        session = SimpleNamespace(get=get)
+        monkeypatch.setattr(provider, 'get_or_create_session', lambda **kwargs: session)
+        provider.RETRY_POLICY = RetryPolicy(base=0.001, cap=0.001)
+        return provider
+
+    @pytest.mark.asyncio
+    async def test_retried_call_is_one_failure(self, registry, provider):
+        provider.responses.extend([mock_response(503)] * 3)
+
+        with pytest.raises(exceptions.UnhandledProviderError):
+            await provider.make_request('GET', 'https://example.com/foo', expects=(200, ))
+
+        assert provider.responses == []
+        assert registry.stats()['example.com']['failures'] == 1
+
+    @pytest.mark.asyncio
+    async def test_retried_network_errors_are_one_failure(self, registry, provider):
+        provider.responses.extend([aiohttp.ClientConnectionError()] * 3)
+
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await provider.make_request('GET', 'https://example.com/foo')
+
+        assert registry.stats()['example.com']['failures'] == 1
+
+    @pytest.mark.asyncio
+    async def test_recovered_call_is_a_success(self, registry, provider):
+        registry.record_failure('example.com')
+        provider.responses.extend([mock_response(503), mock_response(200)])
+
+        await provider.make_request('GET', 'https://example.com/foo', expects=(200, ))
+
+        assert registry.stats() == {}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('status', [401, 403, 404, 429])
+    async def test_client_errors_are_not_failures(self, registry, provider, status):
+        provider.responses.append(mock_response(status))
+
+        with pytest.raises(exceptions.UnhandledProviderError):
+            await provider.make_request('GET', 'https://example.com/foo', expects=(200, ),
+                                        retry=0)
+
+        assert registry.stats() == {}
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self, monkeypatch):
+        registry = CircuitBreakerRegistry(failure_threshold=1)
+        registry.record_failure('example.com')
+        monkeypatch.setattr('waterbutler.core.provider.circuit_breakers', registry)
+        provider = utils.MockProvider1({}, {}, {})
+
+        with pytest.raises(exceptions.UpstreamUnavailableError) as exc:
+            await provider.make_request('GET', 'https://example.com/foo')
+
+        assert exc.value.code == 503
@@ -37,6 +37,7 @@ class TestExceptionSerialization:
         exceptions.ReadOnlyProviderError,
         exceptions.UninitializedRepositoryError,
         exceptions.UnexportableFileTypeError,
+        exceptions.UpstreamUnavailableError,
         exceptions.InvalidProviderConfigError,
     ])
     def test_tolerate_dumb_signature(self, exception_class):
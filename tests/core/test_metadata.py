@@ -1,4 +1,10 @@
 import hashlib
+from unittest import mock
+
+import furl
+import pytest
+
+from waterbutler.core import metadata
 
 from tests import utils
 
@@ -110,3 +116,39 @@ class TestBaseMetadata:
             'modified_utc': 'never',
             'versionIdentifier': 'versions',
         }
+
+
+class TestEntityUrl:
+
+    @pytest.mark.parametrize('domain', [
+        'http://localhost:7777',
+        'https://files.osf.io/',
+        'http://localhost:7777/wb',
+    ])
+    @pytest.mark.parametrize('path', [
+        '/Foo.name',
+        '/Bar/',
+        '/a b/[c]?#d+e\'f~',
+        '/résumé/日本.txt',
+        '/100% done.txt',
+        '/%20/',
+    ])
+    def test_matches_furl(self, domain, path):
+        file_metadata = utils.MockFileMetadata()
+        file_metadata.path = path
+        url = furl.furl(domain)
+        url.path.segments.extend(['v1', 'resources', 'n0d3z', 'providers', 'MockProvider'] +
+                                 path.split('/')[1:])
+
+        with mock.patch('waterbutler.core.metadata.settings.DOMAIN', domain):
+            assert file_metadata._entity_url('n0d3z') == url.url
+
+    def test_etag_digest_follows_etag(self):
+        file_metadata = utils.MockFileMetadata()
+        first = file_metadata.serialized()['etag']
+
+        assert file_metadata.serialized()['etag'] == first
+
+        file_metadata.etag = 'changed'
+        assert file_metadata.serialized()['etag'] == hashlib.sha256(
+            '{}::{}'.format('MockProvider', 'changed').encode('utf-8')).hexdigest()
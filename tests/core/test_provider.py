@@ -1,9 +1,16 @@
+import asyncio
+from types import SimpleNamespace
+
+import aiohttp
 import pytest
 
 from tests import utils
 from unittest import mock
+from waterbutler.core import streams
 from waterbutler.core import metadata
 from waterbutler.core import exceptions
+from waterbutler.core.retry import RetryPolicy
+from tests.core.streams.fixtures import MockRangedResponse
 
 
 @pytest.fixture
@@ -60,6 +67,50 @@ class TestBaseProvider:
 
         assert e.value.code == 422
 
+    @pytest.mark.asyncio
+    async def test_probe(self, provider1):
+        assert await provider1.probe('somepath') is True
+
+    @pytest.mark.asyncio
+    async def test_probe_empty_folder(self, provider1):
+        provider1.exists = utils.MockCoroutine(return_value=[])
+
+        assert await provider1.probe('somepath') is True
+
+    @pytest.mark.asyncio
+    async def test_probe_doesnt_exist(self, provider1):
+        ret = await provider1.probe(
+            'somepath',
+            throw=exceptions.MetadataError('', code=404)
+        )
+        assert ret is False
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('page_size,cursor,expected,next_cursor', [
+        (2, None, ['a', 'b'], '2'),
+        (2, '2', ['c', 'd'], '4'),
+        (2, '4', ['e'], None),
+        (5, None, ['a', 'b', 'c', 'd', 'e'], None),
+        (2, '8', [], None),
+    ])
+    async def test_metadata_page(self, provider1, page_size, cursor, expected, next_cursor):
+        provider1.metadata = utils.MockCoroutine(return_value=['a', 'b', 'c', 'd', 'e'])
+
+        page, cursor = await provider1.metadata_page('somepath', page_size, cursor=cursor)
+
+        assert page == expected
+        assert cursor == next_cursor
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('cursor', ['-2', 'aaaa', '2.5'])
+    async def test_metadata_page_invalid_cursor(self, provider1, cursor):
+        provider1.metadata = utils.MockCoroutine(return_value=['a', 'b', 'c'])
+
+        with pytest.raises(exceptions.InvalidParameters):
+            await provider1.metadata_page('somepath', 2, cursor=cursor)
+
+        assert not provider1.metadata.called
+
     @pytest.mark.asyncio
     async def test_intra_copy_notimplemented(self, provider1):
         with pytest.raises(NotImplementedError):
@@ -163,6 +214,73 @@ class TestHandleNameConflict:
         assert str(handled) == '/test/path (2)'
         assert handled.name == 'path (2)'
 
+    @pytest.mark.asyncio
+    async def test_checks_with_probe(self, provider1):
+        path = await provider1.validate_path('/test/path')
+        provider1.exists = utils.MockCoroutine()
+        provider1.probe = utils.MockCoroutine(side_effect=(True, False))
+
+        handled, exists = await provider1.handle_name_conflict(path, conflict='keep')
+
+        assert exists is False
+        assert handled.name == 'path (1)'
+        assert provider1.probe.call_count == 2
+        assert not provider1.exists.called
+
+    @pytest.mark.asyncio
+    async def test_empty_folder_conflicts(self, provider1):
+        path = await provider1.validate_path('/test/path/')
+        provider1.exists = utils.MockCoroutine(return_value=[])
+
+        with pytest.raises(exceptions.NamingConflict):
+            await provider1.handle_name_conflict(path, conflict='warn')
+
+    @pytest.mark.asyncio
+    async def test_renames_from_listing(self, provider1):
+        path = await provider1.validate_path('/test/path')
+        provider1.child_names = utils.MockCoroutine(
+            return_value={'path', 'path (1)', 'path (2)', 'other'}
+        )
+        provider1.exists = utils.MockCoroutine(side_effect=(True, True, False))
+
+        handled, exists = await provider1.handle_name_conflict(path, conflict='keep')
+
+        assert exists is False
+        assert handled.name == 'path (3)'
+        provider1.child_names.assert_called_once_with(path.parent)
+        # the initial check, the first candidate and the free one, (2) is skipped
+        assert provider1.exists.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_renames_once_without_listing(self, provider1):
+        path = await provider1.validate_path('/test/path')
+        provider1.child_names = utils.MockCoroutine(return_value={'path'})
+        provider1.exists = utils.MockCoroutine(side_effect=(True, False))
+
+        handled, exists = await provider1.handle_name_conflict(path, conflict='keep')
+
+        assert handled.name == 'path (1)'
+        assert not provider1.child_names.called
+
+    @pytest.mark.asyncio
+    async def test_renames_listing_incomplete(self, provider1):
+        path = await provider1.validate_path('/test/path')
+        provider1.child_names = utils.MockCoroutine(return_value={'path'})
+        provider1.exists = utils.MockCoroutine(side_effect=(True, True, True, False))
+
+        handled, exists = await provider1.handle_name_conflict(path, conflict='keep')
+
+        assert handled.name == 'path (3)'
+        assert provider1.exists.call_count == 4
+
+    @pytest.mark.asyncio
+    async def test_no_listing_by_default(self, provider1):
+        path = await provider1.validate_path('/test/path')
+        provider1.metadata = utils.MockCoroutine()
+
+        assert await provider1.child_names(path.parent) is None
+        assert not provider1.metadata.called
+
 
 class TestHandleNaming:
 
@@ -332,6 +450,21 @@ class TestCopy:
         provider1.download.assert_called_once_with(src_path, version=None)
         provider1.upload.assert_called_once_with('Download return', dest_path)
 
+    @pytest.mark.asyncio
+    async def test_copy_closes_ranged_download(self, provider1):
+        src_path = await provider1.validate_path('/source/path')
+        dest_path = await provider1.validate_path('/destination/path')
+        stream = mock.Mock(spec=streams.RangedResponseStream, _size=10)
+        stream.name = None
+
+        provider1.upload = utils.MockCoroutine(side_effect=exceptions.UploadError('failed'))
+        provider1.download = utils.MockCoroutine(return_value=stream)
+
+        with pytest.raises(exceptions.UploadError):
+            await provider1.copy(provider1, src_path, dest_path)
+
+        stream.close.assert_called_once_with()
+
 
 class TestMove:
     @pytest.mark.asyncio
@@ -481,3 +614,279 @@ class TestMove:
         assert 'bytes=10-' == provider1._build_range_header((10, None))
         assert 'bytes=10-100' == provider1._build_range_header((10, 100))
         assert 'bytes=-255' == provider1._build_range_header((None, 255))
+
+
+class TestMakeRequestRetries:
+
+    @pytest.fixture
+    def flaky_provider(self, provider1, monkeypatch):
+        responses = []
+
+        async def get(*args, **kwargs):
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        session = SimpleNamespace(get=get)
+        monkeypatch.setattr(provider1, 'get_or_create_session', lambda **kwargs: session)
+        provider1.RETRY_POLICY = RetryPolicy(base=0.001, cap=0.001, deadline=0.05)
+        provider1.responses = responses
+        return provider1
+
+    @pytest.mark.asyncio
+    async def test_deadline_starts_per_call(self, flaky_provider):
+        ok = SimpleNamespace(status=200, headers={})
+        flaky_provider.responses.extend([ok, aiohttp.ClientConnectionError(), ok])
+
+        await flaky_provider.make_request('GET', 'https://example.com/foo')
+        await asyncio.sleep(0.1)
+
+        # a provider older than the deadline still retries its next request
+        assert await flaky_provider.make_request('GET', 'https://example.com/foo') is ok
+        assert flaky_provider.responses == []
+
+
+class TestRangedDownload:
+
+    DATA = bytes(range(50))
+
+    @pytest.fixture(autouse=True)
+    def celery_task(self, provider1):
+        provider1.is_celery_task = True
+
+    @pytest.fixture
+    def calls(self):
+        return []
+
+    @pytest.fixture
+    def fetch(self, calls):
+        async def fetch(byte_range):
+            calls.append(byte_range)
+            return MockRangedResponse(self.DATA, *(byte_range or (0, len(self.DATA) - 1)))
+        return fetch
+
+    @pytest.mark.asyncio
+    async def test_range_requested(self, provider1, fetch, calls):
+        stream = await provider1.ranged_download(fetch, range=(5, 9))
+
+        assert isinstance(stream, streams.ResponseStreamReader)
+        assert await stream.read() == self.DATA[5:10]
+        assert calls == [(5, 9)]
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, provider1, fetch, calls):
+        with mock.patch('waterbutler.settings.PARALLEL_DOWNLOADS', False):
+            stream = await provider1.ranged_download(fetch)
+
+        assert isinstance(stream, streams.ResponseStreamReader)
+        assert calls == [None]
+
+    @pytest.mark.asyncio
+    async def test_server_download(self, provider1, fetch, calls):
+        provider1.is_celery_task = False
+
+        stream = await provider1.ranged_download(fetch)
+
+        assert isinstance(stream, streams.ResponseStreamReader)
+        assert calls == [None]
+
+    @pytest.mark.asyncio
+    async def test_server_download_enabled(self, provider1, fetch, calls):
+        provider1.is_celery_task = False
+
+        with mock.patch('waterbutler.settings.PARALLEL_DOWNLOADS_SERVER', True):
+            stream = await provider1.ranged_download(fetch)
+
+        assert isinstance(stream, streams.RangedResponseStream)
+
+    @pytest.mark.asyncio
+    async def test_small_object(self, provider1, fetch, calls):
+        stream = await provider1.ranged_download(fetch)
+
+        assert isinstance(stream, streams.RangedResponseStream)
+        assert not stream.partial
+        assert stream.size == 50
+        assert await stream.read() == self.DATA
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_large_object(self, provider1, fetch, calls):
+        with mock.patch('waterbutler.settings.PARALLEL_DOWNLOAD_THRESHOLD', 20), \
+                mock.patch('waterbutler.settings.PARALLEL_DOWNLOAD_PART_SIZE', 16):
+            stream = await provider1.ranged_download(fetch)
+            assert await stream.read() == self.DATA
+
+        assert stream.size == 50
+        assert calls == [(0, 19), (20, 35), (36, 49)]
+
+    @pytest.mark.asyncio
+    async def test_range_ignored(self, provider1, calls):
+        async def fetch(byte_range):
+            calls.append(byte_range)
+            return MockRangedResponse(self.DATA, 0, 49, status=200)
+
+        stream = await provider1.ranged_download(fetch)
+
+        assert isinstance(stream, streams.ResponseStreamReader)
+        assert await stream.read() == self.DATA
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_object(self, provider1, calls):
+        async def fetch(byte_range):
+            calls.append(byte_range)
+            if byte_range is not None:
+                raise exceptions.DownloadError('Range Not Satisfiable', code=416)
+            return MockRangedResponse(b'', 0, -1, status=200)
+
+        stream = await provider1.ranged_download(fetch)
+
+        assert isinstance(stream, streams.ResponseStreamReader)
+        assert await stream.read() == b''
+        assert calls[1:] == [None]
+
+    @pytest.mark.asyncio
+    async def test_error(self, provider1):
+        fetch = utils.MockCoroutine(side_effect=exceptions.DownloadError('Not Found', code=404))
+
+        with pytest.raises(exceptions.DownloadError):
+            await provider1.ranged_download(fetch)
+
+        assert fetch.call_count == 1
+
+
+TREE = {
+    '/': ['a/', 'b/', 'c.txt'],
+    '/a/': ['d/', 'e.txt'],
+    '/a/d/': ['f.txt'],
+    '/b/': [],
+}
+
+
+def tree_entry(name):
+    return SimpleNamespace(name=name.rstrip('/'), is_folder=name.endswith('/'))
+
+
+class TestWalk:
+
+    @pytest.fixture
+    def walk_provider(self, provider1):
+        def metadata(path, **kwargs):
+            if path.materialized_path not in TREE:
+                raise exceptions.MetadataError('', code=404)
+            return [tree_entry(name) for name in TREE[path.materialized_path]]
+
+        provider1.metadata = utils.MockCoroutine(side_effect=metadata)
+        return provider1
+
+    async def collect(self, walk):
+        names = []
+        async for entries in walk:
+            names.extend(entry.name for entry in entries)
+        return names
+
+    @pytest.mark.asyncio
+    async def test_walk(self, walk_provider):
+        path = await walk_provider.validate_path('/')
+
+        names = await self.collect(walk_provider.walk(path))
+
+        assert sorted(names) == ['a', 'b', 'c.txt', 'd', 'e.txt', 'f.txt']
+        assert walk_provider.metadata.call_count == 4
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('max_depth,expected,listings', [
+        (1, ['a', 'b', 'c.txt'], 1),
+        (2, ['a', 'b', 'c.txt', 'd', 'e.txt'], 3),
+    ])
+    async def test_walk_max_depth(self, walk_provider, max_depth, expected, listings):
+        path = await walk_provider.validate_path('/')
+
+        names = await self.collect(walk_provider.walk(path, max_depth=max_depth))
+
+        assert sorted(names) == expected
+        assert walk_provider.metadata.call_count == listings
+
+    @pytest.mark.asyncio
+    async def test_walk_concurrency(self, provider1):
+        in_flight, most = 0, 0
+
+        async def metadata(path, **kwargs):
+            nonlocal in_flight, most
+            in_flight += 1
+            most = max(most, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if path.is_root:
+                return [tree_entry('{}/'.format(i)) for i in range(10)]
+            return [tree_entry('file')]
+
+        provider1.metadata = metadata
+        path = await provider1.validate_path('/')
+
+        names = await self.collect(provider1.walk(path, concurrency=3))
+
+        assert len(names) == 20
+        assert most == 3
+
+    @pytest.mark.asyncio
+    async def test_walk_skips_deleted_folder(self, walk_provider):
+        TREE['/a/'].append('gone/')
+        try:
+            path = await walk_provider.validate_path('/')
+            names = await self.collect(walk_provider.walk(path))
+        finally:
+            TREE['/a/'].remove('gone/')
+
+        assert 'f.txt' in names
+        assert 'gone' in names
+
+    @pytest.mark.asyncio
+    async def test_walk_child_path(self, walk_provider):
+        revalidated = []
+        revalidate_path = walk_provider.revalidate_path
+
+        async def spy(parent, name, folder=False):
+            revalidated.append((parent.materialized_path, name, folder))
+            return await revalidate_path(parent, name, folder=folder)
+
+        walk_provider.revalidate_path = spy
+        path = await walk_provider.validate_path('/')
+
+        await self.collect(walk_provider.walk(path))
+
+        # the default looks each folder up again by name
+        assert sorted(revalidated) == [('/', 'a', True), ('/', 'b', True), ('/a/', 'd', True)]
+
+    @pytest.mark.asyncio
+    async def test_walk_child_path_from_listing(self, provider1):
+        # siblings with the same name are told apart by the ids in the listing
+        listings = {
+            None: [SimpleNamespace(name='dup', id='1', is_folder=True),
+                   SimpleNamespace(name='dup', id='2', is_folder=True)],
+            '1': [SimpleNamespace(name='one', id='3', is_folder=False)],
+            '2': [SimpleNamespace(name='two', id='4', is_folder=False)],
+        }
+
+        async def child_path(parent, child):
+            return parent.child(child.name, _id=child.id, folder=child.is_folder)
+
+        provider1.metadata = utils.MockCoroutine(
+            side_effect=lambda path, **kwargs: listings[path.identifier]
+        )
+        provider1.child_path = child_path
+        provider1.revalidate_path = utils.MockCoroutine()
+        path = await provider1.validate_path('/')
+
+        names = await self.collect(provider1.walk(path))
+
+        assert sorted(names) == ['dup', 'dup', 'one', 'two']
+        assert not provider1.revalidate_path.called
+
+    @pytest.mark.asyncio
+    async def test_walk_missing_folder(self, walk_provider):
+        path = await walk_provider.validate_path('/nope/')
+
+        with pytest.raises(exceptions.MetadataError):
+            await self.collect(walk_provider.walk(path))
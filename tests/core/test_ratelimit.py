@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from tests import utils
+from waterbutler.core.ratelimit import RateLimiter, TokenBucket
+
+
+@pytest.fixture
+def provider():
+    return utils.MockProvider1({'user': 'name'}, {'pass': 'word'}, {})
+
+
+class TestTokenBucket:
+
+    @pytest.mark.asyncio
+    async def test_burst_does_not_wait(self):
+        bucket = TokenBucket(rate=1, capacity=3)
+
+        for _ in range(3):
+            assert await bucket.acquire() < 0.01
+
+        assert bucket.acquired == 3
+        assert bucket.waits == 0
+
+    @pytest.mark.asyncio
+    async def test_waits_when_empty(self):
+        bucket = TokenBucket(rate=50, capacity=1)
+
+        await bucket.acquire()
+        waited = await bucket.acquire()
+
+        assert waited >= 0.015
+        assert bucket.waits == 1
+        assert bucket.wait_time >= 0.015
+
+    @pytest.mark.asyncio
+    async def test_waiters_are_served_in_order(self):
+        bucket = TokenBucket(rate=100, capacity=1)
+        order = []
+
+        async def take(i):
+            await bucket.acquire()
+            order.append(i)
+
+        await asyncio.gather(*[take(i) for i in range(5)])
+
+        assert order == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_idle(self):
+        bucket = TokenBucket(rate=1000, capacity=2)
+        assert bucket.idle
+
+        await bucket.acquire()
+        await asyncio.sleep(0.01)
+
+        assert bucket.idle
+
+
+class TestRateLimiter:
+
+    @pytest.mark.asyncio
+    async def test_keys_are_independent(self):
+        limiter = RateLimiter()
+
+        await limiter.acquire(('slow', 'a.com', 'x'), 1, 1)
+        waited = await limiter.acquire(('fast', 'b.com', 'x'), 1, 1)
+
+        assert waited < 0.5
+        assert limiter.bucket(('slow', 'a.com', 'x'), 1, 1) is not \
+            limiter.bucket(('fast', 'b.com', 'x'), 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_zero_rate_disables(self):
+        limiter = RateLimiter()
+
+        for _ in range(5):
+            assert await limiter.acquire(('p', None, 'x'), 0, 1) == 0.0
+
+        assert limiter.stats() == {}
+
+    @pytest.mark.asyncio
+    async def test_changed_limit_replaces_bucket(self):
+        limiter = RateLimiter()
+
+        first = limiter.bucket(('p', None, 'x'), 1, 1)
+        second = limiter.bucket(('p', None, 'x'), 2, 1)
+
+        assert first is not second
+
+    @pytest.mark.asyncio
+    async def test_sweep_keeps_stats(self):
+        limiter = RateLimiter()
+
+        await limiter.acquire(('p', 'a.com', 'x'), 1000, 1)
+        await limiter.acquire(('p', 'b.com', 'x'), 1000, 1)
+        await asyncio.sleep(0.01)
+
+        assert limiter.sweep() == 2
+        assert limiter.stats() == {'p': {'acquired': 2, 'waits': 0, 'wait_time': 0.0}}
+
+
+class TestProviderThrottle:
+
+    def test_credentials_hash_is_stable(self, provider):
+        other = utils.MockProvider1({'user': 'other'}, {'pass': 'word'}, {})
+        assert provider.credentials_hash == other.credentials_hash
+
+        other = utils.MockProvider1({'user': 'name'}, {'pass': 'phrase'}, {})
+        assert provider.credentials_hash != other.credentials_hash
+
+    @pytest.mark.asyncio
+    async def test_throttle_request_records_waits(self, provider):
+        provider.RATE_LIMIT = (50, 1)
+
+        await provider.throttle_request('https://example.com/foo')
+        waited = await provider.throttle_request('https://example.com/bar')
+
+        assert waited > 0
+        metrics = provider.provider_metrics.serialize()
+        assert metrics['requests']['throttled'] == 1
+        assert metrics['requests']['throttle_wait'] > 0
@@ -0,0 +1,214 @@
+from unittest import mock
+
+import pytest
+
+from waterbutler.core import utils
+from waterbutler.core import exceptions
+from waterbutler.core.registry import ProviderRegistry, ProviderPool
+
+from tests.utils import MockProvider
+
+
+class KwargsMockProvider(MockProvider):
+
+    def __init__(self, auth, creds, settings, **kwargs):
+        super().__init__(auth, creds, settings)
+
+
+@pytest.fixture
+def registry():
+    registry = ProviderRegistry()
+    registry._classes = {'MockProvider': KwargsMockProvider}
+    return registry
+
+
+@pytest.fixture
+def pool():
+    return ProviderPool(maxsize=2, idle_timeout=60)
+
+
+def make_args(token='naps'):
+    return ('MockProvider', {'name': 'fake'}, {'token': token}, {'folder': '/'})
+
+
+class TestProviderRegistry:
+
+    def test_get(self, registry):
+        assert registry.get('MockProvider') is KwargsMockProvider
+
+    def test_not_found(self, registry):
+        with pytest.raises(exceptions.ProviderNotFound):
+            registry.get('nope')
+
+    def test_scans_entry_points_once(self):
+        registry = ProviderRegistry()
+        with mock.patch('waterbutler.core.registry.iter_entry_points',
+                        return_value=[]) as iter_entry_points:
+            registry.names()
+            registry.names()
+
+        assert iter_entry_points.call_count == 1
+
+    def test_imports_on_first_use(self):
+        entry_point = mock.Mock()
+        entry_point.name = 'mock'
+        entry_point.resolve.return_value = MockProvider
+        registry = ProviderRegistry()
+
+        with mock.patch('waterbutler.core.registry.iter_entry_points',
+                        return_value=[entry_point]):
+            assert registry.names() == ['mock']
+            assert not entry_point.resolve.called
+
+            assert registry.get('mock') is MockProvider
+            assert registry.get('mock') is MockProvider
+
+        assert entry_point.resolve.call_count == 1
+        assert list(registry.import_times) == ['mock']
+
+    def test_import_error(self):
+        entry_point = mock.Mock()
+        entry_point.name = 'broken'
+        entry_point.resolve.side_effect = ImportError('No module named boto')
+        registry = ProviderRegistry()
+
+        with mock.patch('waterbutler.core.registry.iter_entry_points',
+                        return_value=[entry_point]):
+            with pytest.raises(exceptions.ProviderNotFound):
+                registry.get('broken')
+            assert registry.load() == {}
+
+    def test_enabled(self):
+        registry = ProviderRegistry(enabled={'filesystem'})
+
+        assert registry.names() == ['filesystem']
+        with pytest.raises(exceptions.ProviderNotFound):
+            registry.get('s3')
+
+    def test_real_entry_points(self):
+        registry = ProviderRegistry()
+        provider_class = registry.get('filesystem')
+
+        assert provider_class.NAME == 'filesystem'
+        assert 'filesystem' in registry.names()
+        assert list(registry.import_times) == ['filesystem']
+
+    def test_report(self, registry):
+        registry.import_times = {'fast': 0.01, 'slow': 0.5}
+
+        assert registry.report().split('\n') == [
+            'slow                     0.500s',
+            'fast                     0.010s',
+            'total                    0.510s',
+        ]
+
+
+class TestProviderPool:
+
+    def test_disabled(self):
+        pool = ProviderPool(maxsize=0)
+        provider = MockProvider()
+        pool.track(provider, pool.key(*make_args()))
+        pool.release(provider)
+
+        assert not pool.enabled
+        assert pool.acquire(pool.key(*make_args())) is None
+
+    def test_key(self, pool):
+        assert pool.key(*make_args()) == pool.key(*make_args())
+        assert pool.key(*make_args()) != pool.key(*make_args(token='other'))
+        assert pool.key(*make_args()) != pool.key(*make_args(), is_celery_task=True)
+
+    def test_acquire_release(self, pool):
+        key = pool.key(*make_args())
+        provider = MockProvider()
+        pool.track(provider, key)
+
+        assert pool.acquire(key) is None
+
+        pool.release(provider)
+        assert pool.acquire(key) is provider
+        # checked out instances are not handed to anyone else
+        assert pool.acquire(key) is None
+        assert pool.stats() == {'idle': 0, 'hits': 1, 'misses': 2}
+
+    def test_release_untracked(self, pool):
+        pool.release(MockProvider())
+        pool.release(None)
+
+        assert pool.stats()['idle'] == 0
+
+    def test_release_twice(self, pool):
+        key = pool.key(*make_args())
+        provider = MockProvider()
+        pool.track(provider, key)
+        pool.release(provider)
+        pool.release(provider)
+
+        assert pool.stats()['idle'] == 1
+
+    def test_evicts_least_recently_released(self, pool):
+        providers = []
+        for token in ('a', 'b', 'c'):
+            provider = MockProvider()
+            pool.track(provider, pool.key(*make_args(token=token)))
+            pool.release(provider)
+            providers.append(provider)
+
+        assert pool.stats()['idle'] == 2
+        assert pool.acquire(pool.key(*make_args(token='a'))) is None
+        assert pool.acquire(pool.key(*make_args(token='c'))) is providers[2]
+
+    def test_idle_timeout(self, pool):
+        key = pool.key(*make_args())
+        provider = MockProvider()
+        pool.track(provider, key)
+
+        with mock.patch('time.monotonic', return_value=100):
+            pool.release(provider)
+        with mock.patch('time.monotonic', return_value=161):
+            assert pool.acquire(key) is None
+
+        assert pool.stats()['idle'] == 0
+
+    def test_recycle_resets_request_state(self, pool):
+        key = pool.key(*make_args())
+        provider = MockProvider()
+        pool.track(provider, key)
+        provider.provider_metrics.incr('requests.count')
+        pool.release(provider)
+
+        assert pool.acquire(key) is provider
+        assert provider.provider_metrics.serialize()['requests'] == {}
+
+
+class TestMakeProvider:
+
+    @pytest.fixture(autouse=True)
+    def patch_registry(self, registry, pool):
+        with mock.patch.object(utils, 'provider_registry', registry), \
+                mock.patch.object(utils, 'provider_pool', pool):
+            yield
+
+    def test_builds_from_registry(self):
+        provider = utils.make_provider(*make_args())
+
+        assert isinstance(provider, MockProvider)
+        assert provider.credentials == {'token': 'naps'}
+
+    def test_not_found(self):
+        with pytest.raises(exceptions.ProviderNotFound):
+            utils.make_provider('nope', {}, {}, {})
+
+    def test_reuses_released_instance(self, pool):
+        provider = utils.make_provider(*make_args())
+        pool.release(provider)
+
+        assert utils.make_provider(*make_args()) is provider
+        assert utils.make_provider(*make_args()) is not provider
+
+    def test_celery_tasks_not_pooled(self, pool):
+        provider = utils.make_provider(*make_args(), is_celery_task=True)
+        pool.release(provider)
+
+        assert pool.stats()['idle'] == 0
@@ -0,0 +1,103 @@
+import time
+import asyncio
+import email.utils
+
+import aiohttp
+import pytest
+
+from waterbutler.core.retry import RetryPolicy
+
+
+@pytest.fixture
+def policy():
+    return RetryPolicy(base=1, cap=10, deadline=30, max_retry_after=60)
+
+
+class TestBackoff:
+
+    def test_first_delay_is_base(self, policy):
+        assert policy.backoff(0) == 1
+
+    def test_bounds(self, policy):
+        for _ in range(100):
+            assert 1 <= policy.backoff(2) <= 6
+
+    def test_capped(self, policy):
+        for _ in range(100):
+            assert policy.backoff(100) <= 10
+
+
+class TestDelayFromHeaders:
+
+    def test_none(self, policy):
+        assert policy.delay_from_headers({}) is None
+
+    def test_retry_after_seconds(self, policy):
+        assert policy.delay_from_headers({'Retry-After': '7'}) == 7
+
+    def test_retry_after_http_date(self, policy):
+        value = email.utils.formatdate(time.time() + 20, usegmt=True)
+        assert 18 <= policy.delay_from_headers({'Retry-After': value}) <= 20
+
+    def test_retry_after_in_the_past(self, policy):
+        value = email.utils.formatdate(time.time() - 20, usegmt=True)
+        assert policy.delay_from_headers({'Retry-After': value}) == 0
+
+    def test_rate_limit_reset_delta(self, policy):
+        assert policy.delay_from_headers({'X-RateLimit-Reset': '5'}) == 5
+
+    def test_rate_limit_reset_epoch(self, policy):
+        value = str(int(time.time()) + 30)
+        assert 28 <= policy.delay_from_headers({'X-RateLimit-Reset': value}) <= 30
+
+    def test_garbage(self, policy):
+        assert policy.delay_from_headers({'Retry-After': 'soon'}) is None
+        assert policy.delay_from_headers({'X-RateLimit-Reset': 'soon'}) is None
+
+
+class TestNextDelay:
+
+    def test_backoff(self, policy):
+        assert policy.next_delay(0) == 1
+
+    def test_retry_after(self, policy):
+        assert policy.next_delay(0, 12) == 12
+
+    def test_retry_after_too_long(self, policy):
+        assert policy.next_delay(0, 61) is None
+
+
+class TestCanRetryError:
+
+    def test_idempotent(self, policy):
+        exc = aiohttp.ClientConnectionError()
+        assert policy.can_retry_error('get', exc)
+        assert policy.can_retry_error('PUT', exc, data=b'bytes')
+        assert policy.can_retry_error('HEAD', asyncio.TimeoutError())
+
+    def test_not_idempotent(self, policy):
+        assert not policy.can_retry_error('POST', aiohttp.ClientConnectionError())
+
+    def test_stream_body(self, policy):
+        assert not policy.can_retry_error('PUT', aiohttp.ClientConnectionError(), data=object())
+
+    def test_other_errors(self, policy):
+        assert not policy.can_retry_error('GET', ValueError())
+
+    def test_disabled(self):
+        policy = RetryPolicy(retry_network_errors=False)
+        assert not policy.can_retry_error('GET', aiohttp.ClientConnectionError())
+
+
+class TestWithinDeadline:
+
+    def test_within(self, policy):
+        assert policy.within_deadline(time.monotonic(), 5)
+
+    def test_exceeded(self, policy):
+        assert not policy.within_deadline(time.monotonic() - 28, 5)
+
+    def test_no_deadline(self):
+        policy = RetryPolicy(deadline=None)
+        assert policy.within_deadline(time.monotonic() - 1000, 5)
+        assert RetryPolicy().within_deadline(None, 1000)
@@ -0,0 +1,98 @@
+import aiohttp
+import pytest
+
+from tests import utils
+from waterbutler.core.sessions import SessionPool
+
+
+@pytest.fixture
+def pool():
+    pool = SessionPool(idle_timeout=60, sweep_interval=3600)
+    yield pool
+    pool.clear()
+
+
+@pytest.fixture
+def provider():
+    return utils.MockProvider1({'user': 'name'}, {'pass': 'word'}, {})
+
+
+class TestSessionPool:
+
+    def test_origin(self):
+        assert SessionPool.origin('https://example.com/foo?bar=baz') == ('https', 'example.com', 443)
+        assert SessionPool.origin('http://example.com:8080/') == ('http', 'example.com', 8080)
+
+    @pytest.mark.asyncio
+    async def test_same_origin_shares_session(self, pool):
+        first = pool.get('https://example.com/foo')
+        second = pool.get('https://example.com/bar?baz=qux')
+
+        assert isinstance(first, aiohttp.ClientSession)
+        assert first is second
+        assert pool.stats() == {'loops': 1, 'sessions': 1}
+
+    @pytest.mark.asyncio
+    async def test_different_origins_get_different_sessions(self, pool):
+        first = pool.get('https://example.com/foo')
+        second = pool.get('https://example.org/foo')
+        third = pool.get('http://example.com/foo')
+
+        assert len({id(first), id(second), id(third)}) == 3
+        assert pool.stats()['sessions'] == 3
+
+    @pytest.mark.asyncio
+    async def test_closed_session_is_replaced(self, pool):
+        first = pool.get('https://example.com/foo')
+        await first.close()
+
+        second = pool.get('https://example.com/foo')
+
+        assert second is not first
+        assert not second.closed
+
+    @pytest.mark.asyncio
+    async def test_evict_idle(self, pool):
+        session = pool.get('https://example.com/foo')
+        pool.idle_timeout = 0
+
+        assert pool.evict_idle() == 1
+        assert session.closed
+        assert pool.stats()['sessions'] == 0
+
+    @pytest.mark.asyncio
+    async def test_evict_idle_keeps_recent(self, pool):
+        session = pool.get('https://example.com/foo')
+
+        assert pool.evict_idle() == 0
+        assert not session.closed
+
+    @pytest.mark.asyncio
+    async def test_pooled_sessions_do_not_keep_cookies(self, pool):
+        session = pool.get('https://example.com/foo')
+
+        assert isinstance(session.cookie_jar, aiohttp.DummyCookieJar)
+        assert not isinstance(pool.make_session(connector=aiohttp.TCPConnector()).cookie_jar,
+                              aiohttp.DummyCookieJar)
+
+
+class TestProviderSessions:
+
+    @pytest.mark.asyncio
+    async def test_url_uses_shared_pool(self, provider):
+        other = utils.MockProvider1({'user': 'other'}, {'pass': 'phrase'}, {})
+
+        session = provider.get_or_create_session(url='https://example.com/foo')
+
+        assert session is other.get_or_create_session(url='https://example.com/bar')
+        assert provider.session_list == []
+
+    @pytest.mark.asyncio
+    async def test_connector_uses_private_session(self, provider):
+        connector = aiohttp.TCPConnector(ssl=False)
+
+        session = provider.get_or_create_session(connector=connector)
+
+        assert session.connector is connector
+        assert provider.session_list == [session]
+        assert provider.get_or_create_session(connector=aiohttp.TCPConnector()) is session
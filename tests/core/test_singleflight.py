@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from waterbutler.core.singleflight import SingleFlight
+
+
+@pytest.fixture
+def flight():
+    return SingleFlight('test')
+
+
+class TestSingleFlight:
+
+    @pytest.mark.asyncio
+    async def test_collapses_concurrent_calls(self, flight):
+        calls = []
+
+        async def work(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return {'value': value}
+
+        results = await asyncio.gather(*[flight.do('key', work, 1) for _ in range(5)])
+
+        assert calls == [1]
+        assert results == [{'value': 1}] * 5
+        assert len({id(result) for result in results}) == 5
+        assert flight.calls == 5
+        assert flight.collapsed == 4
+        assert flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys(self, flight):
+        async def work(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        assert await asyncio.gather(flight.do('a', work, 1), flight.do('b', work, 2)) == [1, 2]
+        assert flight.collapsed == 0
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_not_collapsed(self, flight):
+        async def work():
+            return 1
+
+        await flight.do('key', work)
+        await flight.do('key', work)
+
+        assert flight.collapsed == 0
+
+    @pytest.mark.asyncio
+    async def test_exception_raised_to_all(self, flight):
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError('nope')
+
+        results = await asyncio.gather(flight.do('key', work), flight.do('key', work),
+                                       return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self, flight):
+        async def work():
+            await asyncio.sleep(0.05)
+            return 1
+
+        first = asyncio.ensure_future(flight.do('key', work))
+        second = asyncio.ensure_future(flight.do('key', work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == 1
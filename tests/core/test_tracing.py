@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+import pytest
+
+from waterbutler.core import tracing
+from waterbutler.core.metrics import Histogram, HistogramFamily
+from waterbutler.core.tracing import EndpointNormalizer
+
+
+@pytest.fixture
+def normalizer():
+    return EndpointNormalizer(max_endpoints=3, max_depth=4)
+
+
+@pytest.fixture
+def latency(monkeypatch):
+    family = HistogramFamily('test_seconds', 'Test', ('provider', 'method', 'endpoint', 'phase'))
+    monkeypatch.setattr(tracing, 'upstream_latency', family)
+    return family
+
+
+class TestHistogram:
+
+    def test_observe(self):
+        histogram = Histogram(buckets=(1, 5))
+        histogram.observe(0.5)
+        histogram.observe(1)
+        histogram.observe(3)
+        histogram.observe(10)
+
+        assert histogram.count == 4
+        assert histogram.sum == 14.5
+        assert histogram.cumulative() == [(1, 2), (5, 3), (float('inf'), 4)]
+
+    def test_family_labels(self):
+        family = HistogramFamily('test_seconds', 'Test', ('provider', 'phase'))
+        family.observe(1, 'box', 'ttfb')
+        family.observe(2, 'box', 'ttfb')
+
+        assert family.labels('box', 'ttfb').count == 2
+        assert [labels for labels, _ in family.collect()] == [('box', 'ttfb')]
+
+        with pytest.raises(ValueError):
+            family.labels('box')
+
+
+class TestEndpointNormalizer:
+
+    @pytest.mark.parametrize('url,expected', [
+        ('https://www.googleapis.com/drive/v2/files/0B1a2B3c4D5e6F7g8H9i0J',
+         'www.googleapis.com/drive/v2/files/{id}'),
+        ('https://api.box.com/2.0/folders/11446498/items?limit=1000',
+         'api.box.com/{id}/folders/{id}/items'),
+        ('https://s3.amazonaws.com/bucket/some/file.txt',
+         's3.amazonaws.com/bucket/some/{id}'),
+        ('https://example.com/a/b/c/d/e/f', 'example.com/a/b/c/d/...'),
+        ('https://example.com/files/6ba7b810-9dad-11d1-80b4-00c04fd430c8',
+         'example.com/files/{id}'),
+    ])
+    def test_template(self, normalizer, url, expected):
+        assert normalizer.template('test', url) == expected
+
+    def test_cardinality_cap(self, normalizer):
+        for name in ('a', 'b', 'c'):
+            normalizer.template('test', 'https://example.com/' + name)
+
+        assert normalizer.template('test', 'https://example.com/d') == tracing.OVERFLOW_ENDPOINT
+        assert normalizer.template('test', 'https://example.com/a') == 'example.com/a'
+        assert normalizer.template('other', 'https://example.com/d') == 'example.com/d'
+
+
+class TestTraceHooks:
+
+    @pytest.mark.asyncio
+    async def test_request_phases(self, latency):
+        eof_callbacks = []
+        response = SimpleNamespace(content=SimpleNamespace(on_eof=eof_callbacks.append))
+        ctx = SimpleNamespace(trace_request_ctx={'provider': 'box'})
+
+        await tracing.on_request_start(None, ctx, SimpleNamespace(
+            method='GET', url='https://api.box.com/2.0/folders/0'))
+        await tracing.on_connection_create_start(None, ctx, None)
+        await tracing.on_connection_create_end(None, ctx, None)
+        await tracing.on_request_end(None, ctx, SimpleNamespace(response=response))
+        assert len(eof_callbacks) == 1
+        eof_callbacks[0]()
+
+        labels = ('box', 'GET', 'api.box.com/{id}/folders/{id}')
+        for phase in ('connect', 'ttfb', 'body', 'total'):
+            assert latency.labels(*labels, phase).count == 1
+        assert ('box', 'GET', 'api.box.com/{id}/folders/{id}', 'dns') not in dict(latency.collect())
@@ -159,3 +159,20 @@ class TestContentDisposition:
     def test_disposition_encoding(self, filename, expected):
         encoded = utils.encode_for_disposition(filename)
         assert encoded == expected
+
+
+class TestNormalizeDatetime:
+
+    @pytest.mark.parametrize('date_string,expected', [
+        (None, None),
+        ('2017-04-18T18:30:01.123Z', '2017-04-18T18:30:01+00:00'),
+        ('2014-05-12T13:40:05-07:00', '2014-05-12T20:40:05+00:00'),
+        ('2014-05-12 13:40:05+0530', '2014-05-12T08:10:05+00:00'),
+        ('2014-05-12T13:40:05.123456789', '2014-05-12T13:40:05+00:00'),
+        ('2016-12-31T23:59:59-12:00', '2017-01-01T11:59:59+00:00'),
+        # not ISO 8601 or out of range, parsed by dateutil
+        ('Mon, 12 May 2014 13:40:05 GMT', '2014-05-12T13:40:05+00:00'),
+        ('20140512T134005Z', '2014-05-12T13:40:05+00:00'),
+    ])
+    def test_normalize_datetime(self, date_string, expected):
+        assert utils.normalize_datetime(date_string) == expected
@@ -281,6 +281,34 @@ class TestCRUD:
 
         assert content == b'delicious'
 
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    async def test_download_ranged(self, provider, mock_time):
+        provider.is_celery_task = True
+        path = WaterButlerPath('/muhtriangle')
+        for url in provider.generate_urls(path.path, secondary=True):
+            aiohttpretty.register_uri('GET', url, body=b'delicious', auto_length=True,
+                                      status=206, headers={'Content-Range': 'bytes 0-8/9'})
+
+        result = await provider.download(path)
+
+        assert isinstance(result, streams.RangedResponseStream)
+        assert not result.partial
+        assert await result.read() == b'delicious'
+
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    async def test_download_range(self, provider, mock_time):
+        path = WaterButlerPath('/muhtriangle')
+        for url in provider.generate_urls(path.path, secondary=True):
+            aiohttpretty.register_uri('GET', url, body=b'de', auto_length=True, status=206,
+                                      headers={'Content-Range': 'bytes 0-1/9'})
+
+        result = await provider.download(path, range=(0, 1))
+
+        assert result.partial
+        assert await result.read() == b'de'
+
     @pytest.mark.asyncio
     @pytest.mark.aiohttpretty
     async def test_download_folder_400s(self, provider, mock_time):
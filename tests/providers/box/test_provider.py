@@ -768,6 +768,35 @@ class TestMetadata:
 
         assert result == expected
 
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    @pytest.mark.parametrize('cursor,next_cursor', [('20', '22'), ('22', None)])
+    async def test_metadata_page(self, provider, root_provider_fixtures, cursor, next_cursor):
+        path = WaterButlerPath('/', _ids=(provider.folder, ))
+
+        list_url = provider.build_url('folders', provider.folder, 'items',
+                                      fields='id,name,size,modified_at,etag,total_count',
+                                      offset=int(cursor), limit=2)
+
+        list_metadata = root_provider_fixtures['folder_list_metadata']
+        aiohttpretty.register_json_uri('GET', list_url, body=list_metadata)
+
+        page, result = await provider.metadata_page(path, 2, cursor=cursor)
+
+        assert [x.name for x in page] == [x['name'] for x in list_metadata['entries']]
+        assert page[0].kind == 'folder'
+        assert result == next_cursor
+        assert aiohttpretty.has_call(method='GET', uri=list_url)
+
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    @pytest.mark.parametrize('cursor', ['-2', 'aaaa'])
+    async def test_metadata_page_invalid_cursor(self, provider, cursor):
+        path = WaterButlerPath('/', _ids=(provider.folder, ))
+
+        with pytest.raises(exceptions.InvalidParameters):
+            await provider.metadata_page(path, 2, cursor=cursor)
+
     @pytest.mark.asyncio
     @pytest.mark.aiohttpretty
     async def test_metadata_raw(self, provider, root_provider_fixtures):
@@ -815,6 +844,30 @@ class TestMetadata:
 
         assert exc.value.code == HTTPStatus.NOT_FOUND
 
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    async def test_folder_validator(self, provider):
+        path = WaterButlerPath('/charmander/', _ids=(provider.folder, '1234'))
+        url = provider.build_url('folders', '1234', fields='etag,content_modified_at')
+        aiohttpretty.register_json_uri('GET', url, body={
+            'type': 'folder', 'id': '1234', 'etag': '1',
+            'content_modified_at': '2014-05-12T13:40:05-07:00',
+        })
+
+        assert await provider.folder_validator(path) == '1:2014-05-12T13:40:05-07:00'
+        assert aiohttpretty.has_call(method='GET', uri=url)
+
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    async def test_folder_validator_unavailable(self, provider):
+        path = WaterButlerPath('/', _ids=(provider.folder, ), folder=True)
+        url = provider.build_url('folders', provider.folder, fields='etag,content_modified_at')
+        aiohttpretty.register_json_uri('GET', url, body={
+            'type': 'folder', 'id': provider.folder, 'etag': None, 'content_modified_at': None,
+        })
+
+        assert await provider.folder_validator(path) is None
+
 
 class TestRevisions:
 
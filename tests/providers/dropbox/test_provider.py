@@ -442,6 +442,36 @@ class TestMetadata:
         assert result[0].name == 'flower.jpg'
         assert result[0].path == '/flower.jpg'
 
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    async def test_metadata_page(self, provider, provider_fixtures):
+        path = await provider.validate_path('/')
+        url = provider.build_url('files', 'list_folder')
+        data = {'path': path.full_path.rstrip('/'), 'limit': 2}
+        body = provider_fixtures['folder_with_more_metadata']
+        aiohttpretty.register_json_uri('POST', url, data=data, body=body)
+
+        page, cursor = await provider.metadata_page(path, 2)
+
+        assert [x.kind for x in page] == ['folder', 'file']
+        assert cursor == body['cursor']
+        assert aiohttpretty.has_call(method='POST', uri=url)
+
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    async def test_metadata_page_continue(self, provider, provider_fixtures):
+        path = await provider.validate_path('/')
+        url = provider.build_url('files', 'list_folder', 'continue')
+        data = {'cursor': 'aaaa'}
+        aiohttpretty.register_json_uri('POST', url, data=data,
+                                       body=provider_fixtures['folder_children'])
+
+        page, cursor = await provider.metadata_page(path, 2, cursor='aaaa')
+
+        assert len(page) == 1
+        assert page[0].name == 'flower.jpg'
+        assert cursor is None
+
     @pytest.mark.asyncio
     @pytest.mark.aiohttpretty
     async def test_revision_metadata(self, provider, revision_fixtures):
@@ -255,6 +255,18 @@ class TestMetadata:
         with pytest.raises(exceptions.MetadataError):
             await provider.metadata(path)
 
+    @pytest.mark.asyncio
+    async def test_child_names(self, provider):
+        path = await provider.validate_path('/')
+
+        assert await provider.child_names(path) == {'flower.jpg', 'subfolder', 'other_subfolder'}
+
+    @pytest.mark.asyncio
+    async def test_child_names_missing(self, provider):
+        path = await provider.validate_path('/missing/')
+
+        assert await provider.child_names(path) is None
+
 
 class TestIntra:
 
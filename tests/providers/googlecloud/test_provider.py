@@ -8,7 +8,8 @@ import pytest
 import aiohttpretty
 
 from waterbutler.core import exceptions
-from waterbutler.core.streams import FileStreamReader, ResponseStreamReader
+from waterbutler.core.streams import (FileStreamReader, ResponseStreamReader,
+                                      RangedResponseStream)
 from waterbutler.providers.googlecloud.metadata import GoogleCloudFileMetadata
 from waterbutler.providers.googlecloud import utils, settings, GoogleCloudProvider
 
@@ -211,6 +212,30 @@ class TestCRUD:
         assert isinstance(resp_stream_reader, ResponseStreamReader)
         assert file_content == file_raw
 
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    async def test_download_file_ranged(self, mock_time, mock_provider, file_wb_path, file_raw):
+        mock_provider.is_celery_task = True
+        file_obj_name = utils.get_obj_name(file_wb_path, is_folder=False)
+        signed_url = mock_provider._build_and_sign_url('GET', file_obj_name, **{})
+        content_range = 'bytes 0-{}/{}'.format(len(file_raw) - 1, len(file_raw))
+
+        aiohttpretty.register_uri(
+            'GET',
+            signed_url,
+            body=file_raw,
+            headers={'Content-Range': content_range},
+            status=HTTPStatus.PARTIAL_CONTENT
+        )
+
+        resp_stream_reader = await mock_provider.download(file_wb_path)
+        file_content = await resp_stream_reader.read()
+
+        assert aiohttpretty.has_call(method='GET', uri=signed_url)
+        assert isinstance(resp_stream_reader, RangedResponseStream)
+        assert not resp_stream_reader.partial
+        assert file_content == file_raw
+
     @pytest.mark.asyncio
     @pytest.mark.aiohttpretty
     async def test_download_file_with_accept_url(self, mock_time, mock_provider, file_wb_path):
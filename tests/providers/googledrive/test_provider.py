@@ -275,6 +275,38 @@ class TestValidatePath:
 
         assert wb_path_v1 == wb_path_v0
 
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    async def test_validate_v1_path_cached(self, provider, search_for_file_response,
+                                           actual_file_response):
+        file_name = 'file.txt'
+        file_id = '1234ideclarethumbwar'
+
+        query_url = provider.build_url(
+            'files', provider.folder['id'], 'children',
+            q=_build_title_search_query(provider, file_name, False),
+            fields='items(id)'
+        )
+        specific_url = provider.build_url('files', file_id, fields='id,title,mimeType')
+
+        aiohttpretty.register_json_uri('GET', query_url, body=search_for_file_response)
+        aiohttpretty.register_json_uri('GET', specific_url, body=actual_file_response)
+
+        wb_path = await provider.validate_v1_path('/' + file_name)
+
+        # Resolved from the path id cache, nothing is registered for another lookup
+        aiohttpretty.clear()
+        assert await provider.validate_v1_path('/' + file_name) == wb_path
+
+        # ... until WB deletes the file
+        delete_url = provider.build_url('files', file_id)
+        aiohttpretty.register_json_uri('PUT', delete_url, status=200)
+        await provider.delete(wb_path)
+
+        aiohttpretty.register_json_uri('GET', query_url, body={'items': []})
+        with pytest.raises(exceptions.NotFoundError):
+            await provider.validate_v1_path('/' + file_name)
+
     @pytest.mark.asyncio
     @pytest.mark.aiohttpretty
     async def test_validate_v1_path_root(self, provider):
@@ -1095,6 +1127,56 @@ class TestMetadata:
         assert result == [expected]
         assert aiohttpretty.has_call(method='GET', uri=url)
 
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    async def test_metadata_page(self, provider, root_provider_fixtures):
+        path = GoogleDrivePath(
+            '/hugo/kim/pins/',
+            _ids=[str(x) for x in range(4)]
+        )
+
+        body = generate_list(3, root_provider_fixtures)
+        body['nextPageToken'] = 'pagetwo'
+        item = body['items'][0]
+
+        query = provider._build_query(path.identifier)
+        url = provider.build_url('files', q=query, alt='json', maxResults=2, pageToken='pageone')
+
+        aiohttpretty.register_json_uri('GET', url, body=body)
+
+        page, cursor = await provider.metadata_page(path, 2, cursor='pageone')
+
+        assert page == [GoogleDriveFileMetadata(item, path.child(item['title']))]
+        assert cursor == 'pagetwo'
+        assert aiohttpretty.has_call(method='GET', uri=url)
+
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    async def test_metadata_page_last(self, provider, root_provider_fixtures):
+        path = GoogleDrivePath(
+            '/hugo/kim/pins/',
+            _ids=[str(x) for x in range(4)]
+        )
+
+        query = provider._build_query(path.identifier)
+        url = provider.build_url('files', q=query, alt='json', maxResults=2)
+
+        aiohttpretty.register_json_uri('GET', url, body=generate_list(3, root_provider_fixtures))
+
+        page, cursor = await provider.metadata_page(path, 2)
+
+        assert len(page) == 1
+        assert cursor is None
+
+    @pytest.mark.asyncio
+    async def test_metadata_page_not_found(self, provider):
+        path = GoogleDrivePath('/hugo/kim/pins/', _ids=['0', '1', '2', None])
+
+        with pytest.raises(exceptions.MetadataError) as e:
+            await provider.metadata_page(path, 2)
+
+        assert e.value.code == 404
+
     @pytest.mark.asyncio
     @pytest.mark.aiohttpretty
     async def test_metadata_editable_gdoc_no_revision(self, provider, sharing_fixtures):
@@ -1373,6 +1455,32 @@ class TestMetadata:
         assert result == expected
         assert aiohttpretty.has_call(method='GET', uri=metadata_url)
 
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    async def test_probe_unresolved(self, provider):
+        path = GoogleDrivePath('/Gear1/', _ids=(provider.folder['id'], None))
+
+        assert await provider.probe(path) is False
+
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    async def test_probe_folder(self, provider):
+        path = GoogleDrivePath('/Gear1/', _ids=(provider.folder['id'], 'whyis6afraidof7'))
+        probe_url = provider.build_url('files', 'whyis6afraidof7', fields='labels(trashed)')
+        aiohttpretty.register_json_uri('GET', probe_url, body={'labels': {'trashed': False}})
+
+        assert await provider.probe(path) is True
+        assert aiohttpretty.has_call(method='GET', uri=probe_url)
+
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    async def test_probe_trashed(self, provider):
+        path = GoogleDrivePath('/Gear1/', _ids=(provider.folder['id'], 'whyis6afraidof7'))
+        probe_url = provider.build_url('files', 'whyis6afraidof7', fields='labels(trashed)')
+        aiohttpretty.register_json_uri('GET', probe_url, body={'labels': {'trashed': True}})
+
+        assert await provider.probe(path) is False
+
 
 class TestRevisions:
 
@@ -1632,6 +1740,21 @@ class TestOperationsOrMisc:
         assert child_path.full_path == src_path.full_path
         assert child_path == src_path
 
+    @pytest.mark.asyncio
+    async def test_child_path_duplicate_names(self, provider):
+        parent = GoogleDrivePath('/', _ids=[provider.folder['id']], folder=True)
+        first, second = (
+            GoogleDriveFolderMetadata({'id': _id, 'title': 'dup'}, parent.child('dup', folder=True))
+            for _id in ('id-1', 'id-2')
+        )
+
+        first_path = await provider.child_path(parent, first)
+        second_path = await provider.child_path(parent, second)
+
+        assert first_path.name == second_path.name == 'dup'
+        assert first_path.is_dir and second_path.is_dir
+        assert (first_path.identifier, second_path.identifier) == ('id-1', 'id-2')
+
     @pytest.mark.asyncio
     @pytest.mark.aiohttpretty
     async def test_revalidate_path_file_error(self, provider, root_provider_fixtures,
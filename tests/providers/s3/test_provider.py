@@ -14,6 +14,7 @@ import pytest
 from boto.compat import BytesIO
 from boto.utils import compute_md5
 
+from waterbutler import settings as wb_settings
 from waterbutler.providers.s3 import S3Provider
 from waterbutler.core.path import WaterButlerPath
 from waterbutler.core import streams, metadata, exceptions
@@ -171,6 +172,28 @@ def build_folder_params_with_max_key(path):
     return {'prefix': path.path, 'delimiter': '/', 'max-keys': '1000'}
 
 
+def build_probe_params(path):
+    return {'prefix': path.path, 'max-keys': '1'}
+
+
+def build_walk_params(path):
+    return {'prefix': path.path, 'max-keys': '1000'}
+
+
+def build_walk_listing(path, keys, truncated=False):
+    contents = ''.join(
+        '<Contents><Key>{}{}</Key><LastModified>2009-10-12T17:50:30.000Z</LastModified>'
+        '<ETag>&quot;fba9dede5f27731c9771645a39863328&quot;</ETag><Size>0</Size>'
+        '<StorageClass>STANDARD</StorageClass></Contents>'.format(path.path, key)
+        for key in keys
+    )
+    return ('<?xml version="1.0" encoding="UTF-8"?>'
+            '<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+            '<Name>bucket</Name><Prefix>{}</Prefix><MaxKeys>1000</MaxKeys>'
+            '<IsTruncated>{}</IsTruncated>{}</ListBucketResult>').format(
+                path.path, 'true' if truncated else 'false', contents)
+
+
 class TestRegionDetection:
 
     @pytest.mark.asyncio
@@ -310,6 +333,27 @@ class TestCRUD:
 
         assert content == b'delicious'
 
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    async def test_download_ranged(self, provider, mock_time):
+        provider.is_celery_task = True
+        path = WaterButlerPath('/muhtriangle')
+        response_headers = {'response-content-disposition':
+                            'attachment; filename="muhtriangle"; filename*=UTF-8\'\'muhtriangle'}
+        url = provider.bucket.new_key(path.path).generate_url(100,
+                                                              response_headers=response_headers)
+        aiohttpretty.register_uri('GET', url, body=b'delicious', auto_length=True, status=206,
+                                  headers={'Content-Range': 'bytes 0-8/9'})
+
+        result = await provider.download(path)
+
+        assert isinstance(result, streams.RangedResponseStream)
+        assert not result.partial
+        assert result.size == 9
+        assert await result.read() == b'delicious'
+        first_range = 'bytes=0-{}'.format(wb_settings.PARALLEL_DOWNLOAD_THRESHOLD - 1)
+        assert aiohttpretty.has_call(method='GET', uri=url, headers={'Range': first_range})
+
     @pytest.mark.asyncio
     @pytest.mark.aiohttpretty
     async def test_download_range(self, provider, mock_time):
@@ -1079,6 +1123,91 @@ class TestMetadata:
         assert result[2].extra['md5'] == '1b2cf535f27731c974343645a3985328'
         assert result[2].extra['hashes']['md5'] == '1b2cf535f27731c974343645a3985328'
 
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    async def test_metadata_page(self, provider, folder_metadata, mock_time):
+        path = WaterButlerPath('/darp/')
+        url = provider.bucket.generate_url(100)
+        params = {'prefix': path.path, 'delimiter': '/', 'max-keys': '3', 'marker': 'abc'}
+        body = folder_metadata.replace(
+            '<IsTruncated>false</IsTruncated>',
+            '<IsTruncated>true</IsTruncated><NextMarker>my-image.jpg</NextMarker>'
+        )
+        aiohttpretty.register_uri('GET', url, params=params, body=body,
+                                  headers={'Content-Type': 'application/xml'})
+
+        page, cursor = await provider.metadata_page(path, 3, cursor='abc')
+
+        assert len(page) == 3
+        assert page[0].name == '   photos'
+        assert cursor == 'my-image.jpg'
+        assert aiohttpretty.has_call(method='GET', uri=url, params=params)
+
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    async def test_metadata_page_last(self, provider, folder_metadata, mock_time):
+        path = WaterButlerPath('/darp/')
+        url = provider.bucket.generate_url(100)
+        params = {'prefix': path.path, 'delimiter': '/', 'max-keys': '3'}
+        aiohttpretty.register_uri('GET', url, params=params, body=folder_metadata,
+                                  headers={'Content-Type': 'application/xml'})
+
+        page, cursor = await provider.metadata_page(path, 3)
+
+        assert len(page) == 3
+        assert cursor is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    async def test_walk(self, provider, mock_time):
+        path = WaterButlerPath('/darp/')
+        url = provider.bucket.generate_url(100)
+        params = build_walk_params(path)
+        body = build_walk_listing(path, ['', 'a/', 'a/b/c.txt', 'x.txt'])
+        aiohttpretty.register_uri('GET', url, params=params, body=body,
+                                  headers={'Content-Type': 'application/xml'})
+
+        pages = [page async for page in provider.walk(path)]
+
+        assert len(pages) == 1
+        assert [(x.kind, x.name) for x in pages[0]] == [
+            ('folder', 'a'), ('folder', 'b'), ('file', 'c.txt'), ('file', 'x.txt'),
+        ]
+        assert pages[0][1].path.endswith('/darp/a/b/')
+
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    async def test_walk_max_depth(self, provider, mock_time):
+        path = WaterButlerPath('/darp/')
+        url = provider.bucket.generate_url(100)
+        params = build_walk_params(path)
+        body = build_walk_listing(path, ['a/b/c.txt', 'x.txt'])
+        aiohttpretty.register_uri('GET', url, params=params, body=body,
+                                  headers={'Content-Type': 'application/xml'})
+
+        pages = [page async for page in provider.walk(path, max_depth=1)]
+
+        assert [(x.kind, x.name) for x in pages[0]] == [('folder', 'a'), ('file', 'x.txt')]
+
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    async def test_walk_paged(self, provider, mock_time):
+        path = WaterButlerPath('/darp/')
+        url = provider.bucket.generate_url(100)
+        params = build_walk_params(path)
+        aiohttpretty.register_uri('GET', url, params=params,
+                                  body=build_walk_listing(path, ['a/b.txt'], truncated=True),
+                                  headers={'Content-Type': 'application/xml'})
+        next_params = dict(params, marker=path.path + 'a/b.txt')
+        aiohttpretty.register_uri('GET', url, params=next_params,
+                                  body=build_walk_listing(path, ['a/c.txt']),
+                                  headers={'Content-Type': 'application/xml'})
+
+        pages = [page async for page in provider.walk(path)]
+
+        assert [[x.name for x in page] for page in pages] == [['a', 'b.txt'], ['c.txt']]
+        assert aiohttpretty.has_call(method='GET', uri=url, params=next_params)
+
     @pytest.mark.asyncio
     @pytest.mark.aiohttpretty
     async def test_metadata_folder_self_listing(self, provider, folder_and_contents, mock_time):
@@ -1230,12 +1359,24 @@ class TestMetadata:
 
 class TestCreateFolder:
 
+    @pytest.mark.asyncio
+    @pytest.mark.aiohttpretty
+    async def test_probe_empty_listing(self, provider, folder_empty_metadata, mock_time):
+        path = WaterButlerPath('/empty/')
+        url = provider.bucket.generate_url(100, 'GET')
+        params = build_probe_params(path)
+        aiohttpretty.register_uri('GET', url, params=params, body=folder_empty_metadata,
+                                  headers={'Content-Type': 'application/xml'})
+
+        assert await provider.probe(path) is False
+        assert aiohttpretty.has_call(method='GET', uri=url, params=params)
+
     @pytest.mark.asyncio
     @pytest.mark.aiohttpretty
     async def test_raise_409(self, provider, folder_metadata, mock_time):
         path = WaterButlerPath('/alreadyexists/')
         url = provider.bucket.generate_url(100, 'GET')
-        params = build_folder_params_with_max_key(path)
+        params = build_probe_params(path)
         aiohttpretty.register_uri('GET', url, params=params, body=folder_metadata,
                                   headers={'Content-Type': 'application/xml'})
 
@@ -1273,7 +1414,7 @@ class TestCreateFolder:
     async def test_errors_out(self, provider, mock_time):
         path = WaterButlerPath('/alreadyexists/')
         url = provider.bucket.generate_url(100, 'GET')
-        params = build_folder_params_with_max_key(path)
+        params = build_probe_params(path)
         create_url = provider.bucket.new_key(path.path).generate_url(100, 'PUT')
 
         aiohttpretty.register_uri('GET', url, params=params, status=404)
@@ -1289,7 +1430,7 @@ class TestCreateFolder:
     async def test_errors_out_metadata(self, provider, mock_time):
         path = WaterButlerPath('/alreadyexists/')
         url = provider.bucket.generate_url(100, 'GET')
-        params = build_folder_params_with_max_key(path)
+        params = build_probe_params(path)
 
         aiohttpretty.register_uri('GET', url, params=params, status=403)
 
@@ -1303,7 +1444,7 @@ class TestCreateFolder:
     async def test_creates(self, provider, mock_time):
         path = WaterButlerPath('/doesntalreadyexists/')
         url = provider.bucket.generate_url(100, 'GET')
-        params = build_folder_params_with_max_key(path)
+        params = build_probe_params(path)
         create_url = provider.bucket.new_key(path.path).generate_url(100, 'PUT')
 
         aiohttpretty.register_uri('GET', url, params=params, status=404)
@@ -2,12 +2,14 @@ import pytest
 
 import json
 import asyncio
+from unittest import mock
 
 from tornado import testing
 from tornado import httpclient
 
 from waterbutler.core import streams
 from waterbutler.core import exceptions
+from waterbutler.core.cache import metadata_cache
 
 from tests import utils
 
@@ -243,3 +245,29 @@ class TestCrudHandler(utils.HandlerTestCase):
         args, kwargs = calls[0]
         assert kwargs.get('action') == 'create_folder'
         assert resp.code == 201
+
+    @testing.gen_test
+    def test_delete_invalidates_metadata_cache(self):
+        self.mock_provider.delete = utils.MockCoroutine()
+
+        with mock.patch.object(metadata_cache, 'invalidate_scope') as invalidate_scope:
+            yield self.http_client.fetch(
+                self.get_url('/file?provider=queenhub&path=/john.png'),
+                method='DELETE',
+            )
+
+        invalidate_scope.assert_called_once_with(self.mock_provider)
+
+    @testing.gen_test
+    def test_download_keeps_metadata_cache(self):
+        stream = streams.StringStream(b'freddie')
+        stream.name = 'foo'
+        stream.content_type = 'application/octet-stream'
+        self.mock_provider.download = utils.MockCoroutine(return_value=stream)
+
+        with mock.patch.object(metadata_cache, 'invalidate_scope') as invalidate_scope:
+            yield self.http_client.fetch(
+                self.get_url('/file?provider=queenhub&path=/freddie.png'),
+            )
+
+        assert not invalidate_scope.called
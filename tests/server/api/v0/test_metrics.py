@@ -0,0 +1,43 @@
+from unittest import mock
+from http import HTTPStatus
+
+from tornado import testing, httpclient
+
+from tests import utils
+from waterbutler.server import settings
+
+
+class TestMetricsHandler(utils.HandlerTestCase):
+
+    @testing.gen_test
+    def test_get(self):
+        yield self.http_client.fetch(self.get_url('/status'))
+
+        with mock.patch.object(settings, 'METRICS_ENABLED', True):
+            resp = yield self.http_client.fetch(self.get_url('/metrics'))
+        body = resp.body.decode()
+
+        assert resp.code == HTTPStatus.OK
+        assert resp.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+        assert '# TYPE waterbutler_requests_total counter' in body
+        assert 'waterbutler_requests_total{handler="StatusHandler",method="GET",status="200"}' in body
+        assert '# TYPE waterbutler_upstream_phase_seconds histogram' in body
+
+    @testing.gen_test
+    def test_disabled_by_default(self):
+        with self.assertRaises(httpclient.HTTPError) as exc:
+            yield self.http_client.fetch(self.get_url('/metrics'))
+
+        assert exc.exception.code == HTTPStatus.NOT_FOUND
+
+    @testing.gen_test
+    def test_needs_token(self):
+        with mock.patch.object(settings, 'METRICS_ENABLED', True), \
+                mock.patch.object(settings, 'INTERNAL_API_TOKEN', 'secret'):
+            with self.assertRaises(httpclient.HTTPError) as exc:
+                yield self.http_client.fetch(self.get_url('/metrics'))
+            resp = yield self.http_client.fetch(self.get_url('/metrics'),
+                                                headers={'Authorization': 'Bearer secret'})
+
+        assert exc.exception.code == HTTPStatus.FORBIDDEN
+        assert resp.code == HTTPStatus.OK
@@ -1,8 +1,10 @@
 import json
+from unittest import mock
 
 from tornado import testing
 
 from waterbutler.core.path import WaterButlerPath
+from waterbutler.core.cache import metadata_cache
 
 from tests import utils
 
@@ -99,3 +101,21 @@ class TestMoveHandler(utils.MultiProviderHandlerTestCase):
             'move',
             utils.MockFileMetadata()
         )
+
+    @testing.gen_test
+    def test_invalidates_metadata_cache(self):
+        self.source_provider.move = utils.MockCoroutine(
+            return_value=(utils.MockFileMetadata(), False)
+        )
+
+        with mock.patch.object(metadata_cache, 'invalidate_scope') as invalidate_scope:
+            yield self.http_client.fetch(
+                self.get_url('/ops/move'),
+                method='POST',
+                body=json.dumps(self.payload())
+            )
+
+        invalidate_scope.assert_has_calls([
+            mock.call(self.source_provider),
+            mock.call(self.destination_provider),
+        ])
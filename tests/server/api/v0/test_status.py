@@ -1,10 +1,13 @@
 import json
+from unittest import mock
 from http import HTTPStatus
 
 from tornado import testing
 
 from tests import utils
 from waterbutler.version import __version__
+from waterbutler.server import settings
+from waterbutler.core.circuitbreaker import circuit_breakers
 
 
 class TestStatusHandler(utils.HandlerTestCase):
@@ -14,9 +17,44 @@ class TestStatusHandler(utils.HandlerTestCase):
         expected = {
             'status': 'up',
             'version': __version__,
+            'circuit_breakers': {'closed': 0, 'open': 0, 'half-open': 0, 'rejected': 0},
         }
         resp = yield self.http_client.fetch(
             self.get_url('/status'),
         )
         assert resp.code == HTTPStatus.OK
         assert expected == json.loads(resp.body.decode())
+
+    @testing.gen_test
+    def test_get_open_circuit(self):
+        circuit_breakers.record_failure('down.example.com')
+        try:
+            resp = yield self.http_client.fetch(
+                self.get_url('/status'),
+            )
+        finally:
+            circuit_breakers.clear()
+        assert resp.code == HTTPStatus.OK
+        body = json.loads(resp.body.decode())
+        assert body['circuit_breakers'] == {'closed': 1, 'open': 0, 'half-open': 0, 'rejected': 0}
+        assert 'down.example.com' not in resp.body.decode()
+
+    @testing.gen_test
+    def test_get_open_circuit_internal(self):
+        circuit_breakers.record_failure('down.example.com')
+        try:
+            with mock.patch.object(settings, 'INTERNAL_API_TOKEN', 'secret'):
+                resp = yield self.http_client.fetch(
+                    self.get_url('/status'),
+                    headers={'Authorization': 'Bearer secret'},
+                )
+                wrong = yield self.http_client.fetch(
+                    self.get_url('/status'),
+                    headers={'Authorization': 'Bearer guess'},
+                )
+        finally:
+            circuit_breakers.clear()
+        assert json.loads(resp.body.decode())['circuit_breakers'] == {
+            'down.example.com': {'state': 'closed', 'failures': 1, 'rejected': 0},
+        }
+        assert 'down.example.com' not in wrong.body.decode()
@@ -1,3 +1,4 @@
+import asyncio
 from http import client
 from unittest import mock
 
@@ -90,6 +91,7 @@ class TestValidatePut:
         handler.kind = 'folder'
         handler.get_query_argument = mock.Mock(return_value='child!')
         handler.provider.exists = MockCoroutine(return_value=True)
+        handler.provider.can_duplicate_names = mock.Mock(return_value=True)
 
         with pytest.raises(exceptions.NamingConflict) as exc:
             await handler.postvalidate_put()
@@ -140,6 +142,33 @@ class TestValidatePut:
         handler.provider.exists.assert_called_with(
             WaterButlerPath('/Folder1/child!', prepend=None))
 
+    @pytest.mark.asyncio
+    async def test_postvalidate_put_probes_concurrently(self, http_request):
+
+        handler = mock_handler(http_request)
+        handler.path = WaterButlerPath('/Folder1/')
+        handler.kind = 'file'
+        handler.provider.can_duplicate_names = mock.Mock(return_value=False)
+        handler.get_query_argument = mock.Mock(return_value='child!')
+
+        started = []
+        both_started = asyncio.Event()
+
+        async def probe(path):
+            started.append(path)
+            if len(started) == 2:
+                both_started.set()
+            await asyncio.wait_for(both_started.wait(), 1)
+            # only the flipped kind exists
+            return path is started[1]
+
+        handler.provider.probe = probe
+
+        with pytest.raises(exceptions.NamingConflict):
+            await handler.postvalidate_put()
+
+        assert len(started) == 2
+
     def test_invalid_kind(self, http_request):
 
         handler = mock_handler(http_request)
@@ -4,7 +4,9 @@ import mock
 import pytest
 
 from tests.utils import MockCoroutine
+from waterbutler.core import exceptions
 from waterbutler.core.path import WaterButlerPath
+from waterbutler.core.cache import metadata_cache
 
 from tests.server.api.v1.utils import mock_handler
 from tests.server.api.v1.fixtures import (http_request, handler_auth, mock_stream,
@@ -31,6 +33,10 @@ def provider_s3_compat(auth, credentials, settings):
     return provider
 
 
+def written_json(handler):
+    return json.loads(b''.join(call[0][0] for call in handler.write.call_args_list).decode())
+
+
 class TestMetadataMixin:
 
     @pytest.mark.asyncio
@@ -53,26 +59,29 @@ class TestMetadataMixin:
         # metadata of the actual folder. This should be true of all providers.
 
         handler = mock_handler(http_request)
+        handler.path = WaterButlerPath('/folder/')
         handler.provider.metadata = MockCoroutine(return_value=mock_folder_children)
 
         serialized_data = [x.json_api_serialized(handler.resource) for x in mock_folder_children]
 
         await handler.get_folder()
 
-        handler.write.assert_called_once_with({'data': serialized_data})
+        assert written_json(handler) == {'data': serialized_data}
+        assert handler._headers['Content-Type'] == 'application/json; charset=UTF-8'
 
     @pytest.mark.asyncio
     async def test_get_folder_with_next_token(self, http_request, provider_s3, mock_folder_children_provider_s3):
         # The get_folder method expected behavior is to return folder children's metadata, not the
         # metadata of the actual folder. This should be true of all providers.
         handler = mock_handler(http_request)
+        handler.path = WaterButlerPath('/folder/')
         handler.request.query_arguments['next_token'] = [b'']
         handler.provider = provider_s3
         handler.write = mock.Mock()
         handler.provider.metadata = MockCoroutine(return_value=mock_folder_children_provider_s3)
 
         await handler.get_folder()
-        call_args = handler.write.call_args[0][0]
+        call_args = written_json(handler)
         assert isinstance(call_args, dict)
         assert call_args['next_token'] == 'aaaa'
         assert isinstance(call_args['next_token'], str)
@@ -83,18 +92,168 @@ class TestMetadataMixin:
         # The get_folder method expected behavior is to return folder children's metadata, not the
         # metadata of the actual folder. This should be true of all providers.
         handler = mock_handler(http_request)
+        handler.path = WaterButlerPath('/folder/')
         handler.request.query_arguments['next_token'] = [b'']
         handler.provider = provider_s3_compat
         handler.write = mock.Mock()
         handler.provider.metadata = MockCoroutine(return_value=mock_folder_children_provider_s3)
 
         await handler.get_folder()
-        call_args = handler.write.call_args[0][0]
+        call_args = written_json(handler)
         assert isinstance(call_args, dict)
         assert call_args['next_token'] == 'aaaa'
         assert isinstance(call_args['next_token'], str)
         assert isinstance(call_args['data'], list)
 
+    @pytest.mark.asyncio
+    async def test_get_folder_cached(self, http_request, mock_folder_children):
+        handler = mock_handler(http_request)
+        handler.path = WaterButlerPath('/folder/')
+        handler.provider.metadata = MockCoroutine(return_value=mock_folder_children)
+
+        await handler.get_folder()
+        await handler.get_folder()
+
+        assert handler.provider.metadata.call_count == 1
+        assert handler.write.call_count == 2
+        assert handler.write.call_args_list[0] == handler.write.call_args_list[1]
+
+        # a write through WB with the same credentials drops the listing
+        metadata_cache.invalidate_scope(handler.provider)
+        await handler.get_folder()
+
+        assert handler.provider.metadata.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_folder_writes_as_encoded(self, http_request, mock_folder_children,
+                                                monkeypatch):
+        monkeypatch.setattr('waterbutler.server.settings.LISTING_BATCH_SIZE', 1)
+        handler = mock_handler(http_request)
+        handler.path = WaterButlerPath('/folder/')
+        handler.provider.metadata = MockCoroutine(return_value=mock_folder_children)
+        encoded = []
+        handler.flush = MockCoroutine(side_effect=lambda: encoded.append(handler.write.call_count))
+
+        await handler.get_folder()
+
+        # every entry is flushed before the next one is written
+        assert encoded == [1, 2, 3, 4]
+        assert written_json(handler) == {
+            'data': [x.json_api_serialized(handler.resource) for x in mock_folder_children],
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_folder_cache_disabled(self, http_request, mock_folder_children,
+                                             monkeypatch):
+        monkeypatch.setattr(metadata_cache, 'maxsize', 0)
+        handler = mock_handler(http_request)
+        handler.path = WaterButlerPath('/folder/')
+        handler.provider.metadata = MockCoroutine(return_value=mock_folder_children)
+
+        assert await handler._list_folder(None, None) is None
+        await handler.get_folder()
+
+        assert handler.provider.metadata.call_count == 2
+        assert len(metadata_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_get_folder_too_big_to_cache(self, http_request, mock_folder_children,
+                                               monkeypatch):
+        monkeypatch.setattr('waterbutler.server.settings.LISTING_BATCH_SIZE', 1)
+        monkeypatch.setattr('waterbutler.server.settings.MAX_CACHED_LISTING_SIZE', 100)
+        handler = mock_handler(http_request)
+        handler.path = WaterButlerPath('/folder/')
+        handler.provider.metadata = MockCoroutine(return_value=mock_folder_children)
+
+        await handler.get_folder()
+        assert len(metadata_cache) == 0
+
+        handler.write.reset_mock()
+        await handler.get_folder()
+
+        assert handler.provider.metadata.call_count == 2
+        assert written_json(handler) == {
+            'data': [x.json_api_serialized(handler.resource) for x in mock_folder_children],
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_folder_paged(self, http_request, mock_folder_children):
+        handler = mock_handler(http_request)
+        handler.path = WaterButlerPath('/folder/')
+        handler.request.query_arguments['page_size'] = [b'2']
+        handler.request.query_arguments['cursor'] = [b'2']
+        handler.provider.metadata_page = MockCoroutine(return_value=(mock_folder_children, '4'))
+
+        await handler.get_folder()
+
+        assert written_json(handler) == {
+            'data': [x.json_api_serialized(handler.resource) for x in mock_folder_children],
+            'next_cursor': '4',
+        }
+        handler.provider.metadata_page.assert_called_once_with(handler.path, 2, cursor='2',
+                                                               version=None, revision=None)
+
+    @pytest.mark.asyncio
+    async def test_get_folder_paged_default_page_size(self, http_request, mock_folder_children):
+        handler = mock_handler(http_request)
+        handler.path = WaterButlerPath('/folder/')
+        handler.request.query_arguments['cursor'] = [b'aaaa']
+        handler.provider.metadata_page = MockCoroutine(return_value=(mock_folder_children, None))
+
+        await handler.get_folder()
+
+        assert written_json(handler)['next_cursor'] is None
+        handler.provider.metadata_page.assert_called_once_with(handler.path, 1000, cursor='aaaa',
+                                                               version=None, revision=None)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('page_size', [b'0', b'-1', b'1001', b'ten'])
+    async def test_get_folder_paged_invalid_page_size(self, http_request, page_size):
+        handler = mock_handler(http_request)
+        handler.path = WaterButlerPath('/folder/')
+        handler.request.query_arguments['page_size'] = [page_size]
+        handler.provider.metadata_page = MockCoroutine()
+
+        with pytest.raises(exceptions.InvalidParameters):
+            await handler.get_folder()
+
+        assert not handler.provider.metadata_page.called
+
+    @pytest.mark.asyncio
+    async def test_get_folder_recursive(self, http_request, mock_folder_children):
+        handler = mock_handler(http_request)
+        handler.path = WaterButlerPath('/folder/')
+        handler.request.query_arguments['recursive'] = [b'']
+        handler.request.query_arguments['depth'] = [b'2']
+
+        async def walk(path, max_depth=None):
+            assert max_depth == 2
+            yield mock_folder_children[:1]
+            yield mock_folder_children[1:]
+
+        handler.provider.walk = walk
+
+        await handler.get_folder()
+
+        written = ''.join(call[0][0] for call in handler.write.call_args_list)
+        assert written.endswith('\n')
+        assert [json.loads(line) for line in written.splitlines()] == [
+            x.json_api_serialized(handler.resource) for x in mock_folder_children
+        ]
+        assert handler._headers['Content-Type'] == 'application/x-ndjson; charset=UTF-8'
+        assert handler.flush.call_count == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('depth', [b'0', b'-1', b'deep'])
+    async def test_get_folder_recursive_invalid_depth(self, http_request, depth):
+        handler = mock_handler(http_request)
+        handler.path = WaterButlerPath('/folder/')
+        handler.request.query_arguments['recursive'] = [b'']
+        handler.request.query_arguments['depth'] = [depth]
+
+        with pytest.raises(exceptions.InvalidParameters):
+            await handler.get_folder()
+
     @pytest.mark.asyncio
     async def test_get_folder_download_as_zip(self, http_request,):
         # Including 'zip' in the query params should trigger the download_as_zip method
@@ -1,7 +1,10 @@
+import asyncio
+
 import pytest
 
 from waterbutler.core import exceptions
 from waterbutler.core.path import WaterButlerPath
+from waterbutler.server.api.v1.provider.movecopy import preflight
 
 from tests.server.api.v1.utils import mock_handler
 from tests.server.api.v1.fixtures import (http_request, move_copy_args, handler_auth,
@@ -70,7 +73,8 @@ class TestMoveOrCopy:
 
         await handler.move_or_copy()
 
-        mock_make_provider.assert_called_with('MockProvider',
+        # the destination provider defaults to the one named in the url
+        mock_make_provider.assert_called_with('test',
                                               handler.auth['auth'],
                                               handler.auth['credentials'],
                                               handler.auth['settings'])
@@ -96,7 +100,8 @@ class TestMoveOrCopy:
 
         await handler.move_or_copy()
 
-        mock_make_provider.assert_called_with('MockProvider',
+        # the destination provider defaults to the one named in the url
+        mock_make_provider.assert_called_with('test',
                                               handler.auth['auth'],
                                               handler.auth['credentials'],
                                               handler.auth['settings'])
@@ -189,3 +194,65 @@ class TestMoveOrCopy:
                                        conflict='warn',
                                        rename='renamed path',
                                        request=serialized_request)
+
+
+class TestPreflight:
+
+    @pytest.mark.asyncio
+    async def test_runs_concurrently(self):
+        both_started = asyncio.Event()
+        started = []
+
+        async def step(name):
+            started.append(name)
+            if len(started) == 2:
+                both_started.set()
+            await asyncio.wait_for(both_started.wait(), 1)
+
+        await preflight(step('source'), step('destination'))
+
+        assert started == ['source', 'destination']
+
+    @pytest.mark.asyncio
+    async def test_source_error_cancels_destination(self):
+        destination_cancelled = asyncio.Event()
+
+        async def source():
+            raise exceptions.NotFoundError('/source')
+
+        async def destination():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                destination_cancelled.set()
+                raise
+
+        with pytest.raises(exceptions.NotFoundError):
+            await preflight(source(), destination())
+
+        await asyncio.wait_for(destination_cancelled.wait(), 1)
+
+    @pytest.mark.asyncio
+    async def test_source_error_wins(self):
+
+        async def source():
+            await asyncio.sleep(0.01)
+            raise exceptions.NotFoundError('/source')
+
+        async def destination():
+            raise exceptions.InvalidParameters('bad destination')
+
+        with pytest.raises(exceptions.NotFoundError):
+            await preflight(source(), destination())
+
+    @pytest.mark.asyncio
+    async def test_destination_error(self):
+
+        async def source():
+            await asyncio.sleep(0.01)
+
+        async def destination():
+            raise exceptions.InvalidParameters('bad destination')
+
+        with pytest.raises(exceptions.InvalidParameters):
+            await preflight(source(), destination())
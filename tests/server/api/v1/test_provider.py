@@ -1,3 +1,4 @@
+import asyncio
 from uuid import UUID
 from unittest import mock
 
@@ -5,6 +6,7 @@ import pytest
 
 from waterbutler.auth.osf.handler import EXPORT_DATA_FAKE_NODE_ID
 from waterbutler.core.path import WaterButlerPath
+from waterbutler.core.cache import metadata_cache
 from waterbutler.server.api.v1.provider import list_or_value
 
 from tests.server.api.v1.utils import mock_handler
@@ -75,6 +77,24 @@ class TestProviderHandler:
         # check that X-WATERBUTLER-REQUEST-ID is valid UUID
         assert UUID(handler._headers['X-WATERBUTLER-REQUEST-ID'], version=4)
 
+    @pytest.mark.asyncio
+    async def test_prepare_coalesces_path_validation(self, http_request, patch_auth_handler,
+                                                     patch_make_provider_core):
+        calls = []
+
+        async def validate_v1_path(path, **kwargs):
+            calls.append(path)
+            await asyncio.sleep(0.01)
+            return WaterButlerPath('/file', prepend=None)
+
+        patch_make_provider_core.return_value.validate_v1_path = validate_v1_path
+        handlers = [mock_handler(http_request), mock_handler(http_request)]
+        await asyncio.gather(*[handler.prepare() for handler in handlers])
+
+        assert len(calls) == 1
+        assert handlers[0].path == handlers[1].path == WaterButlerPath('/file', prepend=None)
+        assert handlers[0].path is not handlers[1].path
+
     @pytest.mark.asyncio
     async def test_prepare_stream(self, http_request):
 
@@ -214,6 +234,22 @@ class TestProviderHandlerFinish:
         assert handler.on_finish() is None
         handler._send_hook.assert_called_once_with('download_zip')
 
+    @pytest.mark.asyncio
+    async def test_on_finish_invalidates_metadata_cache(self, http_request):
+
+        handler = mock_handler(http_request)
+        handler.request.method = 'DELETE'
+        handler.path = WaterButlerPath('/file')
+        handler.set_status(400)
+
+        with mock.patch.object(metadata_cache, 'invalidate_scope') as invalidate_scope:
+            handler.on_finish()
+
+        invalidate_scope.assert_has_calls([
+            mock.call(handler.provider),
+            mock.call(handler.dest_provider),
+        ])
+
     @pytest.mark.asyncio
     async def test_dont_send_hook_on_file_metadata(self, http_request):
 
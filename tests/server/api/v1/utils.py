@@ -57,6 +57,7 @@ def mock_handler(http_request):
     handler.arguments = {}
     handler.write = Mock()
     handler.write_stream = MockCoroutine()
+    handler.flush = MockCoroutine()
     handler.redirect = Mock()
     handler.uploader = asyncio.Future()
     handler.wsock = Mock()
@@ -0,0 +1,34 @@
+import asyncio
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from waterbutler.server import app
+
+
+class TestReleaseProviders:
+
+    @pytest.mark.asyncio
+    async def test_waits_for_log_futures(self):
+        callback = asyncio.get_event_loop().create_future()
+        handler = SimpleNamespace(provider='src', dest_provider='dest', log_futures=[callback])
+
+        with mock.patch.object(app, 'provider_pool') as pool:
+            app.release_providers(handler)
+            await asyncio.sleep(0)
+            assert not pool.release.called
+
+            callback.set_exception(ValueError('callback failed'))
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+
+        assert pool.release.call_args_list == [mock.call('src'), mock.call('dest')]
+
+    def test_releases_without_log_futures(self):
+        handler = SimpleNamespace(provider='src')
+
+        with mock.patch.object(app, 'provider_pool') as pool:
+            app.release_providers(handler)
+
+        assert pool.release.call_args_list == [mock.call('src'), mock.call(None)]
@@ -0,0 +1,94 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from tests import utils
+from waterbutler.server import metrics
+from waterbutler.core.metrics import (CounterFamily, GaugeFamily, HistogramFamily,
+                                      MetricsRegistry)
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+class TestMetricsRegistry:
+
+    def test_expose(self, registry):
+        counter = registry.register(CounterFamily('test_total', 'A counter', ('kind', )))
+        counter.inc('a "quoted"\nvalue')
+        counter.inc('b', amount=2)
+        gauge = registry.register(GaugeFamily('test_gauge', 'A gauge'))
+        gauge.set(3.5)
+        histogram = registry.register(HistogramFamily('test_seconds', 'A histogram', (),
+                                                      buckets=(1, )))
+        histogram.observe(0.5)
+
+        assert registry.expose() == (
+            '# HELP test_gauge A gauge\n'
+            '# TYPE test_gauge gauge\n'
+            'test_gauge 3.5\n'
+            '# HELP test_seconds A histogram\n'
+            '# TYPE test_seconds histogram\n'
+            'test_seconds_bucket{le="1"} 1\n'
+            'test_seconds_bucket{le="+Inf"} 1\n'
+            'test_seconds_sum 0.5\n'
+            'test_seconds_count 1\n'
+            '# HELP test_total A counter\n'
+            '# TYPE test_total counter\n'
+            'test_total{kind="a \\"quoted\\"\\nvalue"} 1\n'
+            'test_total{kind="b"} 2\n'
+        )
+
+    def test_callback(self, registry):
+        registry.register(CounterFamily('test_total', 'A counter', ('kind', ),
+                                        callback=lambda: {('a', ): 7}))
+
+        assert 'test_total{kind="a"} 7\n' in registry.expose()
+
+    def test_wrong_label_count(self):
+        with pytest.raises(ValueError):
+            CounterFamily('test_total', 'A counter', ('kind', )).inc()
+
+
+class TestRecording:
+
+    def test_record_provider(self):
+        provider = utils.MockProvider1({}, {}, {})
+        provider.provider_metrics.incr('requests.count')
+        provider.provider_metrics.incr('requests.tally.ok')
+        provider.provider_metrics.add('requests.throttle_wait', 0.5)
+        before = metrics.provider_events.get('MockProvider1', 'tally.ok')
+
+        metrics.record_provider(provider)
+
+        assert metrics.provider_events.get('MockProvider1', 'tally.ok') == before + 1
+        assert metrics.provider_events.get('MockProvider1', 'throttle_wait') >= 0.5
+
+    def test_record_request(self):
+        handler = mock.Mock(spec=['request', 'get_status', 'bytes_downloaded'])
+        handler.request.method = 'GET'
+        handler.request.request_time.return_value = 0.1
+        handler.get_status.return_value = 200
+        handler.bytes_downloaded = 10
+        name = type(handler).__name__
+        before = metrics.requests_total.get(name, 'GET', '200')
+        downloaded = metrics.bytes_downloaded.get()
+
+        metrics.record_request(handler)
+
+        assert metrics.requests_total.get(name, 'GET', '200') == before + 1
+        assert metrics.bytes_downloaded.get() == downloaded + 10
+
+    @pytest.mark.asyncio
+    async def test_track_upload(self):
+        before = metrics.uploads_in_flight.get()
+        future = metrics.track_upload(asyncio.Future())
+        assert metrics.uploads_in_flight.get() == before + 1
+
+        future.set_result(None)
+        await asyncio.sleep(0)
+
+        assert metrics.uploads_in_flight.get() == before
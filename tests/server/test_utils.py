@@ -1,11 +1,20 @@
+import asyncio
+import tempfile
+from types import SimpleNamespace
 from unittest import mock
 
 import pytest
-from tornado import testing
+import tornado.iostream
+from tornado import escape, testing, web
+from tornado.http1connection import HTTP1Connection
 
+from tests.utils import MockCoroutine
 from tests.server.api.v1.utils import ServerTestCase
 
-from waterbutler.server.utils import CORsMixin, parse_request_range
+from waterbutler.server import utils
+from waterbutler.core import streams
+from waterbutler.server.utils import (CORsMixin, UtilMixin, encode_listing,
+                                      parse_request_range, )
 
 
 class MockHandler(CORsMixin):
@@ -189,3 +198,284 @@ class TestRangeParsing():
         result = parse_request_range(range_header)
         assert result == expected
 
+
+
+class MockListingItem:
+
+    def __init__(self, name):
+        self.name = name
+
+    def json_api_serialized(self, resource):
+        return {'id': self.name, 'links': {'resource': resource, 'unsafe': '</script>'}}
+
+
+class TestEncodeListing:
+
+    @pytest.mark.parametrize('count', [0, 1, 2, 3, 4])
+    @pytest.mark.parametrize('batch_size', [1, 2, 3])
+    @pytest.mark.parametrize('next_token', [None, '', 'aaaa'])
+    def test_matches_write(self, count, batch_size, next_token):
+        items = [MockListingItem('item{}'.format(i)) for i in range(count)]
+        expected = {'data': [item.json_api_serialized('guid0') for item in items]}
+        if next_token is not None:
+            expected['next_token'] = next_token
+
+        chunks = list(encode_listing(items, 'guid0', next_token=next_token, batch_size=batch_size))
+
+        assert b''.join(chunks) == escape.utf8(escape.json_encode(expected))
+        assert len(chunks) == count // batch_size + 1
+
+    @pytest.mark.parametrize('next_cursor', [None, 'aaaa'])
+    def test_extra(self, next_cursor):
+        items = [MockListingItem('item{}'.format(i)) for i in range(3)]
+        expected = {
+            'data': [item.json_api_serialized('guid0') for item in items],
+            'next_cursor': next_cursor,
+        }
+
+        chunks = list(encode_listing(items, 'guid0', batch_size=2,
+                                     extra={'next_cursor': next_cursor}))
+
+        assert b''.join(chunks) == escape.utf8(escape.json_encode(expected))
+
+
+FILE_CONTENT = bytes(range(256)) * 4096  # 1MB, bigger than a socket buffer
+
+
+class FileHandler(UtilMixin, web.RequestHandler):
+
+    async def get(self):
+        fp = tempfile.TemporaryFile()
+        fp.write(FILE_CONTENT)
+        if 'Range' in self.request.headers:
+            stream = streams.PartialFileStreamReader(
+                fp, parse_request_range(self.request.headers['Range']))
+            self.set_status(206)
+        else:
+            stream = streams.FileStreamReader(fp)
+        if 'tee' in self.request.query_arguments:
+            stream.add_writer('tee', mock.Mock())
+        self.set_header('Content-Length', str(self.get_query_argument('length', stream.size)))
+        await self.write_stream(stream)
+        self.application.settings['sent'].append(self.bytes_downloaded)
+        stream.close()
+
+
+class TestWriteFile(ServerTestCase):
+
+    def get_app(self):
+        self.sent = []
+        return web.Application([(r'/v1/file', FileHandler)], sent=self.sent)
+
+    @testing.gen_test
+    def test_sendfile(self):
+        with mock.patch.object(utils.os, 'sendfile', wraps=utils.os.sendfile) as sendfile:
+            resp = yield self.http_client.fetch(self.get_url('/file'))
+
+        assert resp.body == FILE_CONTENT
+        assert sendfile.called
+        assert self.sent == [len(FILE_CONTENT)]
+
+    @testing.gen_test
+    def test_sendfile_range(self):
+        with mock.patch.object(utils.os, 'sendfile', wraps=utils.os.sendfile) as sendfile:
+            resp = yield self.http_client.fetch(self.get_url('/file'),
+                                                headers={'Range': 'bytes=1000-300999'})
+
+        assert resp.code == 206
+        assert resp.body == FILE_CONTENT[1000:301000]
+        assert sendfile.called
+
+    @testing.gen_test
+    def test_read_through_without_sendfile(self):
+        with mock.patch.object(utils, 'os', SimpleNamespace()), \
+                mock.patch.object(UtilMixin, '_sendfile') as sendfile:
+            resp = yield self.http_client.fetch(self.get_url('/file'),
+                                                headers={'Range': 'bytes=10-99999'})
+
+        assert resp.body == FILE_CONTENT[10:100000]
+        assert not sendfile.called
+        assert self.sent == [100000 - 10]
+
+    @testing.gen_test
+    def test_read_through_on_other_tornado_versions(self):
+        with mock.patch.object(utils.tornado, 'version_info', (6, 1, 0, 0)), \
+                mock.patch.object(utils.os, 'sendfile', wraps=utils.os.sendfile) as sendfile:
+            resp = yield self.http_client.fetch(self.get_url('/file'))
+
+        assert resp.body == FILE_CONTENT
+        assert not sendfile.called
+        assert self.sent == [len(FILE_CONTENT)]
+
+    def test_no_sendfile_without_content_length_accounting(self):
+        stream = tornado.iostream.IOStream.__new__(tornado.iostream.IOStream)
+        connection = SimpleNamespace(stream=stream)
+
+        assert not UtilMixin._can_sendfile(connection)
+        connection._expected_content_remaining = 10
+        assert UtilMixin._can_sendfile(connection)
+
+    @testing.gen_test
+    def test_teed_stream_is_read_through(self):
+        with mock.patch.object(UtilMixin, 'write_file') as write_file:
+            resp = yield self.http_client.fetch(self.get_url('/file?tee'))
+
+        assert resp.body == FILE_CONTENT
+        assert not write_file.called
+
+
+class TestZeroCopyRange:
+
+    @pytest.mark.parametrize('length,expected', [('5', True), ('100', False), (None, False)])
+    def test_zero_copy_needs_content_length(self, length, expected):
+        handler = UtilMixin()
+        handler.request = SimpleNamespace(connection=mock.Mock(spec=HTTP1Connection))
+        handler._headers = {} if length is None else {'Content-Length': length}
+        stream = streams.FileStreamReader(tempfile.TemporaryFile())
+        stream.file_pointer.write(b'01234')
+
+        assert (handler._zero_copy_range(stream) is not None) is expected
+
+    def test_zero_copy_needs_http1(self):
+        handler = UtilMixin()
+        handler.request = SimpleNamespace(connection=mock.Mock())
+        handler._headers = {'Content-Length': '0'}
+
+        assert handler._zero_copy_range(streams.FileStreamReader(tempfile.TemporaryFile())) is None
+
+
+class ChunkStream:
+
+    def __init__(self, chunks, error=None):
+        self.chunks = list(chunks)
+        self.error = error
+        self.reads = 0
+        self.sizes = []
+
+    async def read(self, size):
+        self.reads += 1
+        self.sizes.append(size)
+        await asyncio.sleep(0)
+        if not self.chunks and self.error is not None:
+            raise self.error
+        return self.chunks.pop(0) if self.chunks else b''
+
+
+class StreamHandler(UtilMixin):
+
+    def __init__(self):
+        self.written = []
+        self.flush = MockCoroutine()
+
+    def write(self, chunk):
+        self.written.append(chunk)
+
+
+class TestWriteStream:
+
+    @pytest.mark.asyncio
+    async def test_write_stream(self):
+        chunks = [bytes([i]) * 10 for i in range(5)]
+        handler = StreamHandler()
+
+        await handler.write_stream(ChunkStream(chunks + [bytearray(b'tail')]))
+
+        assert handler.written == chunks + [b'tail']
+        assert isinstance(handler.written[-1], bytes)
+        assert handler.bytes_downloaded == 54
+        assert handler.flush.called
+
+    @pytest.mark.asyncio
+    async def test_write_stream_flush_size(self):
+        handler = StreamHandler()
+        stream = ChunkStream([b'a' * 10] * 10)
+
+        # a full queue never runs dry, so only the byte threshold flushes
+        with mock.patch.object(utils.settings, 'WRITE_STREAM_FLUSH_SIZE', 30), \
+                mock.patch.object(utils.settings, 'WRITE_STREAM_READ_AHEAD', 20):
+            async def read(size):
+                return stream.chunks.pop(0) if stream.chunks else b''
+            stream.read = read
+            await handler.write_stream(stream)
+
+        assert len(handler.written) == 10
+        assert handler.flush.call_count == 4
+
+    @pytest.mark.asyncio
+    async def test_write_stream_reads_while_flushing(self):
+        stream = ChunkStream([b'a'] * 10)
+        handler = StreamHandler()
+
+        async def flush():
+            while stream.reads < 4:
+                await asyncio.sleep(0)
+
+        handler.flush = flush
+
+        with mock.patch.object(utils.settings, 'WRITE_STREAM_FLUSH_SIZE', 1):
+            await asyncio.wait_for(handler.write_stream(stream), 1)
+
+        assert handler.written == [b'a'] * 10
+
+    @pytest.mark.asyncio
+    async def test_write_stream_adapts_chunk_size(self):
+        stream = ChunkStream([b'a' * 65536] * 6)
+        handler = StreamHandler()
+
+        async def flush():
+            await asyncio.sleep(0.01)
+
+        handler.flush = flush
+
+        # every flush takes far longer than the target, so reads shrink down to the minimum
+        with mock.patch.object(utils.settings, 'CHUNK_TARGET_SECONDS', 0.001), \
+                mock.patch.object(utils.settings, 'WRITE_STREAM_READ_AHEAD', 1):
+            await handler.write_stream(stream)
+
+        assert stream.sizes[0] == utils.settings.CHUNK_SIZE
+        assert stream.sizes[-1] == utils.settings.CHUNK_SIZE_MIN
+        assert stream.sizes == sorted(stream.sizes, reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_write_stream_no_read_ahead(self):
+        stream = ChunkStream([b'a'] * 5)
+        handler = StreamHandler()
+
+        # still reads one chunk ahead, rather than dividing by zero or reading without a limit
+        with mock.patch.object(utils.settings, 'WRITE_STREAM_READ_AHEAD', 0):
+            await handler.write_stream(stream)
+
+        assert handler.written == [b'a'] * 5
+
+    @pytest.mark.asyncio
+    async def test_write_stream_read_error(self):
+        handler = StreamHandler()
+
+        with pytest.raises(ValueError):
+            await handler.write_stream(ChunkStream([b'a', b'b'], error=ValueError('upstream')))
+
+        assert handler.written == [b'a', b'b']
+
+    @pytest.mark.asyncio
+    async def test_write_stream_client_gone(self):
+        stream = ChunkStream([b'a'] * 100)
+        handler = StreamHandler()
+        handler.flush = MockCoroutine(side_effect=tornado.iostream.StreamClosedError())
+
+        with mock.patch.object(utils.settings, 'WRITE_STREAM_READ_AHEAD', 2):
+            await handler.write_stream(stream)
+            await asyncio.sleep(0.01)
+
+        assert len(handler.written) == 1
+        assert stream.reads < 10
+
+    @pytest.mark.asyncio
+    async def test_write_stream_closes_stream(self):
+        stream = ChunkStream([b'a'] * 100)
+        stream.close = mock.Mock()
+        handler = StreamHandler()
+        handler.flush = MockCoroutine(side_effect=tornado.iostream.StreamClosedError())
+
+        await handler.write_stream(stream)
+
+        stream.close.assert_called_once_with()
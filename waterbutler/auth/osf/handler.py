@@ -1,14 +1,22 @@
+import copy
+import json
+import asyncio
+import hashlib
 import inspect  # noqa
 import logging
 import datetime
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
 import jwe
 import jwt
-import aiohttp
 from aiohttp.client_exceptions import ClientError, ContentTypeError
 
 from waterbutler.core import exceptions
 from waterbutler.auth.osf import settings
+from waterbutler.core.cache import TTLCache
+from waterbutler.core.sessions import session_pool
+from waterbutler.core.singleflight import SingleFlight
 from waterbutler.utils import inspect_info  # noqa
 from waterbutler.core.auth import AuthType, BaseAuthHandler
 from waterbutler.settings import MFR_IDENTIFYING_HEADER
@@ -17,9 +25,26 @@ from waterbutler.settings import MFR_IDENTIFYING_HEADER
 JWE_KEY = jwe.kdf(settings.JWE_SECRET.encode(), settings.JWE_SALT.encode())
 EXPORT_DATA_FAKE_NODE_ID = 'export_location'
 
+auth_flight = SingleFlight('osf_auth')
+# Recent answers of the OSF, see `OsfAuthHandler.cache_key`
+auth_cache = TTLCache(maxsize=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL)
+
+# JWE and JWT work on large payloads is done here rather than on the event loop
+crypto_executor = ThreadPoolExecutor(max_workers=settings.CRYPTO_WORKERS,
+                                     thread_name_prefix='osf-auth-crypto')
+
 logger = logging.getLogger(__name__)
 
 
+async def run_crypto(size, func, *args, **kwargs):
+    """Call ``func``, on ``crypto_executor`` if ``size`` (in bytes) is at least
+    ``CRYPTO_OFFLOAD_SIZE``.  Small payloads are cheaper to handle inline than to hand off."""
+    if size < settings.CRYPTO_OFFLOAD_SIZE:
+        return func(*args, **kwargs)
+    return (await asyncio.get_event_loop().run_in_executor(
+        crypto_executor, functools.partial(func, *args, **kwargs)))
+
+
 class OsfAuthHandler(BaseAuthHandler):
     """Identity lookup via the Open Science Framework"""
     ACTION_MAP = {
@@ -29,6 +54,20 @@ class OsfAuthHandler(BaseAuthHandler):
         'delete': 'delete',
     }
 
+    def __init__(self):
+        self.cache = auth_cache
+
+    @staticmethod
+    def cache_key(resource, provider, osf_action, path, version, headers, cookie, cookies,
+                  view_only, location_id):
+        """Key for ``cache``.  The OSF checks permissions and counts downloads per file and
+        version, so answers are only reused for the same ones.  Everything identifying the user is
+        hashed so that credentials are not kept in memory longer than the request that carried
+        them."""
+        identity = json.dumps([headers, cookie, cookies, view_only], sort_keys=True)
+        return (resource, provider, osf_action, path, version,
+                hashlib.sha256(identity.encode()).hexdigest(), location_id)
+
     def build_payload(self, bundle, view_only=None, cookie=None):
         query_params = {}
 
@@ -49,16 +88,29 @@ class OsfAuthHandler(BaseAuthHandler):
 
         return query_params
 
+    async def build_payload_async(self, bundle, view_only=None, cookie=None):
+        """:meth:`build_payload`, run on ``crypto_executor`` if the payload is large."""
+        size = len(json.dumps(bundle, default=str)) + len(cookie or '')
+        return (await run_crypto(size, self.build_payload, bundle,
+                                 view_only=view_only, cookie=cookie))
+
+    @staticmethod
+    def decode_payload(payload):
+        signed_jwt = jwe.decrypt(payload.encode(), JWE_KEY)
+        return jwt.decode(signed_jwt, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM,
+                          options={'require_exp': True})
+
     async def make_request(self, params, headers, cookies):
         try:
             # Note: with simple request whose response is handled right afterwards without "being passed
-            #       further along", use the context manager so WB doesn't need to handle the sessions.
-            async with aiohttp.request(
-                'get',
+            #       further along", use the context manager so the connection goes back to the pool.
+            session = session_pool.get(settings.API_URL)
+            async with session.get(
                 settings.API_URL,
                 params=params,
                 headers=headers,
                 cookies=cookies,
+                trace_request_ctx={'provider': 'osf_auth'},
             ) as response:
                 if response.status != 200:
                     try:
@@ -69,10 +121,8 @@ class OsfAuthHandler(BaseAuthHandler):
 
                 try:
                     raw = await response.json()
-                    signed_jwt = jwe.decrypt(raw['payload'].encode(), JWE_KEY)
-                    data = jwt.decode(signed_jwt, settings.JWT_SECRET,
-                                      algorithm=settings.JWT_ALGORITHM,
-                                      options={'require_exp': True})
+                    payload = raw['payload']
+                    data = await run_crypto(len(payload), self.decode_payload, payload)
                     return data['data']
                 except (jwt.InvalidTokenError, KeyError):
                     raise exceptions.AuthError(data, code=response.status)
@@ -95,7 +145,7 @@ class OsfAuthHandler(BaseAuthHandler):
             view_only = view_only[0].decode()
 
         payload = (await self.make_request(
-            self.build_payload(bundle, cookie=cookie, view_only=view_only),
+            (await self.build_payload_async(bundle, cookie=cookie, view_only=view_only)),
             headers,
             dict(request.cookies)
         ))
@@ -154,6 +204,18 @@ class OsfAuthHandler(BaseAuthHandler):
             # View only must go outside of the jwt
             view_only = view_only[0].decode()
 
+        # Identical lookups are answered from the cache or, if one is already on its way to the
+        # OSF, by waiting for that one instead of sending another.
+        cache_key = None
+        if osf_action not in settings.AUTH_CACHE_BYPASS_ACTIONS:
+            cookies = {name: getattr(morsel, 'value', morsel)
+                       for name, morsel in request.cookies.items()}
+            cache_key = self.cache_key(resource, provider, osf_action, path, version, headers,
+                                       cookie, cookies, view_only, location_id)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return self._finalize(copy.deepcopy(cached), callback_log)
+
         data = {
             'nid': resource,
             'provider': provider,
@@ -171,11 +233,28 @@ class OsfAuthHandler(BaseAuthHandler):
         if resource == EXPORT_DATA_FAKE_NODE_ID:
             data['location_id'] = location_id
 
+        if cache_key is None:
+            payload = await self.make_request(
+                (await self.build_payload_async(data, cookie=cookie, view_only=view_only)),
+                headers,
+                dict(request.cookies)
+            )
+        else:
+            payload = await auth_flight.do(cache_key, self._fetch_and_cache, cache_key, data,
+                                           cookie, view_only, headers, dict(request.cookies))
+
+        return self._finalize(payload, callback_log)
+
+    async def _fetch_and_cache(self, cache_key, data, cookie, view_only, headers, cookies):
         payload = await self.make_request(
-            self.build_payload(data, cookie=cookie, view_only=view_only),
+            (await self.build_payload_async(data, cookie=cookie, view_only=view_only)),
             headers,
-            dict(request.cookies)
+            cookies
         )
+        self.cache.set(cache_key, payload)
+        return payload
 
+    @staticmethod
+    def _finalize(payload, callback_log):
         payload['auth']['callback_url'] = payload['callback_url'] if callback_log else ''
         return payload
@@ -21,3 +21,16 @@ JWE_SECRET = (JWE_SECRET or 'CirclesAre4Squares')
 JWT_SECRET = (JWT_SECRET or 'ILiekTrianglesALot')
 
 MFR_ACTION_HEADER = config.get('MFR_ACTION_HEADER', 'X-Cos-Mfr-Request-Action')
+
+# Payloads of at least CRYPTO_OFFLOAD_SIZE bytes are encrypted / decrypted on a thread pool of
+# CRYPTO_WORKERS threads instead of on the event loop.
+CRYPTO_OFFLOAD_SIZE = int(config.get('CRYPTO_OFFLOAD_SIZE', 32 * 1024))  # bytes
+CRYPTO_WORKERS = int(config.get('CRYPTO_WORKERS', 4))
+
+# Successful auth lookups are cached for a few seconds, so bursts of requests for the same resource
+# by the same user (MFR renders, folder browsing, ranged video playback) only ask the OSF once.
+# A ttl of 0 disables the cache.  Actions listed in AUTH_CACHE_BYPASS_ACTIONS are never cached or
+# coalesced with concurrent identical lookups.
+AUTH_CACHE_TTL = float(config.get('AUTH_CACHE_TTL', 10))  # seconds
+AUTH_CACHE_MAX_SIZE = int(config.get('AUTH_CACHE_MAX_SIZE', 1024))
+AUTH_CACHE_BYPASS_ACTIONS = set(config.get_object('AUTH_CACHE_BYPASS_ACTIONS', ['upload', 'delete']))
@@ -0,0 +1,251 @@
+import copy
+import time
+import typing
+import collections
+
+from waterbutler import settings as wb_settings
+
+
+class TTLCache:
+    """A small LRU cache whose entries expire ``ttl`` seconds after they were stored.  Holds at
+    most ``maxsize`` entries; storing one more evicts the least recently used.
+
+    Not thread safe, it is meant to be used from the event loop.  Callers that hand out mutable
+    values should copy them on the way in and out.
+
+    :param int maxsize: max number of entries, 0 disables the cache
+    :param float ttl: seconds an entry stays valid, 0 disables the cache
+    """
+
+    def __init__(self, maxsize: int=1024, ttl: float=10) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = collections.OrderedDict()  # type: collections.OrderedDict
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """Return the unexpired value for ``key`` or ``default``."""
+        entry = self._data.get(key)
+        if entry is not None:
+            expires, value = entry
+            if expires > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            self._evict(key)
+        self.misses += 1
+        return default
+
+    def set(self, key, value, ttl: typing.Optional[float]=None) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds, the cache's own ttl by default."""
+        if not self.enabled:
+            return
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._evict(next(iter(self._data)))
+
+    def pop(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        self._evict(key)
+        return entry[1]
+
+    def invalidate(self, predicate: typing.Callable[[typing.Any], bool]) -> int:
+        """Drop every entry whose key matches ``predicate``.
+
+        :rtype: int
+        :return: number of entries dropped
+        """
+        keys = [key for key in self._data if predicate(key)]
+        for key in keys:
+            self._evict(key)
+        return len(keys)
+
+    def _evict(self, key) -> None:
+        del self._data[key]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        return {'size': len(self._data), 'hits': self.hits, 'misses': self.misses}
+
+
+class PathIdCache(TTLCache):
+    """Remembers the ids that ID-based providers (Google Drive, RushFiles ...) resolve WB paths to,
+    one path segment at a time: ``(provider, credentials, parent id, name, kind) -> child``.  Only
+    children that were found are cached, a missing name is always looked up again.
+
+    Entries are scoped by provider name and credentials, so one user never sees ids resolved
+    with another user's credentials.  :meth:`forget` must be called by providers whenever WB
+    moves, renames or deletes an entry.  Changes made outside of WB are picked up once the
+    entries expire.
+    """
+
+    @staticmethod
+    def _key(provider, parent_id, name: str, kind: typing.Optional[str]) -> tuple:
+        return (provider.NAME, provider.credentials_hash, parent_id, name, kind)
+
+    def lookup(self, provider, parent_id, name: str, kind: typing.Optional[str]=None):
+        """Return what was stored for the child ``name`` of ``parent_id`` or None."""
+        entry = self.get(self._key(provider, parent_id, name, kind))
+        return None if entry is None else copy.deepcopy(entry[1])
+
+    def store(self, provider, parent_id, name: str, kind: typing.Optional[str],
+              item_id, value) -> None:
+        """Remember ``value`` (the child's id, or a dict describing it) for the child ``name`` of
+        ``parent_id``.  ``item_id`` is the child's own id, which :meth:`forget` matches on."""
+        self.set(self._key(provider, parent_id, name, kind), (item_id, copy.deepcopy(value)))
+
+    def forget(self, provider, item_id) -> int:
+        """Drop the entries for ``item_id`` and for its children, for every user of ``provider``.
+
+        :rtype: int
+        :return: number of entries dropped
+        """
+        keys = [
+            key for key, (_, (child_id, _)) in self._data.items()
+            if key[0] == provider.NAME and item_id in (key[2], child_id)
+        ]
+        for key in keys:
+            self._evict(key)
+        return len(keys)
+
+
+class MetadataCache(TTLCache):
+    """Serves repeated folder listings from memory.  Entries are scoped by provider name and
+    credentials: a write made through WB with those credentials calls :meth:`invalidate` and drops
+    every listing of the scope.
+
+    A listing is served as is for ``ttl`` seconds.  Providers whose ``folder_validator`` can tell
+    that a folder changed without listing it keep it until ``max_age``, checking the validator
+    first.  Changes made outside of WB, or by celery tasks running in another process, are picked
+    up once the listing is revalidated or expires.
+
+    Listings are kept as lists of encoded chunks.  Besides their number, the cache bounds the bytes
+    they add up to: the least recently used listings are evicted to stay under ``max_bytes``, and
+    a listing bigger than that on its own is not kept at all.
+
+    :param int maxsize: max number of listings, 0 disables the cache
+    :param float ttl: seconds a listing is served without asking the provider, 0 disables the cache
+    :param float max_age: seconds a listing with a validator is kept
+    :param int max_bytes: max bytes of listings kept, 0 for no limit
+    """
+
+    def __init__(self, maxsize: int=1000, ttl: float=10, max_age: float=300,
+                 max_bytes: int=0) -> None:
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.max_age = max(max_age, ttl)
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        # scope -> value of self._counter when it was last invalidated
+        self._generations = collections.OrderedDict()  # type: collections.OrderedDict
+        self._counter = 0
+
+        self.revalidated = 0
+
+    @staticmethod
+    def _sizeof(entry) -> int:
+        listing = entry[2]
+        if not isinstance(listing, (list, tuple)):
+            return 0
+        return sum(len(chunk) for chunk in listing if isinstance(chunk, (bytes, bytearray)))
+
+    def set(self, key, value, ttl: typing.Optional[float]=None) -> None:
+        self.pop(key)
+        size = self._sizeof(value)
+        if not self.enabled or (self.max_bytes and size > self.max_bytes):
+            return
+        super().set(key, value, ttl=ttl)
+        self.bytes += size
+        while self.max_bytes and self.bytes > self.max_bytes:
+            self._evict(next(iter(self._data)))
+
+    def _evict(self, key) -> None:
+        self.bytes -= self._sizeof(self._data[key][1])
+        super()._evict(key)
+
+    def clear(self) -> None:
+        super().clear()
+        self.bytes = 0
+
+    @staticmethod
+    def scope(provider) -> tuple:
+        return (provider.NAME, provider.credentials_hash)
+
+    def generation(self, provider) -> int:
+        return self._generations.get(self.scope(provider), 0)
+
+    async def listing(self, provider, path, key: tuple,
+                      func: typing.Callable[..., typing.Awaitable], *args, **kwargs):
+        """Return the cached listing of the folder ``path`` stored under ``key`` or the result of
+        ``await func(*args, **kwargs)``, storing it unless it is None or the scope was invalidated
+        meanwhile.  Cached values are shared, callers must not mutate them."""
+        if not self.enabled:
+            return await func(*args, **kwargs)
+
+        key = self.scope(provider) + key
+        entry = self.get(key)
+        if entry is not None:
+            stored_at, validator, value = entry
+            if time.monotonic() - stored_at < self.ttl:
+                return value
+            if validator == await provider.folder_validator(path):
+                self.revalidated += 1
+                return value
+            self.pop(key)
+
+        generation = self.generation(provider)
+        # Fetched before the listing: if the folder changes in between the stale validator makes
+        # the next revalidation fail, rather than a stale listing passing it.
+        validator = await provider.folder_validator(path)
+        value = await func(*args, **kwargs)
+
+        if value is not None and self.generation(provider) == generation:
+            self.set(key, (time.monotonic(), validator, value),
+                     ttl=self.ttl if validator is None else self.max_age)
+        return value
+
+    def invalidate_scope(self, provider) -> int:
+        """Drop every listing made with ``provider``'s credentials, and make sure listings fetched
+        before now but stored after are not kept.
+
+        :rtype: int
+        :return: number of entries dropped
+        """
+        scope = self.scope(provider)
+        self._counter += 1
+        self._generations[scope] = self._counter
+        self._generations.move_to_end(scope)
+        while len(self._generations) > max(self.maxsize, 1):
+            self._generations.popitem(last=False)
+        return self.invalidate(lambda key: key[:2] == scope)
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats['revalidated'] = self.revalidated
+        stats['bytes'] = self.bytes
+        return stats
+
+
+path_id_cache = PathIdCache(
+    maxsize=wb_settings.PATH_ID_CACHE_MAX_SIZE,
+    ttl=wb_settings.PATH_ID_CACHE_TTL,
+)
+metadata_cache = MetadataCache(
+    maxsize=wb_settings.METADATA_CACHE_MAX_SIZE,
+    ttl=wb_settings.METADATA_CACHE_TTL,
+    max_age=wb_settings.METADATA_CACHE_MAX_AGE,
+    max_bytes=wb_settings.METADATA_CACHE_MAX_BYTES,
+)
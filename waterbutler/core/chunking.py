@@ -0,0 +1,82 @@
+import time
+
+from waterbutler.server import settings
+from waterbutler.core.metrics import HistogramFamily, metrics_registry
+
+chunk_sizes = metrics_registry.register(HistogramFamily(
+    'waterbutler_chunk_size_bytes',
+    'Chunk sizes picked for streaming transfers, observed per chunk, by direction',
+    ('direction', ),
+    buckets=tuple(2 ** n for n in range(12, 24)),  # 4KB to 8MB
+))
+
+
+class AdaptiveChunkSize:
+    """Picks the chunk size for one streaming transfer.  After each chunk or flush, :meth:`record`
+    works out how long a chunk of the current size takes at the rate just seen.  The size is
+    doubled if that's well under ``CHUNK_TARGET_SECONDS``, where per-chunk overhead dominates, and
+    halved if it's well over it, where big chunks only add latency and memory.  The size is also
+    halved while the transfer's buffer is mostly full, and not grown unless it's mostly empty.
+
+    Sizes stay powers of two times ``CHUNK_SIZE``, between ``CHUNK_SIZE_MIN`` and
+    ``CHUNK_SIZE_MAX``.  With ``ADAPTIVE_CHUNK_SIZE`` off, the size is always ``CHUNK_SIZE``.
+
+    :param str direction: ``'download'`` or ``'upload'``, the label sizes are reported under
+    """
+
+    def __init__(self, direction: str, minimum: int=None, maximum: int=None,
+                 target: float=None) -> None:
+        self.direction = direction
+        if settings.ADAPTIVE_CHUNK_SIZE:
+            self.minimum = minimum or settings.CHUNK_SIZE_MIN
+            self.maximum = max(maximum or settings.CHUNK_SIZE_MAX, self.minimum)
+        else:
+            self.minimum = self.maximum = settings.CHUNK_SIZE
+        self.target = target or settings.CHUNK_TARGET_SECONDS
+        self.size = min(max(settings.CHUNK_SIZE, self.minimum), self.maximum)
+        self._lap_bytes = 0
+        self._lap_start = None  # type: float
+
+    def record(self, nbytes: int, seconds: float, backlog: float=0.0) -> int:
+        """Adjust the size after ``nbytes`` took ``seconds`` to go out.
+
+        :param int nbytes: bytes transferred
+        :param float seconds: time they took
+        :param float backlog: how full the transfer's buffer is, from 0 to 1
+        :rtype: int
+        :return: the new size
+        """
+        chunk_sizes.observe(self.size, self.direction)
+        if nbytes <= 0:
+            return self.size
+
+        per_chunk = seconds * self.size / nbytes
+        if backlog >= .75 or per_chunk > self.target * 2:
+            self.size = max(self.size // 2, self.minimum)
+        elif backlog <= .25 and per_chunk < self.target / 2:
+            self.size = min(self.size * 2, self.maximum)
+        return self.size
+
+    def start_lap(self, nbytes: int) -> None:
+        """Mark ``nbytes`` as handed off to be sent, now."""
+        self._lap_bytes, self._lap_start = nbytes, time.monotonic()
+
+    def end_lap(self) -> None:
+        """Record the bytes handed off at :meth:`start_lap` as sent, in the time since.  For
+        transfers that are pulled a chunk at a time, where asking for the next chunk means the
+        last one is out."""
+        if self._lap_start is not None:
+            self.record(self._lap_bytes, time.monotonic() - self._lap_start)
+            self._lap_start = None
+
+
+async def read_chunk(stream) -> bytes:
+    """Read the next chunk of ``stream`` for async iteration, which is how aiohttp pulls the
+    body of an upload.  The chunk is sized by an :class:`AdaptiveChunkSize` kept on the stream."""
+    chunking = getattr(stream, '_chunking', None)
+    if chunking is None:
+        chunking = stream._chunking = AdaptiveChunkSize('upload')
+    chunking.end_lap()
+    chunk = await stream.read(chunking.size)
+    chunking.start_lap(len(chunk))
+    return chunk
@@ -0,0 +1,152 @@
+import time
+import typing
+import logging
+
+from waterbutler import settings as wb_settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Tracks the health of one upstream host.
+
+    * **closed**: requests flow normally.  Consecutive failures are counted and once there are
+      ``failure_threshold`` of them the breaker opens.
+    * **open**: requests are refused without touching the network until ``recovery_timeout``
+      seconds have passed, then the breaker goes half-open.
+    * **half-open**: a single trial request is let through.  If it succeeds the breaker closes,
+      if it fails the breaker opens again.  If the trial never reports back (e.g. it was
+      cancelled), another trial is allowed after ``recovery_timeout`` seconds.
+
+    The breaker holds no asyncio primitives, so one instance can be shared by every event loop.
+
+    :param int failure_threshold: consecutive failures before opening
+    :param float recovery_timeout: seconds to stay open before allowing a trial request
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold: int=5, recovery_timeout: float=30) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None  # type: typing.Optional[float]
+        self.trial_at = None  # type: typing.Optional[float]
+        self.rejected = 0
+
+    def allow_request(self) -> bool:
+        """Whether a request may be sent now.  May move an open breaker to half-open."""
+        if self.state == self.CLOSED:
+            return True
+
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            if now - self.opened_at < self.recovery_timeout:
+                self.rejected += 1
+                return False
+            self.state = self.HALF_OPEN
+        elif now - self.trial_at < self.recovery_timeout:
+            self.rejected += 1
+            return False
+
+        self.trial_at = now
+        return True
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = self.trial_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'rejected': self.rejected,
+        }
+
+
+class CircuitBreakerRegistry:
+    """Process-wide :class:`CircuitBreaker` objects keyed by upstream host.  Only hosts that have
+    failed recently are tracked: a breaker is dropped as soon as its host answers successfully, so
+    the registry stays as small as the set of currently unhealthy upstreams.
+
+    A ``failure_threshold`` of zero disables circuit breaking.
+
+    :param int failure_threshold: see :class:`CircuitBreaker`
+    :param float recovery_timeout: see :class:`CircuitBreaker`
+    """
+
+    def __init__(self, failure_threshold: int=5, recovery_timeout: float=30) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._breakers = {}  # type: typing.Dict[str, CircuitBreaker]
+
+    @property
+    def enabled(self) -> bool:
+        return self.failure_threshold > 0
+
+    @staticmethod
+    def is_failure(status: int) -> bool:
+        """Whether a response status means the upstream itself is unhealthy.  4xx are the
+        caller's problem and 501 is a deliberate "not supported", neither count."""
+        return status >= 500 and status != 501
+
+    def allow_request(self, host: str) -> bool:
+        breaker = self._breakers.get(host)
+        return breaker is None or breaker.allow_request()
+
+    def record_success(self, host: str) -> None:
+        breaker = self._breakers.pop(host, None)
+        if breaker is not None and breaker.state != CircuitBreaker.CLOSED:
+            logger.info('Circuit for {} closed'.format(host))
+
+    def record_failure(self, host: str) -> None:
+        if not self.enabled:
+            return
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(self.failure_threshold,
+                                                            self.recovery_timeout)
+        was_open = breaker.state == CircuitBreaker.OPEN
+        breaker.record_failure()
+        if not was_open and breaker.state == CircuitBreaker.OPEN:
+            logger.warning('Circuit for {} opened after {} consecutive '
+                           'failures'.format(host, breaker.failures))
+
+    def record(self, host: str, status: int) -> None:
+        """Record the outcome of a request that got a response with ``status``."""
+        if self.is_failure(status):
+            self.record_failure(host)
+        else:
+            self.record_success(host)
+
+    def stats(self) -> typing.Dict[str, dict]:
+        """State of every tracked host, shown by the status endpoint to internal callers only."""
+        return {host: breaker.stats() for host, breaker in self._breakers.items()}
+
+    def summary(self) -> typing.Dict[str, int]:
+        """How many tracked hosts are in each state, without naming them."""
+        summary = dict.fromkeys((CircuitBreaker.CLOSED, CircuitBreaker.OPEN,
+                                 CircuitBreaker.HALF_OPEN), 0)
+        for breaker in self._breakers.values():
+            summary[breaker.state] += 1
+        summary['rejected'] = sum(breaker.rejected for breaker in self._breakers.values())
+        return summary
+
+    def clear(self) -> None:
+        self._breakers.clear()
+
+
+circuit_breakers = CircuitBreakerRegistry(
+    failure_threshold=wb_settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    recovery_timeout=wb_settings.CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
+)
@@ -258,6 +258,14 @@ class UnexportableFileTypeError(DownloadError):
         super().__init__(message, code=HTTPStatus.BAD_REQUEST, is_user_error=is_user_error)
 
 
+class UpstreamUnavailableError(ProviderError):
+    """The circuit breaker for an upstream host is open: it has failed repeatedly and requests
+    to it are refused until it has had time to recover."""
+    def __init__(self, host, code=HTTPStatus.SERVICE_UNAVAILABLE):
+        super().__init__('Upstream host "{}" is temporarily unavailable, please try again '
+                         'later'.format(host), code=code)
+
+
 class InvalidProviderConfigError(ProviderError):
     """Error for provider init failure due to invalid (include missing) settings and credentials"""
     def __init__(self, provider_name, message=None):
@@ -1,6 +1,8 @@
 import abc
 import typing
 import hashlib
+import functools
+from urllib import parse
 
 import furl
 
@@ -8,6 +10,17 @@ from waterbutler.core import utils
 from waterbutler.server import settings
 
 
+@functools.lru_cache(maxsize=8)
+def _entity_url_prefix(domain: str) -> typing.Optional[str]:
+    """The part of every entity url that only depends on ``domain``, or None if appending to it
+    wouldn't give what furl would (a query string, a fragment or percent-encoded segments)."""
+    url = furl.furl(domain)
+    url.path.segments.extend(['v1', 'resources'])
+    if str(url.query) or str(url.fragment) or '%' in str(url.path):
+        return None
+    return url.url
+
+
 class BaseMetadata(metaclass=abc.ABCMeta):
     """The BaseMetadata object provides the base structure for all metadata returned via
     WaterButler.  It also implements the API serialization methods to turn metadata objects
@@ -46,9 +59,18 @@ class BaseMetadata(metaclass=abc.ABCMeta):
             'path': self.path,
             'provider': self.provider,
             'materialized': self.materialized_path,
-            'etag': hashlib.sha256('{}::{}'.format(self.provider, self.etag).encode('utf-8')).hexdigest(),
+            'etag': self._etag_digest(),
         }
 
+    def _etag_digest(self) -> str:
+        # Remembered for as long as the provider's etag doesn't change, serialized() is called more
+        # than once per object when building responses and callbacks.
+        source = '{}::{}'.format(self.provider, self.etag)
+        memo = getattr(self, '_etag_memo', None)
+        if memo is None or memo[0] != source:
+            memo = self._etag_memo = (source, hashlib.sha256(source.encode('utf-8')).hexdigest())
+        return memo[1]
+
     def json_api_serialized(self, resource: str) -> dict:
         """Returns a dict of primitives suitable for serializing into a JSON-API -compliant
         response.  Sets the `id` and `type` attributes required by JSON-API, and stores the
@@ -87,15 +109,23 @@ class BaseMetadata(metaclass=abc.ABCMeta):
 
     def _entity_url(self, resource: str) -> str:
         """ Utility method for constructing the base url for actions. """
-        url = furl.furl(settings.DOMAIN)
-        segments = ['v1', 'resources', resource, 'providers', self.provider]
         # If self is a folder, path ends with a slash which must be preserved. However, furl
         # percent-encodes the trailing slash. Instead, turn folders into a list of (path_id, ''),
         # and let furl add the slash for us.  The [1:] is because path always begins with a slash,
         # meaning the first entry is always ''.
-        segments += self.path.split('/')[1:]
-        url.path.segments.extend(segments)
+        segments = [resource, 'providers', self.provider] + self.path.split('/')[1:]
+
+        # Building a furl for every entity of a listing is slow, quote the segments the way furl
+        # does and append them to a prefix built once.  furl quotes nothing at all if any segment
+        # contains a '%', leave those to furl itself.
+        prefix = _entity_url_prefix(settings.DOMAIN)
+        if prefix is not None and '%' not in ''.join(segments):
+            return prefix + '/' + '/'.join(
+                parse.quote(segment, furl.Path.SAFE_SEGMENT_CHARS) for segment in segments
+            )
 
+        url = furl.furl(settings.DOMAIN)
+        url.path.segments.extend(['v1', 'resources'] + segments)
         return url.url
 
     def build_path(self, path) -> str:
@@ -1,4 +1,6 @@
 import copy
+import bisect
+import itertools
 
 
 def _merge_dicts(a, b, path=None):
@@ -189,3 +191,196 @@ class MetricsSubRecord(MetricsRecord):
         subrecord = MetricsSubRecord(self.name, name)
         self.subrecords.append(subrecord)
         return subrecord
+
+
+DEFAULT_LATENCY_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    )
+    return '{' + ','.join('{}="{}"'.format(name, value) for name, value in escaped) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class CounterFamily():
+    """A set of monotonically increasing counters sharing a name, one per combination of label
+    values.  ex::
+
+        enqueued = CounterFamily('tasks_enqueued_total', 'Tasks sent to celery', ('task', ))
+        enqueued.inc('copy')
+
+    If ``callback`` is given it is called at collection time and must return a dict of
+    ``{label values: value}``, which is reported instead of any values that were recorded.  This
+    is how totals kept elsewhere (e.g. by the rate limiter) are exposed.
+
+    :param str name: metric name
+    :param str documentation: one line description of the metric
+    :param tuple label_names: names of the labels, in the order values are given
+    :param callable callback: optional function returning the current values
+    """
+
+    type = 'counter'
+
+    def __init__(self, name, documentation, label_names=(), callback=None):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.callback = callback
+        self._values = {}
+
+    def _check(self, values):
+        if len(values) != len(self.label_names):
+            raise ValueError('Expected {} label values, got {}'.format(len(self.label_names),
+                                                                       len(values)))
+
+    def inc(self, *values, amount=1):
+        self._check(values)
+        self._values[values] = self._values.get(values, 0) + amount
+
+    def get(self, *values):
+        return self._values.get(values, 0)
+
+    def collect(self):
+        """List of ``(label values, value)`` for every child."""
+        if self.callback is not None:
+            return list(self.callback().items())
+        return list(self._values.items())
+
+    def samples(self):
+        """Yield ``(sample name, formatted labels, value)`` for the text exposition format."""
+        for values, value in self.collect():
+            yield self.name, _format_labels(self.label_names, values), value
+
+    def clear(self):
+        self._values.clear()
+
+
+class GaugeFamily(CounterFamily):
+    """Like :class:`CounterFamily`, but the values may go down."""
+
+    type = 'gauge'
+
+    def set(self, value, *values):
+        self._check(values)
+        self._values[values] = value
+
+    def dec(self, *values, amount=1):
+        self.inc(*values, amount=-amount)
+
+
+class Histogram():
+    """Counts observed values into fixed buckets, Prometheus-style.  Unlike the records above,
+    histograms are meant to be long-lived and aggregate across many requests.
+
+    :param tuple buckets: upper bounds of the buckets, an implicit ``+Inf`` bucket is appended
+    """
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """List of ``(upper bound, count of values <= upper bound)``, ending with ``+Inf``."""
+        bounds = self.buckets + (float('inf'),)
+        return list(zip(bounds, itertools.accumulate(self.counts)))
+
+
+class HistogramFamily():
+    """A set of :class:`Histogram` objects sharing a name and buckets, one per combination of
+    label values.  ex::
+
+        latency = HistogramFamily('upstream_seconds', 'Upstream latency', ('provider', 'phase'))
+        latency.observe(0.2, 'box', 'ttfb')
+
+    :param str name: metric name
+    :param str documentation: one line description of the metric
+    :param tuple label_names: names of the labels, in the order values are given
+    :param tuple buckets: see :class:`Histogram`
+    """
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, label_names, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = buckets
+        self._children = {}
+
+    def labels(self, *values):
+        """Return the histogram for the given label values, creating it if necessary."""
+        if len(values) != len(self.label_names):
+            raise ValueError('Expected {} label values, got {}'.format(len(self.label_names),
+                                                                       len(values)))
+        histogram = self._children.get(values)
+        if histogram is None:
+            histogram = self._children[values] = Histogram(self.buckets)
+        return histogram
+
+    def observe(self, value, *values):
+        self.labels(*values).observe(value)
+
+    def collect(self):
+        """List of ``(label values, histogram)`` for every child."""
+        return list(self._children.items())
+
+    def samples(self):
+        """Yield ``(sample name, formatted labels, value)`` for the text exposition format."""
+        for values, histogram in self.collect():
+            for bound, count in histogram.cumulative():
+                labels = _format_labels(self.label_names, values, [('le', _format_value(bound))])
+                yield self.name + '_bucket', labels, count
+            labels = _format_labels(self.label_names, values)
+            yield self.name + '_sum', labels, histogram.sum
+            yield self.name + '_count', labels, histogram.count
+
+    def clear(self):
+        self._children.clear()
+
+
+class MetricsRegistry():
+    """The process-wide collection of metric families exposed by the ``/metrics`` endpoint."""
+
+    def __init__(self):
+        self._families = {}
+
+    def register(self, family):
+        """Register ``family`` and return it.  Registering a second family under the same name
+        replaces the first."""
+        self._families[family.name] = family
+        return family
+
+    def get(self, name):
+        return self._families.get(name)
+
+    def expose(self):
+        """Render every registered family in the Prometheus text exposition format."""
+        lines = []
+        for name in sorted(self._families):
+            family = self._families[name]
+            lines.append('# HELP {} {}'.format(name, family.documentation))
+            lines.append('# TYPE {} {}'.format(name, family.type))
+            for sample, labels, value in family.samples():
+                lines.append('{}{} {}'.format(sample, labels, _format_value(value)))
+        return '\n'.join(lines) + '\n'
+
+
+metrics_registry = MetricsRegistry()
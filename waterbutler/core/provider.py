@@ -1,7 +1,9 @@
 import abc
+import json
 import time
 import typing
 import asyncio
+import hashlib
 import logging
 import weakref
 import functools
@@ -17,40 +19,31 @@ from waterbutler.core import streams
 from waterbutler.core import exceptions
 from waterbutler.core import path as wb_path
 from waterbutler import settings as wb_settings
+from waterbutler.core.retry import default_policy
 from waterbutler.core.metrics import MetricsRecord
+from waterbutler.core.ratelimit import rate_limiter
 from waterbutler.core import metadata as wb_metadata
 from waterbutler.core.utils import ZipStreamGenerator
 from waterbutler.core.utils import RequestHandlerContext
+from waterbutler.core.sessions import session_pool, close_session
+from waterbutler.core.circuitbreaker import circuit_breakers
 
 
 logger = logging.getLogger(__name__)
-_THROTTLES = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary
 NO_URL_ENCODED_PROVIDERS = ['nextcloud', 'owncloud', 'nextcloudinstitutions']
 
 
 def throttle(concurrency=10, interval=1):
+    """Rate-limit a provider coroutine that talks to the upstream without going through
+    :meth:`BaseProvider.make_request`.  Each call takes a token from the provider's bucket (see
+    :meth:`BaseProvider.throttle_request`).  ``concurrency`` calls per ``interval`` seconds is
+    only used as the rate if the provider does not configure its own ``RATE_LIMIT``.
+    """
     def _throttle(func):
         @functools.wraps(func)
-        async def wrapped(*args, **kwargs):
-            if asyncio.get_event_loop() not in _THROTTLES:
-                count, last_call, event = 0, time.time(), asyncio.Event()
-                _THROTTLES[asyncio.get_event_loop()] = (count, last_call, event)
-                event.set()
-            else:
-                count, last_call, event = _THROTTLES[asyncio.get_event_loop()]
-
-            await event.wait()
-            count += 1
-            if count > concurrency:
-                count = 0
-                if (time.time() - last_call) < interval:
-                    event.clear()
-                    await asyncio.sleep(interval - (time.time() - last_call))
-                    event.set()
-
-            last_call = time.time()
-            _THROTTLES[asyncio.get_event_loop()] = (count, last_call, event)
-            return await func(*args, **kwargs)
+        async def wrapped(self, *args, **kwargs):
+            await self.throttle_request(default=(concurrency / interval, concurrency))
+            return await func(self, *args, **kwargs)
         return wrapped
     return _throttle
 
@@ -87,6 +80,13 @@ class BaseProvider(metaclass=abc.ABCMeta):
 
     BASE_URL = None
 
+    # ``(rate, burst)``: upstream requests per second and the max burst, paced per upstream host
+    # and credentials.  ``None`` uses ``settings.RATE_LIMIT`` and ``settings.RATE_LIMIT_BURST``.
+    RATE_LIMIT = None  # type: typing.Optional[typing.Tuple[float, float]]
+
+    # Backoff timing, ``Retry-After`` handling and network-error retries for `make_request`
+    RETRY_POLICY = default_policy
+
     def __init__(self, auth: dict,
                  credentials: dict,
                  settings: dict,
@@ -111,14 +111,15 @@ class BaseProvider(metaclass=abc.ABCMeta):
         self.provider_metrics.add('auth', auth)
         self.metrics = self.provider_metrics.new_subrecord(self.NAME)
 
-        # The `.loop_session_map` ensures that only one session is created for one event loop per
-        # provider instance.  On one hand, we can't just have one session for each provider instance
-        # since actions such as move and copy are run in background probably with a different loop.
-        # On the other hand, we can't have one session for each request since sessions are only
-        # closed when the provider instance is destroyed. There would be too many for WB to handle.
+        # Most requests go through the process-wide `session_pool`.  Providers that pass their own
+        # connector to `make_request` still get a private session per event loop per provider
+        # instance.  The `.loop_session_map` ensures that only one such session is created for one
+        # event loop per provider instance, since actions such as move and copy are run in
+        # background probably with a different loop.
         self.loop_session_map = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary
-        # The `.session_list` keeps track of all the sessions created for the provider instance so
-        # that they can be properly closed upon instance destroy.
+        # The `.session_list` keeps track of all the private sessions created for the provider
+        # instance so that they can be properly closed upon instance destroy.  Pooled sessions are
+        # owned by the pool and are never closed here.
         self.session_list = []  # type: typing.List[aiohttp.ClientSession]
 
     def __del__(self):
@@ -138,10 +139,7 @@ class BaseProvider(metaclass=abc.ABCMeta):
         the PR: https://github.com/aio-libs/aiohttp/pull/3417/files.
         """
         for session in self.session_list:
-            if not session.closed:
-                if session.connector is not None and session._connector_owner:
-                    session.connector._close()
-                session.detach()
+            close_session(session)
 
     @property
     @abc.abstractmethod
@@ -157,6 +155,13 @@ class BaseProvider(metaclass=abc.ABCMeta):
         except AttributeError:
             return False
 
+    def recycle(self) -> None:
+        """Reset per-request state before this instance is handed to another request by
+        :data:`waterbutler.core.registry.provider_pool`.  Providers that keep other per-request
+        state should extend this."""
+        self._throttle_wait = 0.0
+        self.provider_metrics.add('requests', {})
+
     def serialized(self) -> dict:
         return {
             'name': self.NAME,
@@ -190,30 +195,34 @@ class BaseProvider(metaclass=abc.ABCMeta):
             if value is not None
         }
 
-    def get_or_create_session(self, connector=None):
+    def get_or_create_session(self, connector=None, url=None):
         """
         Obtain an existing session or create a new one for making requests.
 
         Quirks:
 
-        Sessions must be carefully managed by WB.  On one hand, we can't just have one session for
-        each provider instance since actions such as move and copy are run in background probably
-        with a different loop.  On the other hand, we can't have one session for each request since
-        sessions are only closed when the provider instance is destroyed.
+        Sessions must be carefully managed by WB.  Without a customized connector, the session is
+        taken from the process-wide :data:`waterbutler.core.sessions.session_pool`, which keeps one
+        session per event loop and upstream origin.  Those sessions outlive the provider instance
+        so that keep-alive connections and cached DNS lookups are reused by later WB requests.
 
-        For providers that use a customized connector such as owncloud, the new session is created
-        with the given connector; while an existing session simply ignores (and closes) the new
-        connector.  Given that the session is per event loop and instance, the existing session if
-        found must already have a connector with qualified customizations.
+        For providers that use a customized connector such as owncloud, a private session is
+        created with the given connector; while an existing private session simply ignores (and
+        closes) the new connector.  Given that the private session is per event loop and instance,
+        the existing session if found must already have a connector with qualified customizations.
 
         :param connector: a customized connector
-        :return: the one session that belongs to the current event loop
+        :param url: the url about to be requested, used to pick the pooled session
+        :return: the session to make the request with
         :rtype: :class:`aiohttp.ClientSession`
         """
+        if connector is None and url is not None:
+            return session_pool.get(url)
+
         loop = asyncio.get_event_loop()
         session = self.loop_session_map.get(loop, None)
         if not session:
-            session = aiohttp.ClientSession(connector=connector)
+            session = session_pool.make_session(connector=connector)
             self.loop_session_map[loop] = session
             self.session_list.append(session)
         elif connector:
@@ -222,7 +231,37 @@ class BaseProvider(metaclass=abc.ABCMeta):
 
         return session
 
-    @throttle()
+    @property
+    def credentials_hash(self) -> str:
+        """A stable digest of ``self.credentials``, for keying per-credential state without
+        holding on to the credentials themselves."""
+        if getattr(self, '_credentials_hash', None) is None:
+            self._credentials_hash = hashlib.sha256(
+                json.dumps(self.credentials, sort_keys=True, default=str).encode('utf-8')
+            ).hexdigest()
+        return self._credentials_hash
+
+    async def throttle_request(self, url=None, default: typing.Tuple[float, float]=None) -> float:
+        """Wait for a token from the rate-limit bucket for this provider, the host of ``url`` and
+        this provider's credentials.  Buckets are independent of each other, so one throttled
+        provider, upstream or user does not hold up any other.
+
+        :param url: the url about to be requested, if known
+        :param default: ``(rate, burst)`` to use if the provider has no ``RATE_LIMIT``
+        :rtype: float
+        :return: seconds spent waiting
+        """
+        rate, burst = (
+            self.RATE_LIMIT or default or (wb_settings.RATE_LIMIT, wb_settings.RATE_LIMIT_BURST)
+        )
+        host = URL(str(url)).host if url is not None else None
+        waited = await rate_limiter.acquire((self.NAME, host, self.credentials_hash), rate, burst)
+        if waited > 0.001:
+            self._throttle_wait = getattr(self, '_throttle_wait', 0.0) + waited
+            self.provider_metrics.incr('requests.throttled')
+            self.provider_metrics.add('requests.throttle_wait', round(self._throttle_wait, 3))
+        return waited
+
     async def make_request(self, method, url, *args, **kwargs):
         r"""
         A wrapper around seven HTTP request methods in :class:`aiohttp.ClientSession`.  It replaces
@@ -247,8 +286,8 @@ class BaseProvider(metaclass=abc.ABCMeta):
 
         :func:`__init__()`: session list and event loop map initialization
         :func:`__del__()`: session and connection closing
-        :func:`get_or_create_session()`: either get the current session or create a new one if not
-        found when making a request
+        :func:`get_or_create_session()`: either get the pooled session for the upstream or create
+        a new one if not found when making a request
 
         :param method: ( :class:`str` ) The HTTP method
         :param url: The URL or URL-to-be to send the request to
@@ -264,7 +303,8 @@ class BaseProvider(metaclass=abc.ABCMeta):
         :keyword expects: ( :class:`tuple` ) An optional tuple of HTTP status codes as integers
             raises an exception if the returned status code is not in it
         :keyword retry: ( :class:`int` ) An optional integer with default value 2 that determines
-            how further to retry failed requests with the exponential back-off algorithm
+            how many times to retry failed requests.  Timing is decided by ``RETRY_POLICY``, see
+            :class:`waterbutler.core.retry.RetryPolicy`
         :keyword force_retry_on: ( :class:`set` ) An optional set of integer that determines
             status codes of failed requests that need to be retried
         :keyword throws: ( :class:`Exception` ) The exception to be raised from expects
@@ -272,6 +312,8 @@ class BaseProvider(metaclass=abc.ABCMeta):
         :rtype: :class:`aiohttp.ClientResponse`
         :raises: :class:`.UnhandledProviderError` Raised if expects is defined
         :raises: :class:`.WaterButlerError` Raised if invalid HTTP method is provided
+        :raises: :class:`.UpstreamUnavailableError` Raised if the circuit for the upstream host is
+            open, see :mod:`waterbutler.core.circuitbreaker`
         """
 
         force_retry_on = kwargs.pop('force_retry_on', set())
@@ -279,19 +321,34 @@ class BaseProvider(metaclass=abc.ABCMeta):
         no_auth_header = kwargs.pop('no_auth_header', False)
         if no_auth_header:
             kwargs['headers'].pop('Authorization')
-        retry = _retry = kwargs.pop('retry', 2)
+        retry = kwargs.pop('retry', 2)
         expects = kwargs.pop('expects', None)
         throws = kwargs.pop('throws', exceptions.UnhandledProviderError)
         byte_range = kwargs.pop('range', None)
         if byte_range:
             kwargs['headers']['Range'] = self._build_range_header(byte_range)
         connector = kwargs.pop('connector', None)
-        session = self.get_or_create_session(connector=connector)
+        kwargs['trace_request_ctx'] = {'provider': self.NAME}
+        session = self.get_or_create_session(connector=connector) if connector else None
+
+        policy = self.RETRY_POLICY
+        started = time.monotonic()
+        delay = 0.0
+        # Host of the last attempt if it failed.  A call counts as one failure for the circuit
+        # breaker however many times it's retried, recorded once it gives up.
+        failed_host = None
 
         method = method.upper()
         while retry >= 0:
             # Don't overwrite the callable ``url`` so that signed URLs are refreshed for every retry
             non_callable_url = url() if callable(url) else url
+            if connector is None:
+                session = self.get_or_create_session(url=non_callable_url)
+            host = URL(str(non_callable_url)).host
+            if not circuit_breakers.allow_request(host):
+                self.provider_metrics.incr('requests.circuit_open')
+                raise exceptions.UpstreamUnavailableError(host)
+            await self.throttle_request(non_callable_url)
             if self.NAME not in NO_URL_ENCODED_PROVIDERS:
                 # Fix storage 'nextcloud', 'owncloud', 'nextcloudinstitutions' return HTTP 400 bad request
                 non_callable_url = URL(non_callable_url, encoded=True)
@@ -329,19 +386,47 @@ class BaseProvider(metaclass=abc.ABCMeta):
                 else:
                     raise exceptions.WaterButlerError('Unsupported HTTP method ...')
                 self.provider_metrics.incr('requests.tally.ok')
+                failed_host = host if circuit_breakers.is_failure(response.status) else None
+                retry_after = None
                 if (retry > 0 and response.status in force_retry_on) or (expects and response.status not in expects):
+                    retry_after = policy.delay_from_headers(response.headers)
                     unexpected = await exceptions.exception_from_response(response,
                                                                           error=throws, **kwargs)
                     raise unexpected
+                circuit_breakers.record(host, response.status)
                 return response
             except throws as e:
                 self.provider_metrics.incr('requests.tally.nok')
                 if retry <= 0 or e.code not in force_retry_on.union(self._retry_on):
+                    self._record_outcome(failed_host, host)
                     raise
-                # Seconds equals twice the 'n' attempt
-                sleep_seconds = (1 + _retry - retry) * 2
-                await asyncio.sleep(sleep_seconds)
-                retry -= 1
+                error = e
+            except policy.NETWORK_ERRORS as e:
+                self.provider_metrics.incr('requests.tally.nok')
+                failed_host = host
+                if retry <= 0 or not policy.can_retry_error(method, e, kwargs.get('data')):
+                    self._record_outcome(failed_host, host)
+                    raise
+                error, retry_after = e, None
+
+            delay = policy.next_delay(delay, retry_after)
+            deadline_start = None if self.is_celery_task else started
+            if delay is None or not policy.within_deadline(deadline_start, delay):
+                self._record_outcome(failed_host, host)
+                raise error
+            self.provider_metrics.incr('requests.retries')
+            await asyncio.sleep(delay)
+            retry -= 1
+
+    @staticmethod
+    def _record_outcome(failed_host: typing.Optional[str], host: str) -> None:
+        """Tell the circuit breaker how a `make_request` call that's giving up went: a failure
+        of ``failed_host`` if its last attempt failed, else a success of ``host``, which answered
+        with a status that isn't the upstream's fault."""
+        if failed_host is not None:
+            circuit_breakers.record_failure(failed_host)
+        else:
+            circuit_breakers.record_success(host)
 
     def request(self, *args, **kwargs):
         return RequestHandlerContext(self.make_request(*args, **kwargs))
@@ -456,7 +541,12 @@ class BaseProvider(metaclass=abc.ABCMeta):
         if hasattr(download_stream, '_size') and download_stream._size is None:
             download_stream._size = 0
 
-        return await dest_provider.upload(download_stream, dest_path)
+        try:
+            return await dest_provider.upload(download_stream, dest_path)
+        finally:
+            # gives back the parts a parallel download fetched ahead if the upload stopped early
+            if isinstance(download_stream, streams.RangedResponseStream):
+                download_stream.close()
 
     async def _folder_file_op(self,
                               func: typing.Callable,
@@ -653,6 +743,20 @@ class BaseProvider(metaclass=abc.ABCMeta):
                 raise
         return False
 
+    async def probe(self, path: wb_path.WaterButlerPath, **kwargs) -> bool:
+        """Check for existence of WaterButlerPath, without fetching its metadata
+
+        Used wherever only existence matters, e.g. naming conflict checks.  The default falls back
+        to :meth:`exists`, which lists the contents of folders.  Providers that can tell more
+        cheaply (a HEAD request, a one key listing, an id lookup) should override this.
+
+        :param  path: ( :class:`.WaterButlerPath` ) path to check for
+        :rtype: :class:`bool`
+        """
+        exists = await self.exists(path, **kwargs)
+        # metadata() returns [] for empty folders
+        return not isinstance(exists, bool) or exists
+
     async def handle_name_conflict(self,
                                    path: wb_path.WaterButlerPath,
                                    conflict: str='replace',
@@ -667,26 +771,57 @@ class BaseProvider(metaclass=abc.ABCMeta):
         :rtype: (:class:`.WaterButlerPath` or False)
         :raises: :class:`.NamingConflict`
         """
-        exists = await self.exists(path, **kwargs)
-        if (not exists and not exists == []) or conflict == 'replace':
-            return path, exists  # type: ignore
+        exists = await self.probe(path, **kwargs)
+        if not exists or conflict == 'replace':
+            return path, exists
         if conflict == 'warn':
             raise exceptions.NamingConflict(path.name)
 
+        # Once the first candidate turns out to be taken too, candidates already present in the
+        # parent's listing, if the provider can list it cheaply, are skipped without a round trip.
+        # The first free one is still checked, the listing may be incomplete or compare names
+        # differently.
+        taken, listed = None, False
         while True:
             path.increment_name()
+            if taken is not None and path.name in taken:
+                continue
             test_path = await self.revalidate_path(
                 path.parent,
                 path.name,
                 folder=path.is_dir
             )
 
-            exists = await self.exists(test_path, **kwargs)
-            if not (exists or exists == []):
+            if not await self.probe(test_path, **kwargs):
                 break
+            if not listed:
+                taken, listed = await self.child_names(path.parent), True
 
         return path, False
 
+    async def child_names(self,
+                          folder: wb_path.WaterButlerPath) -> typing.Optional[typing.Set[str]]:
+        """Return the names of the children of ``folder``, used by :meth:`handle_name_conflict` to
+        find a free name without checking each candidate upstream, or None to check every
+        candidate.  The default returns None.  Providers that can list a folder in one cheap
+        request, however many children it has, should override this.
+
+        :param  folder: ( :class:`.WaterButlerPath` ) the folder to list
+        :rtype: (:class:`set` or None)
+        """
+        return None
+
+    async def folder_validator(self, path: wb_path.WaterButlerPath,
+                               **kwargs) -> typing.Optional[str]:
+        """Return a token that changes whenever the listing of the folder ``path`` changes, e.g.
+        an etag or a modification time, or None if that can't be told without listing it.  Used to
+        revalidate cached folder listings, so it must be much cheaper than :meth:`metadata`.
+
+        :param  path: ( :class:`.WaterButlerPath` ) the folder
+        :rtype: (:class:`str` or None)
+        """
+        return None
+
     async def revalidate_path(self,
                               base: wb_path.WaterButlerPath,
                               path: str,
@@ -742,6 +877,43 @@ class BaseProvider(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError
 
+    async def ranged_download(self, fetch: typing.Callable, range: typing.Tuple[int, int]=None) \
+            -> streams.BaseStream:
+        """Download helper for object stores, whose throughput per connection is well below what
+        a few connections get.  ``fetch`` makes the ``GET`` for the object, with a ``(start, end)``
+        range or None for all of it, and returns the response.
+
+        Downloads of a ``range`` are made as is, and so are those outside celery tasks unless
+        ``PARALLEL_DOWNLOADS_SERVER`` is set.  Otherwise the first ``PARALLEL_DOWNLOAD_THRESHOLD``
+        bytes are asked for.  If that's not the whole object, the rest is fetched in parallel by
+        the returned :class:`.RangedResponseStream`.
+
+        :param fetch: coroutine function taking the range and returning the response
+        :param range: ( :class:`tuple` ) the range asked for by the caller, if any
+        :rtype: :class:`.ResponseStreamReader` or :class:`.RangedResponseStream`
+        """
+        parallel = wb_settings.PARALLEL_DOWNLOADS and (self.is_celery_task or
+                                                       wb_settings.PARALLEL_DOWNLOADS_SERVER)
+        if range is not None or not parallel:
+            return streams.ResponseStreamReader(await fetch(range))
+
+        try:
+            response = await fetch((0, wb_settings.PARALLEL_DOWNLOAD_THRESHOLD - 1))
+        except exceptions.WaterButlerError as exc:
+            # no range of an empty object is satisfiable
+            if exc.code != 416:
+                raise
+            return streams.ResponseStreamReader(await fetch(None))
+
+        # servers may ignore the range and send all of it
+        total = response.headers.get('Content-Range', '').rpartition('/')[2]
+        if response.status != 206 or not total.isdigit():
+            return streams.ResponseStreamReader(response)
+
+        self.provider_metrics.add('download.parallel',
+                                  int(total) > wb_settings.PARALLEL_DOWNLOAD_THRESHOLD)
+        return streams.RangedResponseStream(response, fetch, int(total))
+
     @abc.abstractmethod
     async def upload(self, stream: streams.BaseStream, path: wb_path.WaterButlerPath, *args,
                      **kwargs) -> typing.Tuple[wb_metadata.BaseFileMetadata, bool]:
@@ -789,6 +961,96 @@ class BaseProvider(metaclass=abc.ABCMeta):
     def handle_data(self, data):
         return data, None
 
+    async def metadata_page(self, path: wb_path.WaterButlerPath, page_size: int,
+                            cursor: str=None, **kwargs) \
+            -> typing.Tuple[typing.List[wb_metadata.BaseMetadata], typing.Optional[str]]:
+        """List one page of the children of the folder ``path``.  Returns at most ``page_size``
+        children, starting at ``cursor``, along with the cursor of the next page, or None if this
+        is the last one.  Cursors are opaque to callers.
+
+        The default lists the whole folder and slices it, with offsets for cursors.  Providers that
+        can page natively should override this so that a page costs one upstream request.
+
+        :param  path: ( :class:`.WaterButlerPath` ) the folder to list
+        :param  page_size: ( :class:`int` ) max number of children to return
+        :param  cursor: ( :class:`str` ) cursor returned with the previous page, None for the first
+        :rtype: (:class:`list` of :class:`.BaseMetadata`, :class:`str` or None)
+        :raises: :class:`.InvalidParameters` if the cursor is not valid
+        """
+        try:
+            offset = int(cursor or 0)
+        except ValueError:
+            offset = -1
+        if offset < 0:
+            raise exceptions.InvalidParameters('Invalid cursor: {}'.format(cursor))
+
+        children = await self.metadata(path, **kwargs)
+        page = children[offset:offset + page_size]
+        if offset + page_size < len(children):
+            return page, str(offset + page_size)
+        return page, None
+
+    async def walk(self, path: wb_path.WaterButlerPath, max_depth: int=None,
+                   concurrency: int=None, **kwargs) \
+            -> typing.AsyncIterator[typing.List[wb_metadata.BaseMetadata]]:
+        """Walk the tree under the folder ``path``, yielding the metadata of its descendants a
+        listing at a time, in whatever order the listings complete.  The folder itself is not
+        included.  Entries ``max_depth`` levels below ``path`` are listed but not descended into,
+        so ``max_depth=1`` is the same as listing ``path``.
+
+        The default lists folders with :meth:`metadata`, at most ``concurrency`` at a time.  A
+        folder that is deleted while the tree is being walked is skipped.  Providers that can list
+        a whole tree natively should override this.
+
+        :param  path: ( :class:`.WaterButlerPath` ) the folder to walk
+        :param  max_depth: ( :class:`int` ) levels to descend, None for no limit
+        :param  concurrency: ( :class:`int` ) listings in flight, ``WALK_CONCURRENCY`` by default
+        :rtype: async iterator of :class:`list` of :class:`.BaseMetadata`
+        """
+        concurrency = concurrency or wb_settings.WALK_CONCURRENCY
+
+        async def list_folder(parent, child, depth):
+            folder = parent if child is None else await self.child_path(parent, child)
+            try:
+                return folder, depth, await self.metadata(folder, **kwargs)  # type: ignore
+            except exceptions.MetadataError as e:
+                if child is None or e.code != 404:
+                    raise
+                logger.info('Folder {} went away while walking {}'.format(folder, path))
+                return folder, depth, []
+
+        queue = [(path, None, 1)]
+        pending = set()  # type: typing.Set[asyncio.Future]
+        try:
+            while queue or pending:
+                while queue and len(pending) < concurrency:
+                    pending.add(asyncio.ensure_future(list_folder(*queue.pop())))
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for fut in done:
+                    folder, depth, children = fut.result()
+                    if max_depth is None or depth < max_depth:
+                        queue.extend((folder, child, depth + 1)
+                                     for child in children if child.is_folder)
+                    yield children
+        finally:
+            for fut in pending:
+                fut.cancel()
+
+    async def child_path(self, parent: wb_path.WaterButlerPath,
+                         child: wb_metadata.BaseMetadata) -> wb_path.WaterButlerPath:
+        """Return the path of ``child``, an entry of the listing of the folder ``parent``.  Used by
+        :meth:`walk` to descend into the folders it lists.
+
+        The default looks the child up again by name with :meth:`revalidate_path`.  Providers whose
+        paths carry ids should override this to build the path from the listing's own metadata,
+        which saves a lookup per folder and tells apart siblings with the same name.
+
+        :param  parent: ( :class:`.WaterButlerPath` ) the folder that was listed
+        :param  child: ( :class:`.BaseMetadata` ) the child's entry in the listing
+        :rtype: :class:`.WaterButlerPath`
+        """
+        return await self.revalidate_path(parent, child.name, folder=child.is_folder)
+
     @abc.abstractmethod
     async def validate_v1_path(self, path: str, **kwargs) -> wb_path.WaterButlerPath:
         """API v1 requires that requests against folder endpoints always end with a slash, and
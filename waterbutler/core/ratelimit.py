@@ -0,0 +1,145 @@
+import time
+import typing
+import asyncio
+import weakref
+
+
+class TokenBucket:
+    """A token bucket that refills at ``rate`` tokens per second up to ``capacity`` tokens.  Each
+    call to :meth:`acquire` takes one token, waiting for one to become available if the bucket is
+    empty.  Waiters are served strictly in arrival order: they queue up on an `asyncio.Lock`, which
+    is FIFO and does not let new callers barge in ahead of existing waiters.
+
+    Buckets must only be used from the event loop they were created on.
+
+    :param float rate: tokens added per second
+    :param float capacity: max tokens held, i.e. the burst size
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = float(rate)
+        self.capacity = max(float(capacity), 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+        self.acquired = 0
+        self.waits = 0
+        self.wait_time = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def idle(self) -> bool:
+        """True if nobody is waiting and the bucket has refilled completely.  An idle bucket is
+        indistinguishable from a brand new one and may be discarded."""
+        if self._lock.locked():
+            return False
+        self._refill()
+        return self._tokens >= self.capacity
+
+    async def acquire(self) -> float:
+        """Take one token, waiting if necessary.
+
+        :rtype: float
+        :return: seconds spent waiting for the token
+        """
+        start = time.monotonic()
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+        waited = time.monotonic() - start
+        self.acquired += 1
+        if waited > 0.001:
+            self.waits += 1
+            self.wait_time += waited
+        return waited
+
+
+class RateLimiter:
+    """A registry of :class:`TokenBucket` objects, one per event loop and key.  WB keys buckets by
+    ``(provider name, upstream host, credentials hash)`` so that a chatty provider or user only
+    slows itself down.  Buckets that have refilled completely are dropped during periodic sweeps
+    to keep the registry from growing without bound.
+
+    :param float sweep_interval: min seconds between sweeps of idle buckets
+    """
+
+    def __init__(self, sweep_interval: float=60) -> None:
+        self.sweep_interval = sweep_interval
+        self._loops = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary
+        self._last_sweep = time.monotonic()
+
+        # totals for buckets that have already been swept away
+        self._swept_stats = {}  # type: typing.Dict[str, typing.Dict[str, float]]
+
+    def bucket(self, key: tuple, rate: float, capacity: float) -> TokenBucket:
+        """Return the bucket for ``key`` on the current event loop, creating it if necessary.  If
+        the configured rate or capacity has changed, the bucket is replaced."""
+        loop = asyncio.get_event_loop()
+        buckets = self._loops.get(loop)
+        if buckets is None:
+            buckets = self._loops[loop] = {}
+
+        bucket = buckets.get(key)
+        if bucket is None or bucket.rate != rate or bucket.capacity != max(capacity, 1.0):
+            bucket = buckets[key] = TokenBucket(rate, capacity)
+
+        if time.monotonic() - self._last_sweep >= self.sweep_interval:
+            self.sweep()
+
+        return bucket
+
+    async def acquire(self, key: tuple, rate: float, capacity: float) -> float:
+        """Take a token from the bucket for ``key``.  A ``rate`` of zero or less disables rate
+        limiting for the call.
+
+        :rtype: float
+        :return: seconds spent waiting for the token
+        """
+        if not rate or rate <= 0:
+            return 0.0
+        return await self.bucket(key, rate, capacity).acquire()
+
+    def sweep(self) -> int:
+        """Drop buckets that are idle.
+
+        :rtype: int
+        :return: number of buckets dropped
+        """
+        self._last_sweep = time.monotonic()
+        dropped = 0
+        for buckets in list(self._loops.values()):
+            for key, bucket in list(buckets.items()):
+                if bucket.idle:
+                    self._record(key, bucket, self._swept_stats)
+                    del buckets[key]
+                    dropped += 1
+        return dropped
+
+    def stats(self) -> typing.Dict[str, typing.Dict[str, float]]:
+        """Acquisition and wait totals per provider name, including swept buckets."""
+        totals = {
+            name: dict(values) for name, values in self._swept_stats.items()
+        }  # type: typing.Dict[str, typing.Dict[str, float]]
+        for buckets in list(self._loops.values()):
+            for key, bucket in buckets.items():
+                self._record(key, bucket, totals)
+        return totals
+
+    @staticmethod
+    def _record(key: tuple, bucket: TokenBucket, totals: dict) -> None:
+        entry = totals.setdefault(key[0], {'acquired': 0, 'waits': 0, 'wait_time': 0.0})
+        entry['acquired'] += bucket.acquired
+        entry['waits'] += bucket.waits
+        entry['wait_time'] += bucket.wait_time
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,201 @@
+import json
+import time
+import typing
+import hashlib
+import logging
+import collections
+
+from pkg_resources import iter_entry_points
+
+from waterbutler.core import exceptions
+from waterbutler import settings as wb_settings
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = 'waterbutler.providers'
+
+
+class ProviderRegistry:
+    """Maps provider names to provider classes.  The ``waterbutler.providers`` entry points are
+    scanned once, which is cheap, but a provider's module is only imported the first time the
+    provider is asked for.  A node that only serves osfstorage never pays for importing boto,
+    lxml and friends.
+
+    :param str namespace: entry point group to look providers up in
+    :param set enabled: names of the providers that may be used, empty allows all of them
+    """
+
+    def __init__(self, namespace: str=NAMESPACE, enabled: typing.Iterable[str]=()) -> None:
+        self.namespace = namespace
+        self.enabled = set(enabled)
+        self._entry_points = None  # type: typing.Optional[dict]
+        self._classes = {}  # type: typing.Dict[str, type]
+        self.import_times = {}  # type: typing.Dict[str, float]
+
+    def entry_points(self) -> dict:
+        if self._entry_points is None:
+            self._entry_points = {
+                entry_point.name: entry_point
+                for entry_point in iter_entry_points(self.namespace)
+                if not self.enabled or entry_point.name in self.enabled
+            }
+        return self._entry_points
+
+    def get(self, name: str) -> type:
+        """Return the provider class registered as ``name``, importing it if needed.
+
+        :raises: :class:`waterbutler.core.exceptions.ProviderNotFound` if there is no such
+            provider, it is not enabled or it fails to import
+        """
+        try:
+            return self._classes[name]
+        except KeyError:
+            pass
+
+        entry_point = self.entry_points().get(name)
+        if entry_point is None:
+            raise exceptions.ProviderNotFound(name)
+
+        start = time.perf_counter()
+        try:
+            provider_class = entry_point.resolve()
+        except Exception:
+            logger.exception('Could not load provider {!r}'.format(name))
+            raise exceptions.ProviderNotFound(name)
+        self.import_times[name] = time.perf_counter() - start
+        logger.info('Loaded provider {!r} in {:.3f}s'.format(name, self.import_times[name]))
+
+        self._classes[name] = provider_class
+        return provider_class
+
+    def load(self) -> typing.Dict[str, type]:
+        """Import every enabled provider now rather than on first use.  Providers that fail to
+        import are logged and left out."""
+        for name in self.names():
+            try:
+                self.get(name)
+            except exceptions.ProviderNotFound:
+                pass
+        return dict(self._classes)
+
+    def names(self) -> typing.List[str]:
+        return sorted(self.entry_points())
+
+    def report(self) -> str:
+        """A summary of the time spent importing each loaded provider, slowest first."""
+        lines = ['{:<24} {:.3f}s'.format(name, seconds) for name, seconds in
+                 sorted(self.import_times.items(), key=lambda item: item[1], reverse=True)]
+        lines.append('{:<24} {:.3f}s'.format('total', sum(self.import_times.values())))
+        return '\n'.join(lines)
+
+    def clear(self) -> None:
+        self._entry_points = None
+        self._classes.clear()
+        self.import_times.clear()
+
+
+class ProviderPool:
+    """A bounded pool of idle provider instances, so a request can pick up an instance built for
+    an earlier request with the same auth, credentials and settings along with whatever it has
+    cached: sessions, regions, tokens, resolved ids.
+
+    An instance is only ever used by one request at a time.  :meth:`acquire` hands out an idle
+    instance and removes it from the pool, :meth:`release` puts it back once the request is done
+    with it.  Instances that have been idle for ``idle_timeout`` seconds are dropped, as are the
+    least recently released ones when more than ``maxsize`` are idle.
+
+    :param int maxsize: max number of idle instances, 0 disables the pool
+    :param float idle_timeout: seconds an idle instance is kept
+    """
+
+    def __init__(self, maxsize: int=0, idle_timeout: float=60) -> None:
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        # key -> [(released_at, provider), ...], least recently released key first
+        self._idle = collections.OrderedDict()  # type: collections.OrderedDict
+        self._size = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    @staticmethod
+    def key(name: str, auth: dict, credentials: dict, settings: dict, **kwargs) -> tuple:
+        digest = hashlib.sha256(json.dumps(
+            [auth, credentials, settings, kwargs], sort_keys=True, default=str,
+        ).encode('utf-8')).hexdigest()
+        return (name, digest)
+
+    def acquire(self, key: tuple):
+        """Return an idle instance built for ``key`` or None."""
+        self._expire()
+        idle = self._idle.get(key)
+        if not idle:
+            self.misses += 1
+            return None
+        _, provider = idle.pop()
+        if not idle:
+            del self._idle[key]
+        self._size -= 1
+        self.hits += 1
+        provider.recycle()
+        return provider
+
+    def track(self, provider, key: tuple) -> None:
+        """Mark a newly built ``provider`` as returnable to the pool under ``key``."""
+        provider._pool_key = key
+
+    def release(self, provider) -> None:
+        """Put ``provider`` back in the pool.  Instances not built through the pool, including
+        ``None``, are ignored, as are instances that are already idle."""
+        key = getattr(provider, '_pool_key', None)
+        if not self.enabled or key is None:
+            return
+        idle = self._idle.setdefault(key, [])
+        if any(entry[1] is provider for entry in idle):
+            return
+        idle.append((time.monotonic(), provider))
+        self._idle.move_to_end(key)
+        self._size += 1
+        while self._size > self.maxsize:
+            oldest = next(iter(self._idle))
+            self._idle[oldest].pop(0)
+            if not self._idle[oldest]:
+                del self._idle[oldest]
+            self._size -= 1
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.idle_timeout
+        for key in list(self._idle):
+            idle = [entry for entry in self._idle[key] if entry[0] > cutoff]
+            self._size -= len(self._idle[key]) - len(idle)
+            if idle:
+                self._idle[key] = idle
+            else:
+                del self._idle[key]
+
+    def clear(self) -> None:
+        self._idle.clear()
+        self._size = 0
+
+    def stats(self) -> dict:
+        return {'idle': self._size, 'hits': self.hits, 'misses': self.misses}
+
+
+provider_registry = ProviderRegistry(enabled=wb_settings.ENABLED_PROVIDERS)
+provider_pool = ProviderPool(
+    maxsize=wb_settings.PROVIDER_POOL_SIZE,
+    idle_timeout=wb_settings.PROVIDER_POOL_IDLE_TIMEOUT,
+)
+
+
+def preload_providers() -> None:
+    """Import every enabled provider up front if ``PRELOAD_PROVIDERS`` is set and log how long
+    each took.  Called on server and celery worker startup."""
+    if not wb_settings.PRELOAD_PROVIDERS:
+        return
+    provider_registry.load()
+    logger.info('Provider import times:\n{}'.format(provider_registry.report()))
@@ -0,0 +1,109 @@
+import time
+import random
+import typing
+import asyncio
+import email.utils
+
+import aiohttp
+
+from waterbutler import settings as wb_settings
+
+
+class RetryPolicy:
+    """Decides whether and when :meth:`waterbutler.core.provider.BaseProvider.make_request` retries
+    a failed request.  Each provider class carries one as ``RETRY_POLICY``; providers that need
+    different timing can assign their own instance.  Which status codes are retried is still
+    controlled by the provider's ``retry_on`` and the ``force_retry_on`` kwarg.
+
+    Delays between attempts use "decorrelated jitter" exponential backoff: each delay is drawn
+    uniformly from ``[base, previous delay * 3]`` and capped at ``cap``.  Under an upstream
+    brownout this spreads retries out instead of having every worker retry in the same second.
+    If the upstream says when to come back via ``Retry-After`` or ``X-RateLimit-Reset``, that is
+    honored instead, unless it asks for more than ``max_retry_after`` seconds, in which case the
+    request is not retried at all.
+
+    Connection errors and timeouts are retried only for idempotent methods whose body can be
+    sent again, i.e. not for streamed uploads.
+
+    :param float base: min delay, in seconds
+    :param float cap: max backoff delay, in seconds
+    :param float deadline: seconds after a call to ``make_request`` starts after which it
+        schedules no more retries.  ``None`` disables the deadline.
+    :param float max_retry_after: longest ``Retry-After`` that will be waited for, in seconds
+    :param bool retry_network_errors: retry connection errors and timeouts on idempotent requests
+    """
+
+    IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'PROPFIND'})
+    NETWORK_ERRORS = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError)
+
+    def __init__(self, base: float=1.0, cap: float=30.0, deadline: float=60.0,
+                 max_retry_after: float=60.0, retry_network_errors: bool=True) -> None:
+        self.base = base
+        self.cap = cap
+        self.deadline = deadline
+        self.max_retry_after = max_retry_after
+        self.retry_network_errors = retry_network_errors
+
+    def backoff(self, previous: float=0.0) -> float:
+        """The next delay given the ``previous`` one (zero before the first retry)."""
+        upper = max(self.base, previous * 3)
+        return min(self.cap, random.uniform(self.base, upper))
+
+    def delay_from_headers(self, headers: typing.Mapping) -> typing.Optional[float]:
+        """Parse ``Retry-After`` (delta-seconds or HTTP-date) or ``X-RateLimit-Reset`` (an epoch
+        timestamp or delta-seconds) into a delay in seconds.  Returns ``None`` if neither header
+        is present or parseable.
+        """
+        value = headers.get('Retry-After')
+        if value is not None:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                parsed = email.utils.parsedate_tz(value)
+                if parsed is not None:
+                    return max(0.0, email.utils.mktime_tz(parsed) - time.time())
+
+        value = headers.get('X-RateLimit-Reset')
+        if value is not None:
+            try:
+                reset = float(value)
+            except ValueError:
+                return None
+            # Some services send an epoch timestamp, others the number of seconds to wait.
+            if reset > 1000000000:
+                reset -= time.time()
+            return max(0.0, reset)
+
+        return None
+
+    def next_delay(self, previous: float,
+                   retry_after: typing.Optional[float]=None) -> typing.Optional[float]:
+        """The delay before the next attempt, or ``None`` if the request should not be retried
+        because the upstream asked for a longer wait than we are willing to give it."""
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_retry_after else None
+        return self.backoff(previous)
+
+    def can_retry_error(self, method: str, exc: Exception, data=None) -> bool:
+        """Whether a request that failed with the network error ``exc`` may be sent again."""
+        if not self.retry_network_errors or not isinstance(exc, self.NETWORK_ERRORS):
+            return False
+        if method.upper() not in self.IDEMPOTENT_METHODS:
+            return False
+        # Streams have already been (partially) consumed and cannot be replayed.
+        return data is None or isinstance(data, (bytes, str, dict))
+
+    def within_deadline(self, started: typing.Optional[float], delay: float) -> bool:
+        """Whether sleeping ``delay`` seconds keeps us within the deadline that began at
+        ``started`` (a `time.monotonic` value)."""
+        if self.deadline is None or started is None:
+            return True
+        return time.monotonic() + delay - started <= self.deadline
+
+
+default_policy = RetryPolicy(
+    base=wb_settings.RETRY_BACKOFF_BASE,
+    cap=wb_settings.RETRY_BACKOFF_CAP,
+    deadline=wb_settings.RETRY_DEADLINE,
+    max_retry_after=wb_settings.RETRY_MAX_RETRY_AFTER,
+)
@@ -0,0 +1,165 @@
+import time
+import typing
+import asyncio
+import logging
+import weakref
+
+import aiohttp
+from yarl import URL
+
+from waterbutler import settings as wb_settings
+from waterbutler.core.tracing import make_trace_config
+
+logger = logging.getLogger(__name__)
+
+
+class _PoolEntry:
+    """A pooled session and the last time it was handed out."""
+
+    def __init__(self, session: aiohttp.ClientSession) -> None:
+        self.session = session
+        self.last_used = time.monotonic()
+
+
+class SessionPool:
+    """A process-wide pool of :class:`aiohttp.ClientSession` objects shared by every provider
+    instance.  Before the pool existed, each provider instance (and one is built for every API
+    request) opened its own session and so paid a fresh TCP + TLS handshake on its first request
+    to the upstream.  Pooling the sessions lets keep-alive connections and the DNS cache survive
+    across WB requests.
+
+    Sessions are keyed by event loop and upstream origin (scheme, host, port).  aiohttp sessions
+    are bound to the loop they were created on, and the celery tasks run on a different loop than
+    the tornado server, so each loop gets its own set.  Keying on origin gives every upstream its
+    own connector, so ``limit_per_host`` and ``limit`` cannot be exhausted by one slow host.
+
+    Sessions that have not been handed out for ``idle_timeout`` seconds and which have no
+    connections checked out are closed and dropped the next time the pool is swept.  Sweeping is
+    done lazily from :meth:`get`, at most once every ``sweep_interval`` seconds.
+
+    :param int limit: max number of simultaneous connections per origin (0 for no limit)
+    :param int limit_per_host: max number of simultaneous connections per endpoint (0 for no limit)
+    :param float keepalive_timeout: seconds an idle connection is kept open for reuse
+    :param int ttl_dns_cache: seconds to cache DNS lookups
+    :param float idle_timeout: seconds before an unused session is evicted
+    :param float sweep_interval: min seconds between idle sweeps
+    """
+
+    def __init__(self, limit: int=100, limit_per_host: int=0, keepalive_timeout: float=15,
+                 ttl_dns_cache: int=10, idle_timeout: float=300,
+                 sweep_interval: float=60) -> None:
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.idle_timeout = idle_timeout
+        self.sweep_interval = sweep_interval
+        self._loops = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary
+        self._last_sweep = time.monotonic()
+
+    @staticmethod
+    def origin(url: typing.Union[str, URL]) -> typing.Tuple[str, str, int]:
+        """Return the ``(scheme, host, port)`` tuple used to key the pool for ``url``."""
+        url = url if isinstance(url, URL) else URL(str(url))
+        return (url.scheme, url.host or '', url.port or 0)
+
+    def make_connector(self) -> aiohttp.TCPConnector:
+        return aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+            use_dns_cache=True,
+        )
+
+    def make_session(self, connector: aiohttp.BaseConnector=None) -> aiohttp.ClientSession:
+        """Build a new session.  ``connector`` is used if given, otherwise a pool-configured
+        connector is created.  Requests are timed by :mod:`waterbutler.core.tracing` unless
+        ``UPSTREAM_TRACING`` is off.
+
+        Pooled sessions are shared by every user, so they must not remember cookies set by an
+        upstream: those would be sent along with the next user's requests.  Private sessions
+        (``connector`` given) belong to one provider instance and keep the default cookie jar.
+        """
+        trace_configs = [make_trace_config()] if wb_settings.UPSTREAM_TRACING else None
+        cookie_jar = None if connector else aiohttp.DummyCookieJar()
+        return aiohttp.ClientSession(connector=connector or self.make_connector(),
+                                     cookie_jar=cookie_jar, trace_configs=trace_configs)
+
+    def get(self, url: typing.Union[str, URL]) -> aiohttp.ClientSession:
+        """Return the shared session for the current event loop and the origin of ``url``,
+        creating it if necessary.
+
+        :param url: the url about to be requested
+        :rtype: :class:`aiohttp.ClientSession`
+        """
+        loop = asyncio.get_event_loop()
+        sessions = self._loops.get(loop)
+        if sessions is None:
+            sessions = self._loops[loop] = {}
+
+        key = self.origin(url)
+        entry = sessions.get(key)
+        if entry is None or entry.session.closed:
+            entry = sessions[key] = _PoolEntry(self.make_session())
+            logger.debug('Created pooled session for {}://{}:{}'.format(*key))
+        entry.last_used = time.monotonic()
+
+        if entry.last_used - self._last_sweep >= self.sweep_interval:
+            self.evict_idle()
+
+        return entry.session
+
+    def evict_idle(self) -> int:
+        """Close and drop sessions that have sat unused for longer than ``idle_timeout`` and have
+        no connections currently checked out (a response may still be streaming from them).
+
+        :rtype: int
+        :return: the number of sessions evicted
+        """
+        now = self._last_sweep = time.monotonic()
+        evicted = 0
+        for sessions in list(self._loops.values()):
+            for key, entry in list(sessions.items()):
+                if now - entry.last_used < self.idle_timeout:
+                    continue
+                connector = entry.session.connector
+                if connector is not None and getattr(connector, '_acquired', None):
+                    continue
+                del sessions[key]
+                close_session(entry.session)
+                evicted += 1
+        return evicted
+
+    def stats(self) -> dict:
+        """Summary of the pooled sessions for the current process, used by status endpoints."""
+        return {
+            'loops': len(self._loops),
+            'sessions': sum(len(sessions) for sessions in self._loops.values()),
+        }
+
+    def clear(self) -> None:
+        """Close and drop every pooled session."""
+        for sessions in list(self._loops.values()):
+            for entry in sessions.values():
+                close_session(entry.session)
+            sessions.clear()
+
+
+def close_session(session: aiohttp.ClientSession) -> None:
+    """Synchronously close a session and the connector it owns.  See
+    :meth:`waterbutler.core.provider.BaseProvider.__del__` for why protected members are used.
+    """
+    if not session.closed:
+        if session.connector is not None and session._connector_owner:
+            session.connector._close()
+        session.detach()
+
+
+session_pool = SessionPool(
+    limit=wb_settings.SESSION_POOL_LIMIT,
+    limit_per_host=wb_settings.SESSION_POOL_LIMIT_PER_HOST,
+    keepalive_timeout=wb_settings.SESSION_POOL_KEEPALIVE_TIMEOUT,
+    ttl_dns_cache=wb_settings.SESSION_POOL_DNS_CACHE_TTL,
+    idle_timeout=wb_settings.SESSION_POOL_IDLE_TIMEOUT,
+)
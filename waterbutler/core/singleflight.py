@@ -0,0 +1,67 @@
+import copy
+import typing
+import asyncio
+import weakref
+
+from waterbutler.core.metrics import CounterFamily, metrics_registry
+
+_flights = []  # type: typing.List[SingleFlight]
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key: the first caller starts the work, everyone
+    who asks for the same key while it is still running awaits the same result instead of
+    starting a duplicate.  Nothing is remembered once the call completes; this is not a cache.
+
+    The work runs in its own task, so a caller that goes away (e.g. the client disconnected)
+    does not cancel it for the others.  Exceptions are raised to every caller.  Every caller
+    receives its own deep copy of the result so that none of them can mutate another's.
+
+    :param str name: label used in the ``/metrics`` endpoint
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.collapsed = 0
+        self._loops = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary
+        _flights.append(self)
+
+    async def do(self, key: typing.Hashable, func: typing.Callable[..., typing.Awaitable],
+                 *args, **kwargs):
+        """Return the result of ``await func(*args, **kwargs)``, sharing an in-flight call for
+        ``key`` if there is one."""
+        loop = asyncio.get_event_loop()
+        in_flight = self._loops.get(loop)
+        if in_flight is None:
+            in_flight = self._loops[loop] = {}
+
+        self.calls += 1
+        task = in_flight.get(key)
+        if task is not None:
+            self.collapsed += 1
+        else:
+            task = in_flight[key] = asyncio.ensure_future(func(*args, **kwargs))
+            task.add_done_callback(_on_done(in_flight, key))
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def in_flight(self) -> int:
+        return sum(len(in_flight) for in_flight in self._loops.values())
+
+
+def _on_done(in_flight: dict, key: typing.Hashable) -> typing.Callable:
+    def done(task: asyncio.Future) -> None:
+        if in_flight.get(key) is task:
+            del in_flight[key]
+        # If every caller went away the result is never awaited, don't log it as unretrieved.
+        if not task.cancelled():
+            task.exception()
+    return done
+
+
+metrics_registry.register(CounterFamily(
+    'waterbutler_singleflight_collapsed_total',
+    'Calls that joined an identical in-flight call instead of starting their own',
+    ('name', ),
+    callback=lambda: {(flight.name, ): flight.collapsed for flight in _flights},
+))
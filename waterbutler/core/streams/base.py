@@ -1,7 +1,7 @@
 import abc
 import asyncio
 
-from waterbutler.server.settings import CHUNK_SIZE
+from waterbutler.core.chunking import read_chunk
 
 
 class BaseStream(asyncio.StreamReader, metaclass=abc.ABCMeta):
@@ -26,7 +26,7 @@ class BaseStream(asyncio.StreamReader, metaclass=abc.ABCMeta):
     # TODO: Improve the BaseStream with `aiohttp.streams.AsyncStreamReaderMixin`
     async def __anext__(self):
         try:
-            chunk = await self.read(CHUNK_SIZE)
+            chunk = await read_chunk(self)
         except EOFError:
             raise StopAsyncIteration
         if chunk == b'':
@@ -93,7 +93,7 @@ class MultiStream(asyncio.StreamReader):
     # TODO: Improve the BaseStream with `aiohttp.streams.AsyncStreamReaderMixin`
     async def __anext__(self):
         try:
-            chunk = await self.read(CHUNK_SIZE)
+            chunk = await read_chunk(self)
         except EOFError:
             raise StopAsyncIteration
         if chunk == b'':
@@ -168,7 +168,7 @@ class CutoffStream(asyncio.StreamReader):
     # TODO: Improve the BaseStream with `aiohttp.streams.AsyncStreamReaderMixin`
     async def __anext__(self):
         try:
-            chunk = await self.read(CHUNK_SIZE)
+            chunk = await read_chunk(self)
         except EOFError:
             raise StopAsyncIteration
         if chunk == b'':
@@ -1,7 +1,7 @@
 import base64
 import asyncio
 
-from waterbutler.server.settings import CHUNK_SIZE
+from waterbutler.core.chunking import read_chunk
 
 
 class Base64EncodeStream(asyncio.StreamReader):
@@ -30,7 +30,7 @@ class Base64EncodeStream(asyncio.StreamReader):
     # TODO: Improve the BaseStream with `aiohttp.streams.AsyncStreamReaderMixin`
     async def __anext__(self):
         try:
-            chunk = await self.read(CHUNK_SIZE)
+            chunk = await read_chunk(self)
         except EOFError:
             raise StopAsyncIteration
         if chunk == b'':
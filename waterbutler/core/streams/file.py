@@ -1,17 +1,39 @@
+import io
 import os
 import asyncio
+import collections
+from concurrent.futures import ThreadPoolExecutor
 
+from waterbutler import settings
 from waterbutler.core.streams.base import BaseStream
 
+# Reads of local files are done here rather than on the event loop, see `FileStreamReader`
+file_executor = ThreadPoolExecutor(max_workers=settings.FILE_READ_WORKERS,
+                                   thread_name_prefix='file-stream')
+
 
 class FileStreamReader(BaseStream):
+    """Streams the contents of ``file_pointer`` from the beginning, whatever its position.
+
+    Binary files with a descriptor are read with ``os.pread`` on ``file_executor``, so a slow disk
+    or network mount never blocks the event loop.  Each read also queues up to
+    ``FILE_READ_AHEAD`` reads of the chunks after it, which are usually done by the time they're
+    asked for.  Other file objects, e.g. ``io.BytesIO`` or files opened in text mode, are read
+    inline.
+    """
 
     def __init__(self, file_pointer):
         super().__init__()
-        self.file_gen = None
         self.file_pointer = file_pointer
-        self.read_size = None
         self.content_type = 'application/octet-stream'
+        self.position = None  # offset of the next read, None until the first one
+        self.read_ahead = collections.deque()  # (offset, size, future) of the reads queued up
+        self.preadable = hasattr(os, 'pread') and 'b' in getattr(file_pointer, 'mode', '')
+        if self.preadable:
+            try:
+                file_pointer.fileno()
+            except (AttributeError, OSError, io.UnsupportedOperation):
+                self.preadable = False
 
     @property
     def size(self):
@@ -21,41 +43,114 @@ class FileStreamReader(BaseStream):
         self.file_pointer.seek(cursor)
         return ret
 
+    @property
+    def start(self):
+        return 0
+
     def close(self):
-        self.file_pointer.close()
+        # A read that's already running still needs the descriptor, so the file is closed when
+        # the last one is done
+        running = {future for _, _, future in self.read_ahead if not future.cancel()}
+        self.read_ahead.clear()
+
+        def close_when_done(future):
+            running.discard(future)
+            if not running:
+                self.file_pointer.close()
+
+        if running:
+            for future in list(running):
+                future.add_done_callback(close_when_done)
+        else:
+            self.file_pointer.close()
         self.feed_eof()
 
-    async def chunk_reader(self):
-        self.file_pointer.seek(0)
-        while True:
-            chunk = self.file_pointer.read(self.read_size)
-            if not chunk:
-                self.feed_eof()
-                yield b''
-
-            yield chunk
+    def file_range(self):
+        """Returns ``(file_pointer, offset, count)`` for the bytes this stream would read, so that
+        they can be sent without being read into Python, or None if they have to go through
+        ``read``: when readers or writers are teed off the stream, it has been read from, or the
+        file has no descriptor."""
+        if self.readers or self.writers or self.position is not None:
+            return None
+        try:
+            self.file_pointer.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return None
+        return self.file_pointer, 0, self.size
+
+    def _chunk_size(self, offset, size):
+        """How much of a read of ``size`` at ``offset`` to make.  The whole stream is read to the
+        end of the file, however long that turns out to be."""
+        if size < 0:
+            return max(os.fstat(self.file_pointer.fileno()).st_size - offset, 0)
+        return size
+
+    def _read_ahead_end(self):
+        """Offset that reads are not queued up past."""
+        return os.fstat(self.file_pointer.fileno()).st_size
+
+    def _pread(self, offset, size):
+        return file_executor.submit(os.pread, self.file_pointer.fileno(), size, offset)
 
     async def _read(self, size):
-        self.file_gen = self.file_gen or self.chunk_reader()
-        self.read_size = size
-        # add sleep of 0 so read will yield and continue in next io loop iteration
-        # asyncio.sleep(0) yields None by default, which displeases tornado
-        await asyncio.sleep(0.001)
-        async for chunk in self.file_gen:
-            return chunk
+        if self.position is None:
+            self.position = self.start
+            if self.preadable:
+                # reads go around the file object, so nothing may be left in its write buffer
+                self.file_pointer.flush()
+            else:
+                self.file_pointer.seek(self.position)
+
+        if self.preadable:
+            size = self._chunk_size(self.position, size)
+            chunk = await self._read_at(self.position, size) if size else b''
+        else:
+            # yield to the loop between chunks all the same
+            await asyncio.sleep(0)
+            chunk = self.file_pointer.read(size)
+
+        if not chunk:
+            self.feed_eof()
+            return b''
+        self.position += len(chunk)
+        return chunk
+
+    async def _read_at(self, offset, size):
+        if self.read_ahead and self.read_ahead[0][:2] == (offset, size):
+            future = self.read_ahead.popleft()[2]
+        else:
+            # reads of a different size, e.g. the last of a range, start the queue over
+            for _, _, queued in self.read_ahead:
+                queued.cancel()
+            self.read_ahead.clear()
+            future = self._pread(offset, size)
+
+        next_offset = self.read_ahead[-1][0] + size if self.read_ahead else offset + size
+        end = self._read_ahead_end()
+        while len(self.read_ahead) < settings.FILE_READ_AHEAD and next_offset < end:
+            next_size = self._chunk_size(next_offset, size)
+            self.read_ahead.append((next_offset, next_size, self._pread(next_offset, next_size)))
+            next_offset += next_size
+
+        return (await asyncio.wrap_future(future))
 
 
 class PartialFileStreamReader(FileStreamReader):
-    """Awful class, used to avoid messing with FileStreamReader.  Extends FSR with start and end
-    byte offsets to indicate a byte range of the file to return.  Reading from this stream will
-    only return the requested range, never data outside of it.
+    """Extends FSR with start and end byte offsets to indicate a byte range of the file to return.
+    Reading from this stream will only return the requested range, never data outside of it.
     """
 
     def __init__(self, file_pointer, byte_range):
         super().__init__(file_pointer)
-        self.start = byte_range[0]
-        self.end = byte_range[1]
-        self.bytes_read = 0
+        self.byte_range = byte_range
+
+    @property
+    def start(self):
+        return self.byte_range[0]
+
+    @property
+    def end(self):
+        return self.byte_range[1]
 
     @property
     def size(self):
@@ -77,23 +172,22 @@ class PartialFileStreamReader(FileStreamReader):
     def content_range(self):
         return 'bytes {}-{}/{}'.format(self.start, self.end, self.total_size)
 
-    async def chunk_reader(self):
-        self.file_pointer.seek(self.start)
-        while True:
-            chunk = self.file_pointer.read(self.read_size)
-            self.bytes_read += self.read_size
-            if not chunk:
-                self.feed_eof()
-                yield b''
+    def file_range(self):
+        file_range = super().file_range()
+        # a range running past the end of the file is short of the size it claims
+        if file_range is None or self.end >= self.total_size:
+            return None
+        return self.file_pointer, self.start, self.size
+
+    def _chunk_size(self, offset, size):
+        remaining = max(self.end + 1 - offset, 0)
+        return remaining if size < 0 else min(size, remaining)
 
-            yield chunk
+    def _read_ahead_end(self):
+        return self.end + 1
 
     async def _read(self, size):
-        self.file_gen = self.file_gen or self.chunk_reader()
-        bytes_remaining = self.size - self.bytes_read
-        self.read_size = bytes_remaining if size == -1 else min(size, bytes_remaining)
-        # add sleep of 0 so read will yield and continue in next io loop iteration
-        # asyncio.sleep(0) yields None by default, which displeases tornado
-        await asyncio.sleep(0.001)
-        async for chunk in self.file_gen:
-            return chunk
+        if not self.preadable:
+            # text files and the like are read inline, clamped to what's left of the range
+            size = self._chunk_size(self.start if self.position is None else self.position, size)
+        return (await super()._read(size))
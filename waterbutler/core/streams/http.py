@@ -1,6 +1,9 @@
 import uuid
 import asyncio
+import collections
 
+from waterbutler import settings
+from waterbutler.core import exceptions
 from waterbutler.core.streams.base import BaseStream, MultiStream, StringStream
 
 
@@ -173,6 +176,178 @@ class ResponseStreamReader(BaseStream):
         return chunk
 
 
+def _retrieve_exception(future):
+    # parts failing after their stream was abandoned would log 'exception was never retrieved'
+    if not future.cancelled():
+        future.exception()
+
+
+class RangedResponseStream(BaseStream):
+    """Reads an object of ``size`` bytes over several connections at once.  ``response`` is the
+    answer to a request for its first bytes, and is read as it arrives.  The rest is split into
+    ``part_size`` byte ranges, which are fetched with ``fetch((start, end))`` up to
+    ``concurrency`` at a time, read into memory, and handed out in order.  Each part has to come
+    back whole and with the ``ETag`` of the first response, else reading raises a DownloadError.
+    Parts fetched ahead by every stream of the process share ``PARALLEL_DOWNLOAD_MAX_BUFFER``
+    bytes.  A stream that finds no room for even its next part reads that part as it arrives, like
+    the first response, instead of buffering it.  Streams that aren't read to the end must be
+    closed, which cancels their parts and gives the bytes back.
+
+    :param response: the ``206`` response for the start of the object
+    :param fetch: coroutine function making the ranged ``GET`` for ``(start, end)``, inclusive
+    :param int size: size of the whole object
+    """
+
+    # bytes of the parts fetched ahead by every stream of the process
+    buffered = 0
+
+    def __init__(self, response, fetch, size, part_size=None, concurrency=None, name=None):
+        super().__init__()
+        self.response = response  # the part being read as it arrives, if any
+        # offset and bytes still expected of the part read as it arrives, None for the first one
+        self._part_start, self._remaining = None, None
+        self.fetch = fetch
+        self.part_size = part_size or settings.PARALLEL_DOWNLOAD_PART_SIZE
+        self.concurrency = concurrency or settings.PARALLEL_DOWNLOAD_CONCURRENCY
+        self.etag = response.headers.get('ETag')
+        # (size, task) of the parts after the one being read
+        self.parts = collections.deque()  # type: collections.deque
+        self._content_type = response.headers.get('Content-Type', 'application/octet-stream')
+        self._size = size
+        self._name = name
+        # 'bytes 0-<end>/<size>'
+        content_range = response.headers['Content-Range']
+        self._next_offset = int(content_range.partition('-')[2].partition('/')[0]) + 1
+        self._buffer = memoryview(b'')
+
+    @property
+    def partial(self):
+        return False
+
+    @property
+    def content_type(self):
+        return self._content_type
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def size(self):
+        return self._size
+
+    def close(self):
+        while self.parts:
+            part_size, part = self.parts.popleft()
+            part.cancel()
+            self._release(part_size)
+        if self.response is not None:
+            self.response.close()
+            self.response = None
+
+    async def _read(self, size):
+        if size >= 0:
+            return (await self._read_part(size))
+
+        chunks = []
+        chunk = await self._read_part(size)
+        while chunk:
+            chunks.append(chunk)
+            chunk = await self._read_part(size)
+        return b''.join(chunks)
+
+    async def _read_part(self, size):
+        """Read up to ``size`` bytes of the part being read, moving on to the next when it's
+        done, or all of it for a negative ``size``."""
+        self._fetch_parts()
+        while True:
+            if self.response is not None:
+                chunk = await self.response.content.read(size)
+                if chunk:
+                    if self._remaining is not None:
+                        self._remaining -= len(chunk)
+                    return chunk
+                await self.response.release()
+                self.response = None
+                if self._remaining:
+                    expected = self._next_offset - self._part_start
+                    self.close()
+                    raise exceptions.DownloadError(
+                        'Expected {} bytes at offset {} but got {}'.format(
+                            expected, self._part_start, expected - self._remaining),
+                        code=502
+                    )
+            elif self._buffer:
+                end = len(self._buffer) if size < 0 else size
+                chunk, self._buffer = self._buffer[:end].tobytes(), self._buffer[end:]
+                return chunk
+            elif self.parts:
+                part_size, part = self.parts.popleft()
+                try:
+                    self._buffer = memoryview(await part)
+                except BaseException:
+                    self.close()
+                    raise
+                finally:
+                    self._release(part_size)
+                self._fetch_parts()
+            elif self._next_offset < self._size:
+                # no room to buffer it, the next part is read as it arrives instead
+                end = min(self._next_offset + self.part_size, self._size) - 1
+                try:
+                    self.response = await self._open_part(self._next_offset, end)
+                except BaseException:
+                    self.close()
+                    raise
+                self._part_start, self._remaining = self._next_offset, end - self._next_offset + 1
+                self._next_offset = end + 1
+            else:
+                self.feed_eof()
+                return b''
+
+    def _fetch_parts(self):
+        while len(self.parts) < self.concurrency and self._next_offset < self._size:
+            end = min(self._next_offset + self.part_size, self._size) - 1
+            part_size = end - self._next_offset + 1
+            if RangedResponseStream.buffered + part_size > settings.PARALLEL_DOWNLOAD_MAX_BUFFER:
+                break
+            part = asyncio.ensure_future(self._fetch_part(self._next_offset, end))
+            part.add_done_callback(_retrieve_exception)
+            RangedResponseStream.buffered += part_size
+            self.parts.append((part_size, part))
+            self._next_offset = end + 1
+
+    @staticmethod
+    def _release(part_size):
+        RangedResponseStream.buffered -= part_size
+
+    async def _open_part(self, start, end):
+        """Make the request for the part from ``start`` to ``end`` and check it's the part of the
+        same object, returning the response with the body still to be read."""
+        response = await self.fetch((start, end))
+        if response.status != 206 or response.headers.get('ETag') != self.etag:
+            await response.release()
+            raise exceptions.DownloadError(
+                'The file changed while it was being downloaded', code=502
+            )
+        return response
+
+    async def _fetch_part(self, start, end):
+        response = await self._open_part(start, end)
+        try:
+            data = await response.read()
+        finally:
+            await response.release()
+
+        if len(data) != end - start + 1:
+            raise exceptions.DownloadError(
+                'Expected {} bytes at offset {} but got {}'.format(end - start + 1, start,
+                                                                   len(data)),
+                code=502
+            )
+        return data
+
+
 class RequestStreamReader(BaseStream):
 
     def __init__(self, request, inner):
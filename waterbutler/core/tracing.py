@@ -0,0 +1,124 @@
+import re
+import time
+import typing
+import functools
+from types import SimpleNamespace
+
+import aiohttp
+from yarl import URL
+
+from waterbutler import settings as wb_settings
+from waterbutler.core.metrics import HistogramFamily, metrics_registry
+
+# Path segments that identify a resource rather than an endpoint: numbers, hex digests, UUIDs and
+# long opaque ids (Drive, Box, Dropbox ...).  Segments that look like file names are also treated
+# as ids, since WebDAV and S3 put the user's file path straight into the URL.
+ID_SEGMENT_RE = re.compile(
+    r'^(\d+|[0-9a-f]{16,}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
+    r'|[\w-]{20,}|.*[.%@:=~ ].*)$',
+    re.IGNORECASE,
+)
+
+OVERFLOW_ENDPOINT = 'other'
+
+upstream_latency = metrics_registry.register(HistogramFamily(
+    'waterbutler_upstream_phase_seconds',
+    'Time spent in each phase of upstream requests made by providers',
+    ('provider', 'method', 'endpoint', 'phase'),
+))
+
+
+class EndpointNormalizer:
+    """Turns request URLs into low-cardinality endpoint templates such as
+    ``www.googleapis.com/drive/v2/files/{id}``.  Each provider may produce at most ``max_endpoints``
+    distinct templates, anything beyond that is reported as ``other`` so a provider with unusual
+    URLs cannot blow up the number of histograms.
+
+    :param int max_endpoints: max templates per provider
+    :param int max_depth: path segments kept, deeper paths are truncated to ``.../...``
+    """
+
+    def __init__(self, max_endpoints: int=50, max_depth: int=5) -> None:
+        self.max_endpoints = max_endpoints
+        self.max_depth = max_depth
+        self._seen = {}  # type: typing.Dict[str, typing.Set[str]]
+
+    def template(self, provider: str, url: typing.Union[str, URL]) -> str:
+        url = url if isinstance(url, URL) else URL(str(url))
+        segments = ['{id}' if ID_SEGMENT_RE.match(segment) else segment
+                    for segment in url.path.split('/') if segment]
+        if len(segments) > self.max_depth:
+            segments = segments[:self.max_depth] + ['...']
+        endpoint = '/'.join([url.host or ''] + segments)
+
+        seen = self._seen.setdefault(provider, set())
+        if endpoint not in seen:
+            if len(seen) >= self.max_endpoints:
+                return OVERFLOW_ENDPOINT
+            seen.add(endpoint)
+        return endpoint
+
+    def clear(self) -> None:
+        self._seen.clear()
+
+
+endpoint_normalizer = EndpointNormalizer(max_endpoints=wb_settings.TRACE_MAX_ENDPOINTS)
+
+
+def _labels(ctx: SimpleNamespace) -> typing.Tuple[str, str, str]:
+    return ctx.provider, ctx.method, ctx.endpoint
+
+
+async def on_request_start(session, ctx, params):
+    request_ctx = ctx.trace_request_ctx or {}
+    ctx.provider = request_ctx.get('provider', 'unknown')
+    ctx.method = params.method
+    ctx.endpoint = endpoint_normalizer.template(ctx.provider, params.url)
+    ctx.start = time.monotonic()
+
+
+async def on_dns_resolvehost_start(session, ctx, params):
+    ctx.dns_start = time.monotonic()
+
+
+async def on_dns_resolvehost_end(session, ctx, params):
+    upstream_latency.observe(time.monotonic() - ctx.dns_start, *_labels(ctx), 'dns')
+
+
+async def on_connection_create_start(session, ctx, params):
+    ctx.connect_start = time.monotonic()
+
+
+async def on_connection_create_end(session, ctx, params):
+    # aiohttp has no separate TLS hook, so for https this is TCP connect plus TLS handshake
+    upstream_latency.observe(time.monotonic() - ctx.connect_start, *_labels(ctx), 'connect')
+
+
+async def on_request_end(session, ctx, params):
+    headers_at = time.monotonic()
+    upstream_latency.observe(headers_at - ctx.start, *_labels(ctx), 'ttfb')
+    # Response bodies are usually streamed on to the WB client long after this hook fires.  The
+    # content's eof callback runs once the last byte has been received from the upstream.
+    params.response.content.on_eof(functools.partial(_on_body_end, ctx, headers_at))
+
+
+def _on_body_end(ctx, headers_at):
+    now = time.monotonic()
+    upstream_latency.observe(now - headers_at, *_labels(ctx), 'body')
+    upstream_latency.observe(now - ctx.start, *_labels(ctx), 'total')
+
+
+def make_trace_config() -> aiohttp.TraceConfig:
+    """Build a :class:`aiohttp.TraceConfig` recording the DNS, connect, time to first byte, body
+    transfer and total time of every request into ``upstream_latency``.  Requests are labeled with
+    the provider given in ``trace_request_ctx={'provider': ...}``, the HTTP method and the endpoint
+    template from ``endpoint_normalizer``.
+    """
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+    trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+    trace_config.on_connection_create_start.append(on_connection_create_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_request_end.append(on_request_end)
+    return trace_config
@@ -2,6 +2,7 @@ import re
 import json
 import pytz
 import asyncio
+import datetime
 import logging
 import functools
 import unicodedata
@@ -9,13 +10,13 @@ import dateutil.parser
 from urllib import parse
 # from concurrent.futures import ProcessPoolExecutor  TODO Get this working
 
-import aiohttp
 import sentry_sdk
-from stevedore import driver
 
 from waterbutler.core import exceptions
 from waterbutler.core.signing import Signer
+from waterbutler.core.sessions import session_pool
 from waterbutler.core.streams import EmptyStream
+from waterbutler.core.registry import provider_registry, provider_pool
 from waterbutler.server import settings as server_settings
 
 logger = logging.getLogger(__name__)
@@ -26,6 +27,10 @@ signer = Signer(server_settings.HMAC_SECRET, server_settings.HMAC_ALGORITHM)
 def make_provider(name: str, auth: dict, credentials: dict, settings: dict, **kwargs):
     r"""Returns an instance of :class:`waterbutler.core.provider.BaseProvider`
 
+    Provider classes come from ``provider_registry``.  If ``provider_pool`` is enabled, an idle
+    instance built for the same arguments is reused when there is one.  Instances built for celery
+    tasks are never pooled.
+
     :param str name: The name of the provider to instantiate. (s3, box, etc)
     :param dict auth:
     :param dict credentials:
@@ -34,18 +39,17 @@ def make_provider(name: str, auth: dict, credentials: dict, settings: dict, **kw
 
     :rtype: :class:`waterbutler.core.provider.BaseProvider`
     """
-    try:
-        manager = driver.DriverManager(
-            namespace='waterbutler.providers',
-            name=name,
-            invoke_on_load=True,
-            invoke_args=(auth, credentials, settings),
-            invoke_kwds=kwargs,
-        )
-    except RuntimeError:
-        raise exceptions.ProviderNotFound(name)
+    pooled = provider_pool.enabled and not kwargs.get('is_celery_task', False)
+    if pooled:
+        key = provider_pool.key(name, auth, credentials, settings, **kwargs)
+        provider = provider_pool.acquire(key)
+        if provider is not None:
+            return provider
 
-    return manager.driver
+    provider = provider_registry.get(name)(auth, credentials, settings, **kwargs)
+    if pooled:
+        provider_pool.track(provider, key)
+    return provider
 
 
 def as_task(func):
@@ -105,22 +109,49 @@ async def send_signed_request(method, url, payload):
 
     message, signature = signer.sign_payload(payload)
 
-    async with aiohttp.request(
+    async with session_pool.get(url).request(
             method,
             url,
             data=json.dumps({
                 'payload': message.decode(),
                 'signature': signature,
             }),
-            headers={'Content-Type': 'application/json'}
+            headers={'Content-Type': 'application/json'},
+            trace_request_ctx={'provider': 'osf_callback'},
     ) as response:
         return response.status, await response.read()
 
 
+# 2017-04-18T18:30:01.123Z, 2014-05-12 13:40:05-07:00 ...
+ISO_8601_RE = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})(?:\.\d+)?'
+    r'(?:(Z)|([+-])(\d{2}):?(\d{2}))?'
+)
+
+
+def _parse_iso_8601(date_string):
+    match = ISO_8601_RE.fullmatch(date_string)
+    if match is None:
+        return None
+    year, month, day, hour, minute, second, zulu, sign, tz_hours, tz_minutes = match.groups()
+    try:
+        tzinfo = None
+        if sign is not None:
+            offset = datetime.timedelta(hours=int(tz_hours), minutes=int(tz_minutes))
+            tzinfo = datetime.timezone(-offset if sign == '-' else offset)
+        elif zulu is not None:
+            tzinfo = datetime.timezone.utc
+        return datetime.datetime(int(year), int(month), int(day), int(hour), int(minute),
+                                 int(second), tzinfo=tzinfo)
+    except ValueError:  # out of range, leave it to dateutil
+        return None
+
+
 def normalize_datetime(date_string):
     if date_string is None:
         return None
-    parsed_datetime = dateutil.parser.parse(date_string)
+    # Most providers send ISO 8601, which is parsed without dateutil's much slower generic parser.
+    parsed_datetime = _parse_iso_8601(date_string) or dateutil.parser.parse(date_string)
     if not parsed_datetime.tzinfo:
         parsed_datetime = parsed_datetime.replace(tzinfo=pytz.UTC)
     parsed_datetime = parsed_datetime.astimezone(tz=pytz.UTC)
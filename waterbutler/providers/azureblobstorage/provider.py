@@ -191,7 +191,8 @@ class AzureBlobStorageProvider(provider.BaseProvider):
         """
         :param str path: Path to the key you want to download
         :param dict \*\*kwargs: Additional arguments that are ignored
-        :rtype: :class:`waterbutler.core.streams.ResponseStreamReader`
+        :rtype: :class:`waterbutler.core.streams.ResponseStreamReader` or
+            :class:`waterbutler.core.streams.RangedResponseStream`
         :raises: :class:`waterbutler.core.exceptions.DownloadError`
         """
 
@@ -201,14 +202,16 @@ class AzureBlobStorageProvider(provider.BaseProvider):
         assert not path.path.startswith('/')
         urls = functools.partial(self.generate_urls, path.path, secondary=True)
 
-        resp = await self.make_signed_request(
-            'GET',
-            urls,
-            expects=(200, ),
-            throws=exceptions.MetadataError,
-        )
+        async def fetch(byte_range):
+            return await self.make_signed_request(
+                'GET',
+                urls,
+                range=byte_range,
+                expects=(200, 206, ),
+                throws=exceptions.MetadataError,
+            )
 
-        return streams.ResponseStreamReader(resp)
+        return await self.ranged_download(fetch, range=range)
 
     async def upload(self, stream, path, conflict='replace', block_id_prefix=None, **kwargs):
         """Uploads the given stream to Azure Blob Storage
@@ -5,7 +5,7 @@ import logging
 import tempfile
 from asyncio import sleep
 from http import HTTPStatus
-from typing import List, Tuple, Union
+from typing import List, Optional, Tuple, Union
 
 import aiohttp
 
@@ -180,6 +180,9 @@ class BoxProvider(provider.BaseProvider):
 
         return base.child(name, _id=_id, folder=folder)
 
+    async def child_path(self, parent, child):
+        return self.path_from_metadata(parent, child)
+
     def can_duplicate_names(self)-> bool:
         return False
 
@@ -350,6 +353,23 @@ class BoxProvider(provider.BaseProvider):
             return await self._get_file_meta(path, revision=revision, raw=raw)
         return await self._get_folder_meta(path, raw=raw, folder=folder)
 
+    async def folder_validator(self, path: WaterButlerPath, **kwargs) -> Optional[str]:
+        """Box updates a folder's ``content_modified_at`` whenever an item in it changes.  It's null
+        for some folders, such as the root, which can't be revalidated."""
+        if path.identifier is None:
+            return None
+
+        response = await self.make_request(
+            'GET',
+            self.build_url('folders', path.identifier, fields='etag,content_modified_at'),
+            expects=(200, ),
+            throws=exceptions.MetadataError,
+        )
+        data = await response.json()
+        if data.get('content_modified_at') is None:
+            return None
+        return '{}:{}'.format(data.get('etag'), data['content_modified_at'])
+
     async def revisions(self, path: WaterButlerPath, **kwargs) -> List[BoxRevision]:
         # from https://developers.box.com/docs/#files-view-versions-of-a-file :
         # Alert: Versions are only tracked for Box users with premium accounts.
@@ -462,6 +482,38 @@ class BoxProvider(provider.BaseProvider):
         self.metrics.add('metadata.folder.pages', page_total)
         return full_resp
 
+    async def metadata_page(self,  # type: ignore
+                            path: WaterButlerPath,
+                            page_size: int,
+                            cursor: str=None,
+                            **kwargs) -> Tuple[List[BaseBoxMetadata], Optional[str]]:
+        """Pages are Box's own, the cursor is the offset of the page."""
+        if path.identifier is None:
+            raise exceptions.MetadataError('{} not found'.format(str(path)), code=404)
+        try:
+            offset = int(cursor or 0)
+        except ValueError:
+            offset = -1
+        if offset < 0:
+            raise exceptions.InvalidParameters('Invalid cursor: {}'.format(cursor))
+
+        response = await self.make_request(
+            'GET',
+            self.build_url('folders', path.identifier, 'items',
+                           fields='id,name,size,modified_at,etag,total_count',
+                           offset=offset, limit=page_size),
+            expects=(200, ),
+            throws=exceptions.MetadataError,
+        )
+        resp_json = await response.json()
+        page = [
+            self._serialize_item(each, path.child(each['name'], folder=(each['type'] == 'folder')))
+            for each in resp_json['entries']
+        ]
+        if offset + page_size < resp_json['total_count']:
+            return page, str(offset + page_size)
+        return page, None
+
     def _serialize_item(self, item: dict,
                         path: WaterButlerPath) -> Union[BoxFileMetadata, BoxFolderMetadata]:
         if item['type'] == 'folder':
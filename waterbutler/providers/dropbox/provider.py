@@ -547,6 +547,29 @@ class DropboxProvider(provider.BaseProvider):
 
         return DropboxFileMetadata(data, self.folder, self.NAME)
 
+    async def metadata_page(self,  # type: ignore
+                            path: WaterButlerPath,
+                            page_size: int,
+                            cursor: str=None,
+                            **kwargs) \
+                            -> typing.Tuple[typing.List[BaseDropboxMetadata], typing.Optional[str]]:
+        """Pages are Dropbox's own, the cursor is its ``list_folder`` cursor.  A cursor remembers
+        the limit of the listing it came from, and Dropbox treats the limit as approximate."""
+        if cursor is None:
+            url = self.build_url('files', 'list_folder')
+            body = {'path': path.full_path.rstrip('/'), 'limit': page_size}
+        else:
+            url = self.build_url('files', 'list_folder', 'continue')
+            body = {'cursor': cursor}
+
+        data = await self.dropbox_request(url, body, throws=core_exceptions.MetadataError)
+        page = [
+            DropboxFolderMetadata(entry, self.folder, self.NAME) if entry['.tag'] == 'folder'
+            else DropboxFileMetadata(entry, self.folder, self.NAME)
+            for entry in data['entries']
+        ]  # type: typing.List[BaseDropboxMetadata]
+        return page, data['cursor'] if data['has_more'] else None
+
     async def revisions(self, path: WaterButlerPath, **kwargs) -> typing.List[DropboxRevision]:
         # Dropbox v2 API limits the number of revisions returned to a maximum
         # of 100, default 10. Previously we had set the limit to 250.
@@ -115,6 +115,12 @@ class FileSystemProvider(provider.BaseProvider):
             metadata = self._metadata_file(path)
             return FileSystemFileMetadata(metadata, self.folder)
 
+    async def child_names(self, folder):
+        try:
+            return set(os.listdir(folder.full_path))
+        except OSError:
+            return None
+
     def _metadata_file(self, path, file_name=''):
         full_path = path.full_path if file_name == '' else os.path.join(path.full_path, file_name)
         modified = datetime.datetime.utcfromtimestamp(os.path.getmtime(full_path)).replace(tzinfo=datetime.timezone.utc)
@@ -4,11 +4,12 @@ import hashlib
 import functools
 from urllib import parse
 from http import HTTPStatus
-from typing import List, Sequence, Tuple, Union
+from typing import List, Optional, Sequence, Tuple, Union
 
 import furl
 
 from waterbutler.core import exceptions, provider, streams
+from waterbutler.core.cache import path_id_cache
 from waterbutler.core.path import WaterButlerPath, WaterButlerPathPart
 
 from waterbutler.providers.googledrive import utils
@@ -72,6 +73,7 @@ class GoogleDriveProvider(provider.BaseProvider):
     """
     NAME = 'googledrive'
     BASE_URL = pd_settings.BASE_URL
+    RATE_LIMIT = (pd_settings.RATE_LIMIT, pd_settings.RATE_LIMIT_BURST)
     FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
 
     # https://developers.google.com/drive/v2/web/about-permissions#roles
@@ -126,6 +128,9 @@ class GoogleDriveProvider(provider.BaseProvider):
         _id, name, mime = list(map(parts[-1].__getitem__, ('id', 'title', 'mimeType')))
         return base.child(name, _id=_id, folder='folder' in mime)
 
+    async def child_path(self, parent, child):
+        return self.path_from_metadata(parent, child)
+
     def can_duplicate_names(self) -> bool:
         return True
 
@@ -164,6 +169,7 @@ class GoogleDriveProvider(provider.BaseProvider):
             throws=exceptions.IntraMoveError,
         )
         data = await resp.json()
+        path_id_cache.forget(self, src_path.identifier)
 
         created = dest_path.identifier is None
         dest_path.parts[-1]._id = data['id']
@@ -312,6 +318,7 @@ class GoogleDriveProvider(provider.BaseProvider):
             expects=(200, ),
             throws=exceptions.DeleteError,
         )
+        path_id_cache.forget(self, path.identifier)
         return
 
     def _build_query(self, folder_id: str, title: str=None) -> str:
@@ -339,6 +346,27 @@ class GoogleDriveProvider(provider.BaseProvider):
 
         return await self._file_metadata(path, revision=revision, raw=raw)
 
+    async def probe(self, path: GoogleDrivePath, **kwargs) -> bool:  # type: ignore
+        """A path that didn't resolve to an id doesn't exist.  One that did is confirmed with a
+        single lookup of the id rather than a listing of the folder's children, as the id may have
+        come from the path id cache."""
+        if path.identifier is None:
+            return False
+        if path.is_root:
+            return True
+
+        resp = await self.make_request(
+            'GET',
+            self.build_url('files', path.identifier, fields='labels(trashed)'),
+            expects=(200, 404, ),
+            throws=exceptions.MetadataError,
+        )
+        if resp.status == 404:
+            await resp.release()
+            return False
+        data = await resp.json()
+        return not data.get('labels', {}).get('trashed', False)
+
     async def revisions(self, path: GoogleDrivePath,  # type: ignore
                         **kwargs) -> List[GoogleDriveRevision]:
         """Returns list of revisions for the file at ``path``.
@@ -488,8 +516,9 @@ class GoogleDriveProvider(provider.BaseProvider):
             current_part = parts.pop(0)
             part_name, part_is_folder = current_part[0], current_part[1]
             name, ext = os.path.splitext(part_name)
+            kind = 'folder' if part_is_folder else 'file'
             if not part_is_folder and ext in ('.gdoc', '.gdraw', '.gslides', '.gsheet'):
-                gd_ext = utils.get_mimetype_from_ext(ext)
+                kind = gd_ext = utils.get_mimetype_from_ext(ext)
                 query = "title = '{}' " \
                         "and trashed = false " \
                         "and mimeType = '{}'".format(clean_query(name), gd_ext)
@@ -507,6 +536,14 @@ class GoogleDriveProvider(provider.BaseProvider):
                             '=' if part_is_folder else '!=',
                             self.FOLDER_MIME_TYPE
                         )
+
+            parent_id = item_id
+            item = path_id_cache.lookup(self, parent_id, part_name, kind)
+            if item is not None:
+                item_id = item['id']
+                ret.append(item)
+                continue
+
             resp = await self.make_request(
                 'GET',
                 self.build_url('files', item_id, 'children', q=query, fields='items(id)'),
@@ -534,7 +571,9 @@ class GoogleDriveProvider(provider.BaseProvider):
                 expects=(200, ),
                 throws=exceptions.MetadataError,
             )
-            ret.append(await resp.json())
+            item = await resp.json()
+            path_id_cache.store(self, parent_id, part_name, kind, item_id, item)
+            ret.append(item)
         return ret
 
     async def _handle_docs_versioning(self, path: GoogleDrivePath, item: dict, raw: bool=True):
@@ -598,6 +637,32 @@ class GoogleDriveProvider(provider.BaseProvider):
             built_url = resp_json.get('nextLink', None)
         return full_resp
 
+    async def metadata_page(self,  # type: ignore
+                            path: GoogleDrivePath,
+                            page_size: int,
+                            cursor: str=None,
+                            raw: bool=False,
+                            **kwargs) -> Tuple[List[Union[BaseGoogleDriveMetadata, dict]],
+                                               Optional[str]]:
+        """Pages are Drive's own, the cursor is its page token."""
+        if path.identifier is None:
+            raise exceptions.MetadataError('{} not found'.format(str(path)), code=404)
+
+        query = {'q': self._build_query(path.identifier), 'alt': 'json', 'maxResults': page_size}
+        if cursor is not None:
+            query['pageToken'] = cursor
+        resp = await self.make_request(
+            'GET',
+            self.build_url('files', **query),
+            expects=(200, ),
+            throws=exceptions.MetadataError,
+        )
+        resp_json = await resp.json()
+        return [
+            self._serialize_item(path.child(item['title']), item, raw=raw)
+            for item in resp_json['items']
+        ], resp_json.get('nextPageToken')
+
     async def _file_metadata(self,
                              path: GoogleDrivePath,
                              revision: str=None,
@@ -706,3 +771,4 @@ class GoogleDriveProvider(provider.BaseProvider):
                 headers={'Content-Type': 'application/json'},
                 expects=(200, ),
                 throws=exceptions.DeleteError)
+        path_id_cache.forget(self, file_id)
@@ -6,3 +6,7 @@ config = settings.child('GOOGLEDRIVE_PROVIDER_CONFIG')
 BASE_URL = config.get('BASE_URL', 'https://www.googleapis.com/drive/v2')
 BASE_UPLOAD_URL = config.get('BASE_UPLOAD_URL', 'https://www.googleapis.com/upload/drive/v2')
 DRIVE_IGNORE_VERSION = config.get('DRIVE_IGNORE_VERSION', '0000000000000000000000000000000000000')
+
+# Drive's default per-user quota is 1000 queries per 100 seconds.
+RATE_LIMIT = float(config.get('RATE_LIMIT', 10))  # requests per second
+RATE_LIMIT_BURST = float(config.get('RATE_LIMIT_BURST', 20))
@@ -13,6 +13,7 @@ from waterbutler.core import streams
 from waterbutler.core import provider
 from waterbutler.core import exceptions
 from waterbutler.core import path as wb_path
+from waterbutler.core.cache import path_id_cache
 from waterbutler.core.path import WaterButlerPath
 
 from waterbutler.providers.iqbrims import settings
@@ -79,6 +80,7 @@ class IQBRIMSProvider(provider.BaseProvider):
     """
     NAME = 'iqbrims'
     BASE_URL = settings.BASE_URL
+    RATE_LIMIT = (settings.RATE_LIMIT, settings.RATE_LIMIT_BURST)
     FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
 
     # https://developers.google.com/drive/v2/web/about-permissions#roles
@@ -134,6 +136,9 @@ class IQBRIMSProvider(provider.BaseProvider):
         _id, name, mime = list(map(parts[-1].__getitem__, ('id', 'title', 'mimeType')))
         return base.child(name, _id=_id, folder='folder' in mime)
 
+    async def child_path(self, parent, child):
+        return self.path_from_metadata(parent, child)
+
     @property
     def default_headers(self) -> dict:
         return {'authorization': 'Bearer {}'.format(self.token)}
@@ -330,6 +335,7 @@ class IQBRIMSProvider(provider.BaseProvider):
             expects=(200, ),
             throws=exceptions.DeleteError,
         ):
+            path_id_cache.forget(self, path.identifier)
             return
 
     async def move(self, *args, **kwargs):
@@ -437,8 +443,9 @@ class IQBRIMSProvider(provider.BaseProvider):
             current_part = parts.pop(0)
             part_name, part_is_folder = current_part[0], current_part[1]
             name, ext = os.path.splitext(part_name)
+            kind = 'folder' if part_is_folder else 'file'
             if not part_is_folder and ext in ('.gdoc', '.gdraw', '.gslides', '.gsheet'):
-                gd_ext = drive_utils.get_mimetype_from_ext(ext)
+                kind = gd_ext = drive_utils.get_mimetype_from_ext(ext)
                 query = "title = '{}' " \
                         "and trashed = false " \
                         "and mimeType = '{}'".format(clean_query(name), gd_ext)
@@ -456,6 +463,14 @@ class IQBRIMSProvider(provider.BaseProvider):
                             '=' if part_is_folder else '!=',
                             self.FOLDER_MIME_TYPE
                         )
+
+            parent_id = item_id
+            item = path_id_cache.lookup(self, parent_id, part_name, kind)
+            if item is not None:
+                item_id = item['id']
+                ret.append(item)
+                continue
+
             async with self.request(
                 'GET',
                 self.build_url('files', item_id, 'children', q=query, fields='items(id)'),
@@ -483,7 +498,9 @@ class IQBRIMSProvider(provider.BaseProvider):
                 expects=(200, ),
                 throws=exceptions.MetadataError,
             ) as resp:
-                ret.append(await resp.json())
+                item = await resp.json()
+            path_id_cache.store(self, parent_id, part_name, kind, item_id, item)
+            ret.append(item)
         return ret
 
     def _test_permissions(self, path):
@@ -663,3 +680,4 @@ class IQBRIMSProvider(provider.BaseProvider):
                 headers={'Content-Type': 'application/json'},
                 expects=(200, ),
                 throws=exceptions.DeleteError)
+        path_id_cache.forget(self, file_id)
@@ -223,6 +223,9 @@ class OneDriveProvider(provider.BaseProvider):
 
         return base.child(path, _id=child_id, folder=folder)
 
+    async def child_path(self, parent, child):
+        return self.path_from_metadata(parent, child)
+
     async def metadata(self, path: OneDrivePath, **kwargs):  # type: ignore
         """Fetch metadata for the file or folder identified by ``path``.
 
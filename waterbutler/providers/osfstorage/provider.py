@@ -124,6 +124,9 @@ class OSFStorageProvider(provider.BaseProvider):
         except StopIteration:
             return base.child(path, folder=folder)
 
+    async def child_path(self, parent, child):
+        return self.path_from_metadata(parent, child)
+
     async def get_quota(self):
         """Get the quota information
 
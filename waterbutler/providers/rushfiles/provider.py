@@ -7,6 +7,7 @@ from typing import List, Tuple, Union
 
 from waterbutler.core import provider, streams
 from waterbutler.core.path import WaterButlerPath
+from waterbutler.core.cache import path_id_cache
 from waterbutler.core import exceptions
 
 from waterbutler.providers.rushfiles import settings
@@ -70,23 +71,32 @@ class RushFilesProvider(provider.BaseProvider):
         current_inter_id = self.share['id']
 
         for i, child in enumerate(children_path_list):
-            response = await self.make_request(
-                'GET',
-                self._build_clientgateway_url(str(self.share['id']), 'virtualfiles', str(current_inter_id), 'children'),
-                expects=(200, 404,),
-                throws=exceptions.MetadataError,
-            )
-            if response.status == 404:
-                raise exceptions.NotFoundError(path)
-            res = await response.json()
-            current_inter_id, index = self._search_inter_id(res, child)
+            parent_inter_id = current_inter_id
+            cached = path_id_cache.lookup(self, parent_inter_id, child)
+            if cached is not None:
+                current_inter_id, is_file = cached['id'], cached['is_file']
+            else:
+                response = await self.make_request(
+                    'GET',
+                    self._build_clientgateway_url(str(self.share['id']), 'virtualfiles', str(current_inter_id), 'children'),
+                    expects=(200, 404,),
+                    throws=exceptions.MetadataError,
+                )
+                if response.status == 404:
+                    raise exceptions.NotFoundError(path)
+                res = await response.json()
+                current_inter_id, index = self._search_inter_id(res, child)
+                if current_inter_id:
+                    is_file = res['Data'][index]['IsFile']
+                    path_id_cache.store(self, parent_inter_id, child, None, current_inter_id,
+                                        {'id': current_inter_id, 'is_file': is_file})
             inter_id_list.append(current_inter_id)
             if not current_inter_id:
                 if i == len(children_path_list) - 1:
                     return RushFilesPath(path, _ids=inter_id_list)
                 raise exceptions.NotFoundError(path)
 
-        if res['Data'][index]['IsFile'] == is_folder:
+        if is_file == is_folder:
             raise exceptions.NotFoundError(path)
 
         return RushFilesPath(path, folder=is_folder, _ids=inter_id_list)
@@ -112,6 +122,9 @@ class RushFilesProvider(provider.BaseProvider):
 
         return base.child(name, _id=child_id, folder=folder)
 
+    async def child_path(self, parent, child):
+        return self.path_from_metadata(parent, child)
+
     def can_duplicate_names(self) -> bool:
         return False
 
@@ -162,6 +175,7 @@ class RushFilesProvider(provider.BaseProvider):
         ) as response:
             resp = await response.json()
             data = resp['Data']['ClientJournalEvent']['RfVirtualFile']
+        path_id_cache.forget(self, src_path.identifier)
 
         created = dest_path.identifier is None
         dest_path.parts[-1]._id = data['InternalName']
@@ -355,6 +369,7 @@ class RushFilesProvider(provider.BaseProvider):
         if response.status == 400 or response.status == 404:
             raise exceptions.NotFoundError(str(path))
 
+        path_id_cache.forget(self, path.identifier)
         return
 
     async def metadata(self,  # type: ignore
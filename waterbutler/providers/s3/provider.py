@@ -143,7 +143,8 @@ class S3Provider(provider.BaseProvider):
 
         :param str path: Path to the key you want to download
         :param dict \*\*kwargs: Additional arguments that are ignored
-        :rtype: :class:`waterbutler.core.streams.ResponseStreamReader`
+        :rtype: :class:`waterbutler.core.streams.ResponseStreamReader` or
+            :class:`waterbutler.core.streams.RangedResponseStream`
         :raises: :class:`waterbutler.core.exceptions.DownloadError`
         """
 
@@ -172,15 +173,16 @@ class S3Provider(provider.BaseProvider):
         if accept_url:
             return url()
 
-        resp = await self.make_request(
-            'GET',
-            url,
-            range=range,
-            expects=(200, 206, ),
-            throws=exceptions.DownloadError,
-        )
+        async def fetch(byte_range):
+            return await self.make_request(
+                'GET',
+                url,
+                range=byte_range,
+                expects=(200, 206, ),
+                throws=exceptions.DownloadError,
+            )
 
-        return streams.ResponseStreamReader(resp)
+        return await self.ranged_download(fetch, range=range)
 
     async def upload(self, stream, path, conflict='replace', **kwargs):
         """Uploads the given stream to S3
@@ -643,6 +645,88 @@ class S3Provider(provider.BaseProvider):
 
         return (await self._metadata_file(path, revision=revision))
 
+    async def metadata_page(self, path, page_size, cursor=None, **kwargs):
+        """Pages are bucket listings, the cursor is the listing's marker.  S3 counts common prefixes
+        as keys and a folder's own marker key is left out, so a page may come up one short."""
+        items = await self._metadata_folder(path, next_token=cursor, max_keys=page_size)
+        if items and isinstance(items[-1], str):
+            return items[:-1], items[-1]
+        return items, None
+
+    async def walk(self, path, max_depth=None, **kwargs):
+        """Without a delimiter a bucket listing returns every key under a prefix, so the tree is
+        listed a page at a time with no request per folder.  Folders that exist only as prefixes
+        of deeper keys are filled in as they first appear.  S3 can't stop at a depth, so with
+        ``max_depth`` deeper keys are still listed, just not yielded."""
+        await self._check_region()
+
+        prefix = path.path
+        seen = set()
+        marker = None
+        while True:
+            params = {'prefix': prefix, 'max-keys': '1000'}
+            if marker is not None:
+                params['marker'] = marker
+            resp = await self.make_request(
+                'GET',
+                functools.partial(self.bucket.generate_url, settings.TEMP_URL_SECS, 'GET', query_parameters=params),
+                params=params,
+                expects=(200, ),
+                throws=exceptions.MetadataError,
+            )
+            parsed = xmltodict.parse(await resp.read(), strip_whitespace=False)['ListBucketResult']
+
+            contents = parsed.get('Contents', [])
+            if isinstance(contents, dict):
+                contents = [contents]
+
+            items = []
+            for content in contents:
+                # 'A/B/c.txt' -> ['A', 'B', 'c.txt'], the folder key 'A/B/' -> ['A', 'B', '']
+                parts = content['Key'][len(prefix):].split('/')
+                for depth in range(1, len(parts)):
+                    folder = prefix + '/'.join(parts[:depth]) + '/'
+                    if folder in seen or (max_depth is not None and depth > max_depth):
+                        continue
+                    seen.add(folder)
+                    if folder == content['Key']:
+                        items.append(S3FolderKeyMetadata(content))
+                    else:
+                        items.append(S3FolderMetadata({'Prefix': folder}))
+                if parts[-1] and (max_depth is None or len(parts) <= max_depth):
+                    items.append(S3FileMetadata(content))
+            yield items
+
+            if parsed.get('IsTruncated') != 'true' or not contents:
+                break
+            # NextMarker is only sent for listings with a delimiter
+            marker = parsed.get('NextMarker') or contents[-1]['Key']
+
+    async def probe(self, path, **kwargs):
+        """A folder exists if any key starts with its prefix, its own marker key included, so a
+        one key listing is enough to tell.  Files are checked with a HEAD, as for metadata."""
+        if not path.is_dir:
+            return await super().probe(path, **kwargs)
+        if path.is_root:
+            return True
+
+        await self._check_region()
+
+        params = {'prefix': path.path, 'max-keys': '1'}
+        resp = await self.make_request(
+            'GET',
+            functools.partial(self.bucket.generate_url, settings.TEMP_URL_SECS, 'GET', query_parameters=params),
+            params=params,
+            expects=(200, 404, ),
+            throws=exceptions.MetadataError,
+        )
+        if resp.status == 404:
+            await resp.release()
+            return False
+        contents = await resp.read()
+        parsed = xmltodict.parse(contents, strip_whitespace=False)['ListBucketResult']
+        return bool(parsed.get('Contents'))
+
     def handle_data(self, data):
         token = None
         if not isinstance(data, S3FileMetadataHeaders):
@@ -659,7 +743,7 @@ class S3Provider(provider.BaseProvider):
         WaterButlerPath.validate_folder(path)
 
         if folder_precheck:
-            if (await self.exists(path)):
+            if (await self.probe(path)):
                 raise exceptions.FolderNamingConflict(path.name)
 
         await self.make_request(
@@ -691,10 +775,10 @@ class S3Provider(provider.BaseProvider):
         await resp.release()
         return S3FileMetadataHeaders(path.path, resp.headers)
 
-    async def _metadata_folder(self, path, next_token=None):
+    async def _metadata_folder(self, path, next_token=None, max_keys=1000):
         await self._check_region()
 
-        params = {'prefix': path.path, 'delimiter': '/', 'max-keys': '1000'}
+        params = {'prefix': path.path, 'delimiter': '/', 'max-keys': str(max_keys)}
         if next_token is not None:
             params['marker'] = next_token
 
@@ -212,7 +212,8 @@ class S3CompatProvider(provider.BaseProvider):
 
         :param str path: Path to the key you want to download
         :param dict \*\*kwargs: Additional arguments that are ignored
-        :rtype: :class:`waterbutler.core.streams.ResponseStreamReader`
+        :rtype: :class:`waterbutler.core.streams.ResponseStreamReader` or
+            :class:`waterbutler.core.streams.RangedResponseStream`
         :raises: :class:`waterbutler.core.exceptions.DownloadError`
         """
         if not path.is_file:
@@ -253,30 +254,29 @@ class S3CompatProvider(provider.BaseProvider):
             response_headers=response_headers
         )
 
-        headers = {}
-        raw_url = self.connection.add_auth('GET', url('GET'), headers)
-
-        resp = await self.make_request(
-            'GET',
-            raw_url,
-            range=range,
-            headers=headers,
-            expects=(200, 206),
-            throws=exceptions.DownloadError,
-        )
-
-        try:
-            get_etag = resp.headers['ETag'].replace('"', '')
-            if get_etag != pre_etag:
-                pre_size = None
-        except KeyError:
-            pre_size = None
+        async def fetch(byte_range):
+            headers = {}
+            raw_url = self.connection.add_auth('GET', url('GET'), headers)
+            return await self.make_request(
+                'GET',
+                raw_url,
+                range=byte_range,
+                headers=headers,
+                expects=(200, 206),
+                throws=exceptions.DownloadError,
+            )
 
-        download_stream = streams.ResponseStreamReader(resp)
+        download_stream = await self.ranged_download(fetch, range=range)
 
         if hasattr(download_stream, '_size') and download_stream._size is None:
             # if the GetObject API doesn't return Content-Length header,
             # use metadata content-size or range size instead of it.
+            try:
+                get_etag = download_stream.response.headers['ETag'].replace('"', '')
+                if get_etag != pre_etag:
+                    pre_size = None
+            except KeyError:
+                pre_size = None
             download_stream._size = pre_size
 
         return download_stream
@@ -761,6 +761,84 @@ class S3CompatProvider(provider.BaseProvider):
 
         return (await self._metadata_file(path, revision=revision))
 
+    async def metadata_page(self, path, page_size, cursor=None, **kwargs):
+        """Pages are bucket listings, the cursor is the listing's marker.  S3 counts common prefixes
+        as keys and a folder's own marker key is left out, so a page may come up one short."""
+        items = await self._metadata_folder(path, next_token=cursor, max_keys=page_size)
+        if items and isinstance(items[-1], str):
+            return items[:-1], items[-1]
+        return items, None
+
+    async def walk(self, path, max_depth=None, **kwargs):
+        """Without a delimiter a bucket listing returns every key under a prefix, so the tree is
+        listed a page at a time with no request per folder.  Folders that exist only as prefixes
+        of deeper keys are filled in as they first appear.  S3 can't stop at a depth, so with
+        ``max_depth`` deeper keys are still listed, just not yielded."""
+        prefix = path.full_path.lstrip('/')
+        seen = set()
+        marker = None
+        while True:
+            params = {'prefix': prefix, 'max-keys': '1000'}
+            if marker is not None:
+                params['marker'] = marker
+            resp = await self.make_request(
+                'GET',
+                functools.partial(self.bucket.generate_url, settings.TEMP_URL_SECS, 'GET'),
+                params=params,
+                expects=(200, ),
+                throws=exceptions.MetadataError,
+            )
+            parsed = xmltodict.parse(await resp.read(), strip_whitespace=False)['ListBucketResult']
+
+            contents = parsed.get('Contents', [])
+            if isinstance(contents, dict):
+                contents = [contents]
+
+            items = []
+            for content in contents:
+                # 'A/B/c.txt' -> ['A', 'B', 'c.txt'], the folder key 'A/B/' -> ['A', 'B', '']
+                parts = content['Key'][len(prefix):].split('/')
+                for depth in range(1, len(parts)):
+                    folder = prefix + '/'.join(parts[:depth]) + '/'
+                    if folder in seen or (max_depth is not None and depth > max_depth):
+                        continue
+                    seen.add(folder)
+                    if folder == content['Key']:
+                        items.append(S3CompatFolderKeyMetadata(self, content))
+                    else:
+                        items.append(S3CompatFolderMetadata(self, {'Prefix': folder}))
+                if parts[-1] and (max_depth is None or len(parts) <= max_depth):
+                    items.append(S3CompatFileMetadata(self, content))
+            yield items
+
+            if parsed.get('IsTruncated') != 'true' or not contents:
+                break
+            # NextMarker is only sent for listings with a delimiter
+            marker = parsed.get('NextMarker') or contents[-1]['Key']
+
+    async def probe(self, path, **kwargs):
+        """A folder exists if any key starts with its prefix, its own marker key included, so a
+        one key listing is enough to tell.  Files are checked with a HEAD, as for metadata."""
+        if not path.is_dir:
+            return await super().probe(path, **kwargs)
+        if path.is_root:
+            return True
+
+        params = {'prefix': path.full_path.lstrip('/'), 'max-keys': '1'}
+        resp = await self.make_request(
+            'GET',
+            functools.partial(self.bucket.generate_url, settings.TEMP_URL_SECS, 'GET'),
+            params=params,
+            expects=(200, 404, ),
+            throws=exceptions.MetadataError,
+        )
+        if resp.status == 404:
+            await resp.release()
+            return False
+        contents = await resp.read()
+        parsed = xmltodict.parse(contents, strip_whitespace=False)['ListBucketResult']
+        return bool(parsed.get('Contents'))
+
     def handle_data(self, data):
         token = None
         if not isinstance(data, S3CompatFileMetadataHeaders):
@@ -775,7 +853,7 @@ class S3CompatProvider(provider.BaseProvider):
         WaterButlerPath.validate_folder(path)
 
         if folder_precheck:
-            if (await self.exists(path)):
+            if (await self.probe(path)):
                 raise exceptions.FolderNamingConflict(path.name)
 
         async with self.request(
@@ -804,9 +882,9 @@ class S3CompatProvider(provider.BaseProvider):
         await resp.release()
         return S3CompatFileMetadataHeaders(self, path.full_path, resp.headers)
 
-    async def _metadata_folder(self, path, next_token=None):
+    async def _metadata_folder(self, path, next_token=None, max_keys=1000):
         prefix = path.full_path.lstrip('/')  # '/' -> '', '/A/B' -> 'A/B'
-        params = {'prefix': prefix, 'delimiter': '/', 'max-keys': '1000'}
+        params = {'prefix': prefix, 'delimiter': '/', 'max-keys': str(max_keys)}
         if next_token is not None:
             params['marker'] = next_token
         resp = await self.make_request(
@@ -12,6 +12,7 @@ from waterbutler.core import utils
 from waterbutler.core import signing
 from waterbutler.core import exceptions
 from waterbutler.server import settings
+from waterbutler.core.cache import metadata_cache
 from waterbutler.core import remote_logging
 from waterbutler.server.auth import AuthHandler
 from waterbutler.core.log_payload import LogPayload
@@ -68,6 +69,14 @@ class BaseHandler(server_utils.CORsMixin, server_utils.UtilMixin, tornado.web.Re
                 'message': self._reason,
             })
 
+    def on_finish(self):
+        # Whether or not it succeeded, a write may have changed folders listed in the cache
+        if self.request.method.upper() in {'PUT', 'POST', 'DELETE'}:
+            for name in ('provider', 'source_provider', 'destination_provider'):
+                provider = getattr(self, name, None)
+                if provider is not None:
+                    metadata_cache.invalidate_scope(provider)
+
 
 class BaseProviderHandler(BaseHandler):
 
@@ -95,10 +104,12 @@ class BaseProviderHandler(BaseHandler):
 
     def _send_hook(self, action, metadata=None, path=None):
         source = LogPayload(self.arguments['nid'], self.provider, metadata=metadata, path=path)
-        remote_logging.log_file_action(action, source=source, api_version='v0',
-                                       request=remote_logging._serialize_request(self.request),
-                                       bytes_downloaded=self.bytes_downloaded,
-                                       bytes_uploaded=self.bytes_uploaded)
+        self.log_futures = remote_logging.log_file_action(
+            action, source=source, api_version='v0',
+            request=remote_logging._serialize_request(self.request),
+            bytes_downloaded=self.bytes_downloaded,
+            bytes_uploaded=self.bytes_uploaded,
+        )
 
 
 class BaseCrossProviderHandler(BaseHandler):
@@ -144,7 +155,9 @@ class BaseCrossProviderHandler(BaseHandler):
                             path=self.json['source']['path'])
         destination = LogPayload(self.json['destination']['nid'], self.destination_provider,
                                  metadata=metadata)
-        remote_logging.log_file_action(action, source=source, destination=destination, api_version='v0',
-                                       request=remote_logging._serialize_request(self.request),
-                                       bytes_downloaded=self.bytes_downloaded,
-                                       bytes_uploaded=self.bytes_uploaded)
+        self.log_futures = remote_logging.log_file_action(
+            action, source=source, destination=destination, api_version='v0',
+            request=remote_logging._serialize_request(self.request),
+            bytes_downloaded=self.bytes_downloaded,
+            bytes_uploaded=self.bytes_uploaded,
+        )
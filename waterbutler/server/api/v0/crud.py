@@ -10,6 +10,7 @@ import tornado.platform.asyncio
 from waterbutler.core import mime_types
 from waterbutler.server import utils
 from waterbutler.server.api.v0 import core
+from waterbutler.server.metrics import track_upload
 from waterbutler.core.utils import make_disposition
 from waterbutler.core.streams import RequestStreamReader
 
@@ -43,8 +44,8 @@ class CRUDHandler(core.BaseProviderHandler):
 
             self.stream = RequestStreamReader(self.request, self.reader)
 
-            self.uploader = asyncio.ensure_future(self.provider.upload(self.stream,
-                                                 **self.arguments))
+            self.uploader = track_upload(asyncio.ensure_future(self.provider.upload(self.stream,
+                                                              **self.arguments)))
         else:
             self.stream = None
 
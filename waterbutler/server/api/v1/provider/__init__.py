@@ -1,3 +1,4 @@
+import json
 import uuid
 import socket
 import asyncio
@@ -11,12 +12,15 @@ import sentry_sdk
 
 from waterbutler.core import utils
 from waterbutler.server import settings
+from waterbutler.core.cache import metadata_cache
 from waterbutler.utils import inspect_info  # noqa
 from waterbutler.server.api.v1 import core
 from waterbutler.core import remote_logging
 from waterbutler.server.auth import AuthHandler
 from waterbutler.core.log_payload import LogPayload
+from waterbutler.server.metrics import track_upload
 from waterbutler.core.streams import RequestStreamReader
+from waterbutler.core.singleflight import SingleFlight
 from waterbutler.server.api.v1.provider.create import CreateMixin
 from waterbutler.auth.osf.handler import EXPORT_DATA_FAKE_NODE_ID
 from waterbutler.server.api.v1.provider.metadata import MetadataMixin
@@ -24,6 +28,7 @@ from waterbutler.server.api.v1.provider.movecopy import MoveCopyMixin
 
 logger = logging.getLogger(__name__)
 auth_handler = AuthHandler(settings.AUTH_HANDLERS)
+path_flight = SingleFlight('validate_v1_path')
 
 
 def list_or_value(value):
@@ -94,7 +99,7 @@ class ProviderHandler(core.BaseHandler, CreateMixin, MetadataMixin, MoveCopyMixi
             self.provider = utils.make_provider(
                 provider, self.auth['auth'],
                 self.auth['credentials'], self.auth['settings'])
-            self.path = await self.provider.validate_v1_path(self.path, **self.arguments)
+            self.path = await self.validate_path(self.provider, self.path)
 
         self.target_path = None
 
@@ -112,6 +117,21 @@ class ProviderHandler(core.BaseHandler, CreateMixin, MetadataMixin, MoveCopyMixi
 
         self.add_header('X-WATERBUTLER-REQUEST-ID', str(uuid.uuid4()))
 
+    async def validate_path(self, provider, path):
+        """Validate ``path`` with ``provider``.  Concurrent GET and HEAD requests validating the
+        same path with the same credentials and settings share one call to the provider."""
+        if self.request.method not in ('GET', 'HEAD'):
+            return (await provider.validate_v1_path(path, **self.arguments))
+
+        key = (
+            provider.NAME,
+            provider.credentials_hash,
+            json.dumps(provider.settings, sort_keys=True, default=str),
+            path,
+            json.dumps(self.arguments, sort_keys=True, default=str),
+        )
+        return (await path_flight.do(key, provider.validate_v1_path, path, **self.arguments))
+
     async def head(self, **_):
         """Get metadata for a folder or file
         """
@@ -161,11 +181,19 @@ class ProviderHandler(core.BaseHandler, CreateMixin, MetadataMixin, MoveCopyMixi
         _, self.writer = await asyncio.open_unix_connection(sock=self.wsock)
 
         self.stream = RequestStreamReader(self.request, self.reader)
-        self.uploader = asyncio.ensure_future(self.provider.upload(self.stream, self.target_path))
+        self.uploader = track_upload(
+            asyncio.ensure_future(self.provider.upload(self.stream, self.target_path)))
 
     def on_finish(self):
         status, method = self.get_status(), self.request.method.upper()
 
+        # Whether or not it succeeded, a write may have changed folders listed in the cache
+        if method in {'PUT', 'POST', 'DELETE'}:
+            for name in ('provider', 'dest_provider'):
+                provider = getattr(self, name, None)
+                if provider is not None:
+                    metadata_cache.invalidate_scope(provider)
+
         # If the response code is not within the 200-302 range, the request was a HEAD or OPTIONS,
         # the response code is 202, or the response was a 206 partial request, then no callbacks
         # should be sent and no metrics collected.  For 202s, celery will send its own callback.
@@ -228,7 +256,9 @@ class ProviderHandler(core.BaseHandler, CreateMixin, MetadataMixin, MoveCopyMixi
         else:
             return
 
-        remote_logging.log_file_action(action, source=source, destination=destination, api_version='v1',
-                                       request=remote_logging._serialize_request(self.request),
-                                       bytes_downloaded=self.bytes_downloaded,
-                                       bytes_uploaded=self.bytes_uploaded,)
+        self.log_futures = remote_logging.log_file_action(
+            action, source=source, destination=destination, api_version='v1',
+            request=remote_logging._serialize_request(self.request),
+            bytes_downloaded=self.bytes_downloaded,
+            bytes_uploaded=self.bytes_uploaded,
+        )
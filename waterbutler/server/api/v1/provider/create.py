@@ -1,3 +1,4 @@
+import asyncio
 import unicodedata
 
 from waterbutler.core import exceptions
@@ -60,28 +61,15 @@ class CreateMixin:
                 raise exceptions.InvalidParameters('Missing required parameter \'name\'')
             self.target_path = self.path.child(self.childs_name, folder=(self.kind == 'folder'))
 
-            # osfstorage, box, and googledrive need ids before calling exists()
-            validated_target_path = await self.provider.revalidate_path(
-                self.path, self.target_path.name, self.target_path.is_dir
-            )
-
-            my_type_exists = await self.provider.exists(validated_target_path)
-            if not isinstance(my_type_exists, bool) or my_type_exists:
-                raise exceptions.NamingConflict(self.target_path.name)
-
+            # Providers that disallow entities of different types having the same name also need
+            # the flipped kind checked.  The two checks don't depend on each other, so they're
+            # made concurrently.
+            checks = [self._child_exists(self.kind == 'folder')]
             if not self.provider.can_duplicate_names():
-                target_flipped = self.path.child(self.childs_name, folder=(self.kind != 'folder'))
+                checks.append(self._child_exists(self.kind != 'folder'))
 
-                # osfstorage, box, and googledrive need ids before calling exists(), but only box
-                # disallows can_duplicate_names and needs this.
-                validated_target_flipped = await self.provider.revalidate_path(
-                    self.path, target_flipped.name, target_flipped.is_dir
-                )
-
-                other_exists = await self.provider.exists(validated_target_flipped)
-                # the dropbox provider's metadata() method returns a [] here instead of True
-                if not isinstance(other_exists, bool) or other_exists:
-                    raise exceptions.NamingConflict(self.target_path.name)
+            if any(await asyncio.gather(*checks)):
+                raise exceptions.NamingConflict(self.target_path.name)
 
         else:
             if self.childs_name is not None:
@@ -100,6 +88,11 @@ class CreateMixin:
             if quota['used'] + file_size > quota['max']:
                 raise exceptions.NotEnoughQuotaError('You do not have enough available quota.')
 
+    async def _child_exists(self, folder):
+        # osfstorage, box, and googledrive need ids before probing
+        path = await self.provider.revalidate_path(self.path, self.childs_name, folder)
+        return await self.provider.probe(path)
+
     async def create_folder(self):
         self.metadata = await self.provider.create_folder(self.target_path)
         self.set_status(201)
@@ -8,6 +8,9 @@ from dateutil.parser import parse as datetime_parser
 
 from waterbutler.server import utils
 from waterbutler.core import mime_types
+from waterbutler.core import exceptions
+from waterbutler.server import settings
+from waterbutler.core.cache import metadata_cache
 from waterbutler.core.utils import make_disposition
 from waterbutler.core.streams import ResponseStreamReader
 
@@ -39,23 +42,122 @@ class MetadataMixin:
         if 'zip' in self.request.query_arguments:
             return (await self.download_folder_as_zip())
 
+        if 'recursive' in self.request.query_arguments:
+            return (await self.walk_folder())
+
         version = self.requested_version
 
         next_token = None
-        token = None
         if 'next_token' in self.request.query_arguments:
             next_token = self.request.query_arguments['next_token'][0].decode("utf-8")
 
+        page_size, cursor = self._page_arguments()
+
+        key = (
+            json.dumps(self.provider.settings, sort_keys=True, default=str),
+            self.path.full_path,
+            str(self.path.identifier),
+            self.resource,
+            version,
+            next_token,
+            page_size,
+            cursor,
+        )
+        self.set_header('Content-Type', 'application/json; charset=UTF-8')
+        self._listing_written = False
+        if page_size is None:
+            chunks = await metadata_cache.listing(self.provider, self.path, key,
+                                                  self._list_folder, version, next_token)
+        else:
+            chunks = await metadata_cache.listing(self.provider, self.path, key,
+                                                  self._list_folder_page, version, page_size, cursor)
+
+        if not self._listing_written:  # served from the cache
+            for chunk in chunks:
+                self.write(chunk)
+                await self.flush()
+
+    async def _list_folder(self, version, next_token):
+        """List the folder and write the listing a batch of entries at a time, see
+        `_write_listing`."""
+        token = None
         data = await self.provider.metadata(self.path, version=version, revision=version, next_token=next_token)
 
         if data and isinstance(data[-1], str):
             data, token = self.provider.handle_data(data)
 
-        ret = {'data': [x.json_api_serialized(self.resource) for x in data]}
-        if token is not None:
-            ret['next_token'] = token
-
-        return self.write(ret)
+        return (await self._write_listing(utils.encode_listing(data, self.resource, next_token=token)))
+
+    async def _write_listing(self, chunks):
+        """Write and flush the encoded chunks of a listing as they're produced, yielding to the
+        event loop in between so that huge folders don't stall other requests.  Returns the chunks
+        for the metadata cache to keep, or None when it's disabled or the listing is bigger than
+        ``MAX_CACHED_LISTING_SIZE``."""
+        kept = [] if metadata_cache.enabled else None
+        size = 0
+        self._listing_written = True
+        for chunk in chunks:
+            self.write(chunk)
+            await self.flush()
+            if kept is not None:
+                size += len(chunk)
+                if size > settings.MAX_CACHED_LISTING_SIZE:
+                    kept = None  # too big to cache, don't hold on to it
+                else:
+                    kept.append(chunk)
+        return kept
+
+    def _page_arguments(self):
+        """Pull ``page_size`` and ``cursor`` out of the query.  Asking for either one pages the
+        listing, ``page_size`` defaulting to ``MAX_PAGE_SIZE``.  Returns ``(None, None)`` for an
+        unpaged listing."""
+        page_size = self.get_query_argument('page_size', default=None)
+        cursor = self.get_query_argument('cursor', default=None)
+        if page_size is None and cursor is None:
+            return None, None
+
+        if page_size is None:
+            return settings.MAX_PAGE_SIZE, cursor
+        try:
+            page_size = int(page_size)
+        except ValueError:
+            page_size = 0
+        if not 0 < page_size <= settings.MAX_PAGE_SIZE:
+            raise exceptions.InvalidParameters(
+                'page_size must be an integer from 1 to {}'.format(settings.MAX_PAGE_SIZE)
+            )
+        return page_size, cursor
+
+    async def _list_folder_page(self, version, page_size, cursor):
+        """Like `_list_folder`, but for one page of the listing.  The cursor of the next page is
+        sent as ``next_cursor``, null on the last page."""
+        data, next_cursor = await self.provider.metadata_page(self.path, page_size, cursor=cursor,
+                                                              version=version, revision=version)
+
+        return (await self._write_listing(
+            utils.encode_listing(data, self.resource, extra={'next_cursor': next_cursor})
+        ))
+
+    async def walk_folder(self):
+        """Stream the metadata of everything under the folder as newline-delimited JSON, one
+        entity per line, in the order the provider lists them.  ``depth`` limits how many levels
+        are walked, ``depth=1`` being just the folder's children."""
+        depth = self.get_query_argument('depth', default=None)
+        if depth is not None:
+            try:
+                depth = int(depth)
+            except ValueError:
+                depth = 0
+            if depth < 1:
+                raise exceptions.InvalidParameters('depth must be a positive integer')
+
+        self.set_header('Content-Type', 'application/x-ndjson; charset=UTF-8')
+        async for entries in self.provider.walk(self.path, max_depth=depth):
+            for count, entry in enumerate(entries, 1):
+                self.write(json.dumps(entry.json_api_serialized(self.resource)) + '\n')
+                if count % settings.LISTING_BATCH_SIZE == 0:
+                    await self.flush()
+            await self.flush()
 
     async def get_file(self):
         if 'meta' in self.request.query_arguments:
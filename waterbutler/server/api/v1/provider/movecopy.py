@@ -1,4 +1,5 @@
 import json
+import asyncio
 from http import HTTPStatus
 
 from waterbutler import tasks
@@ -16,6 +17,24 @@ from waterbutler.tasks.settings import SYNCHRONOUS_TIMEOUT
 auth_handler = AuthHandler(settings.AUTH_HANDLERS)
 
 
+async def preflight(source, destination):
+    """Run the ``source`` and ``destination`` coroutines concurrently.  A source error wins: it
+    cancels the destination and is raised even if the destination failed first, so the client sees
+    the same error it would have if the two had run one after the other.
+    """
+    source = asyncio.ensure_future(source)
+    destination = asyncio.ensure_future(destination)
+    try:
+        await source
+    except BaseException:
+        if not destination.done():
+            destination.cancel()
+        elif not destination.cancelled():
+            destination.exception()  # superseded by the source error, mark it retrieved
+        raise
+    await destination
+
+
 class MoveCopyMixin:
 
     @property
@@ -53,6 +72,50 @@ class MoveCopyMixin:
             'provider': self.dest_provider.serialized()
         })
 
+    async def resolve_source(self, provider, auth_action):
+        """Authorize the source, build its provider and validate the source path.  Root folders
+        can only be copied under a new name."""
+        self.auth = await auth_handler.get(
+            self.resource,
+            provider,
+            self.request,
+            action=auth_action,
+            auth_type=AuthType.SOURCE,
+            path=self.path,
+            version=self.requested_version,
+            location_id=self.location_id,
+        )
+        self.provider = make_provider(
+            provider,
+            self.auth['auth'],
+            self.auth['credentials'],
+            self.auth['settings']
+        )
+        self.path = await self.provider.validate_v1_path(self.path, **self.arguments)
+
+        # for copy action, `auth_action` is the same as `provider_action`
+        if auth_action == 'copy' and self.path.is_root and not self.json.get('rename'):
+            raise exceptions.InvalidParameters('"rename" field is required for copying root')
+
+    async def resolve_destination(self, provider, path, auth_action):
+        """Authorize the destination, build its provider and validate the destination path."""
+        self.dest_auth = await auth_handler.get(
+            self.dest_resource,
+            provider,
+            self.request,
+            action=auth_action,
+            auth_type=AuthType.DESTINATION,
+            path=path,
+            location_id=self.location_id,
+        )
+        self.dest_provider = make_provider(
+            provider,
+            self.dest_auth['auth'],
+            self.dest_auth['credentials'],
+            self.dest_auth['settings']
+        )
+        self.dest_path = await self.dest_provider.validate_path(**self.json)
+
     async def move_or_copy(self):
         """Copy, move, and rename files and folders.
 
@@ -81,31 +144,7 @@ class MoveCopyMixin:
                 raise exceptions.InvalidParameters('"rename" field is required for renaming')
             provider_action = 'move'
 
-        if self.resource == EXPORT_DATA_FAKE_NODE_ID:
-            self.location_id = self.get_query_argument('location_id', default=None)
-
-        self.auth = await auth_handler.get(
-            self.resource,
-            provider,
-            self.request,
-            action=auth_action,
-            auth_type=AuthType.SOURCE,
-            path=self.path,
-            version=self.requested_version,
-            location_id=self.location_id,
-        )
-        self.provider = make_provider(
-            provider,
-            self.auth['auth'],
-            self.auth['credentials'],
-            self.auth['settings']
-        )
-        self.path = await self.provider.validate_v1_path(self.path, **self.arguments)
-
         if auth_action == 'rename':  # 'rename' implies the file/folder does not change location
-            self.dest_auth = self.auth
-            self.dest_provider = self.provider
-            self.dest_path = self.path.parent
             self.dest_resource = self.resource
         else:
             path = self.json.get('path', None)
@@ -115,35 +154,25 @@ class MoveCopyMixin:
                 raise exceptions.InvalidParameters(
                     '"path" field requires a trailing slash to indicate it is a folder'
                 )
-
-            # TODO optimize for same provider and resource
-
-            # for copy action, `auth_action` is the same as `provider_action`
-            if auth_action == 'copy' and self.path.is_root and not self.json.get('rename'):
-                raise exceptions.InvalidParameters('"rename" field is required for copying root')
-
             # Note: attached to self so that _send_hook has access to these
             self.dest_resource = self.json.get('resource', self.resource)
 
-            if self.dest_resource == EXPORT_DATA_FAKE_NODE_ID:
-                self.location_id = self.get_query_argument('location_id', default=None)
-
-            self.dest_auth = await auth_handler.get(
-                self.dest_resource,
-                self.json.get('provider', self.provider.NAME),
-                self.request,
-                action=auth_action,
-                auth_type=AuthType.DESTINATION,
-                path=path,
-                location_id=self.location_id,
-            )
-            self.dest_provider = make_provider(
-                self.json.get('provider', self.provider.NAME),
-                self.dest_auth['auth'],
-                self.dest_auth['credentials'],
-                self.dest_auth['settings']
+        if EXPORT_DATA_FAKE_NODE_ID in (self.resource, self.dest_resource):
+            self.location_id = self.get_query_argument('location_id', default=None)
+
+        if auth_action == 'rename':
+            await self.resolve_source(provider, auth_action)
+            self.dest_auth = self.auth
+            self.dest_provider = self.provider
+            self.dest_path = self.path.parent
+        else:
+            # TODO optimize for same provider and resource
+            # Source and destination don't depend on each other, so their auth and path validation
+            # round trips are made concurrently.
+            await preflight(
+                self.resolve_source(provider, auth_action),
+                self.resolve_destination(self.json.get('provider', provider), path, auth_action),
             )
-            self.dest_path = await self.dest_provider.validate_path(**self.json)
 
         if not getattr(self.provider, 'can_intra_' + provider_action)(self.dest_provider, self.path):
             # this weird signature syntax courtesy of py3.4 not liking trailing commas on kwargs
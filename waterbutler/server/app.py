@@ -14,8 +14,10 @@ from sentry_sdk.integrations.logging import LoggingIntegration
 from waterbutler import settings
 from waterbutler.server.api import v0
 from waterbutler.server.api import v1
+from waterbutler.server import metrics
 from waterbutler.server import handlers
 from waterbutler.version import __version__
+from waterbutler.core.registry import provider_pool, preload_providers
 from waterbutler.server import settings as server_settings
 
 logger = logging.getLogger(__name__)
@@ -33,6 +35,32 @@ def sig_handler(sig, frame):
     io_loop.add_callback_from_signal(stop_loop)
 
 
+def release_providers(handler):
+    """Put ``handler``'s providers back in the pool once the callbacks started by its `_send_hook`
+    are done, as they read the providers' metrics on later loop iterations."""
+    providers = [getattr(handler, name, None) for name in ('provider', 'dest_provider')]
+
+    def release(_=None):
+        for provider in providers:
+            provider_pool.release(provider)
+
+    log_futures = getattr(handler, 'log_futures', None)
+    if log_futures:
+        asyncio.gather(*log_futures, return_exceptions=True).add_done_callback(release)
+    else:
+        release()
+
+
+class Application(tornado.web.Application):
+
+    def log_request(self, handler):
+        metrics.record_request(handler)
+        super().log_request(handler)
+        # `on_finish` runs right after this, the callbacks it sends are only known after
+        if handler.get_status() < 500:
+            asyncio.get_event_loop().call_soon(release_providers, handler)
+
+
 def api_to_handlers(api):
     return [
         (os.path.join('/', api.PREFIX, pattern.lstrip('/')), handler)
@@ -52,10 +80,11 @@ def make_app(debug):
         integrations=[TornadoIntegration(), sentry_logging, ],
     )
 
-    app = tornado.web.Application(
+    app = Application(
         api_to_handlers(v0) +
         api_to_handlers(v1) +
-        [(r'/status', handlers.StatusHandler)],
+        [(r'/status', handlers.StatusHandler)] +
+        [(r'/metrics', handlers.MetricsHandler)],
         debug=debug,
         autoreload=False,
     )
@@ -64,6 +93,7 @@ def make_app(debug):
 
 def serve():
     app = make_app(server_settings.DEBUG)
+    preload_providers()
 
     ssl_options = None
     if server_settings.SSL_CERT_FILE and server_settings.SSL_KEY_FILE:
@@ -83,5 +113,6 @@ def serve():
     logger.info("Listening on {0}:{1}".format(server_settings.ADDRESS, server_settings.PORT))
 
     signal.signal(signal.SIGTERM, partial(sig_handler))
+    asyncio.ensure_future(metrics.monitor_loop_lag())
     asyncio.get_event_loop().set_debug(server_settings.DEBUG)
     asyncio.get_event_loop().run_forever()
@@ -1,13 +1,43 @@
+import hmac
+
 import tornado.web
 
 from waterbutler.version import __version__
+from waterbutler.server import settings
+from waterbutler.core.metrics import metrics_registry
+from waterbutler.core.circuitbreaker import circuit_breakers
+
+
+def is_internal(handler):
+    """Whether ``handler``'s request carries ``Authorization: Bearer <INTERNAL_API_TOKEN>``.
+    Always False if the token isn't set."""
+    if not settings.INTERNAL_API_TOKEN:
+        return False
+    expected = 'Bearer {}'.format(settings.INTERNAL_API_TOKEN)
+    return hmac.compare_digest(handler.request.headers.get('Authorization', ''), expected)
 
 
 class StatusHandler(tornado.web.RequestHandler):
 
     def get(self):
-        """List information about waterbutler status"""
+        """List information about waterbutler status.  Circuit breakers are only counted by state,
+        internal callers get the state of each upstream host."""
+        internal = is_internal(self)
         self.write({
             'status': 'up',
-            'version': __version__
+            'version': __version__,
+            'circuit_breakers': circuit_breakers.stats() if internal else circuit_breakers.summary(),
         })
+
+
+class MetricsHandler(tornado.web.RequestHandler):
+
+    def get(self):
+        """Process metrics in the Prometheus text exposition format.  404s unless
+        ``METRICS_ENABLED`` is set, and 403s without the ``INTERNAL_API_TOKEN`` if it's set."""
+        if not settings.METRICS_ENABLED:
+            raise tornado.web.HTTPError(404)
+        if settings.INTERNAL_API_TOKEN and not is_internal(self):
+            raise tornado.web.HTTPError(403)
+        self.set_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.write(metrics_registry.expose())
@@ -0,0 +1,110 @@
+import time
+import asyncio
+
+import tornado.web
+
+from waterbutler.server import settings
+from waterbutler.core.ratelimit import rate_limiter
+from waterbutler.core.sessions import session_pool
+from waterbutler.core.circuitbreaker import circuit_breakers
+from waterbutler.core.metrics import (CounterFamily, GaugeFamily, HistogramFamily,
+                                      metrics_registry)
+
+requests_total = metrics_registry.register(CounterFamily(
+    'waterbutler_requests_total',
+    'Requests handled, by handler, method and response status',
+    ('handler', 'method', 'status'),
+))
+request_duration = metrics_registry.register(HistogramFamily(
+    'waterbutler_request_duration_seconds',
+    'Time taken to handle requests, by handler and method',
+    ('handler', 'method'),
+))
+bytes_downloaded = metrics_registry.register(CounterFamily(
+    'waterbutler_downloaded_bytes_total',
+    'Bytes sent to clients',
+))
+bytes_uploaded = metrics_registry.register(CounterFamily(
+    'waterbutler_uploaded_bytes_total',
+    'Bytes received from clients',
+))
+uploads_in_flight = metrics_registry.register(GaugeFamily(
+    'waterbutler_uploads_in_flight',
+    'Uploads currently being streamed to a provider',
+))
+provider_events = metrics_registry.register(CounterFamily(
+    'waterbutler_provider_events_total',
+    'Upstream request events recorded by providers, rolled up from their metrics records',
+    ('provider', 'event'),
+))
+loop_lag = metrics_registry.register(HistogramFamily(
+    'waterbutler_event_loop_lag_seconds',
+    'How late the event loop woke up from a sleep',
+    (),
+    buckets=(.001, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5),
+))
+metrics_registry.register(GaugeFamily(
+    'waterbutler_upstream_sessions',
+    'Sessions held open by the upstream session pool',
+    callback=lambda: {(): session_pool.stats()['sessions']},
+))
+metrics_registry.register(GaugeFamily(
+    'waterbutler_upstream_circuits_open',
+    'Upstream hosts whose circuit breaker is open or half-open',
+    callback=lambda: {(): sum(1 for stats in circuit_breakers.stats().values()
+                              if stats['state'] != 'closed')},
+))
+metrics_registry.register(CounterFamily(
+    'waterbutler_rate_limit_wait_seconds_total',
+    'Time spent waiting on upstream rate limits, by provider',
+    ('provider', ),
+    callback=lambda: {(name, ): stats['wait_time']
+                      for name, stats in rate_limiter.stats().items()},
+))
+
+
+def record_request(handler: tornado.web.RequestHandler) -> None:
+    """Record a finished request.  Called by `waterbutler.server.app.Application.log_request`."""
+    name = type(handler).__name__
+    method = handler.request.method
+    requests_total.inc(name, method, str(handler.get_status()))
+    request_duration.observe(handler.request.request_time(), name, method)
+
+    bytes_downloaded.inc(amount=getattr(handler, 'bytes_downloaded', 0))
+    bytes_uploaded.inc(amount=getattr(handler, 'bytes_uploaded', 0))
+
+    for attr in ('provider', 'dest_provider'):
+        provider = getattr(handler, attr, None)
+        if provider is not None:
+            record_provider(provider)
+
+
+def record_provider(provider) -> None:
+    """Roll up the numeric ``requests.*`` entries of a provider's metrics record."""
+    requests = provider.provider_metrics.serialize().get('requests', {})
+    for event, value in _flatten(requests):
+        provider_events.inc(provider.NAME, event, amount=value)
+
+
+def _flatten(metrics, prefix=''):
+    for key, value in metrics.items():
+        if isinstance(value, dict):
+            yield from _flatten(value, '{}{}.'.format(prefix, key))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield prefix + key, value
+
+
+def track_upload(uploader: asyncio.Future) -> asyncio.Future:
+    """Count ``uploader`` in ``uploads_in_flight`` until it is done."""
+    uploads_in_flight.inc()
+    uploader.add_done_callback(lambda _: uploads_in_flight.dec())
+    return uploader
+
+
+async def monitor_loop_lag(interval: float=settings.LOOP_LAG_INTERVAL) -> None:
+    """Measure how late the event loop wakes up from ``interval`` second sleeps.  A loop blocked
+    by CPU-bound work or blocking I/O shows up here long before requests start timing out."""
+    while True:
+        start = time.monotonic()
+        await asyncio.sleep(interval)
+        loop_lag.observe(max(0.0, time.monotonic() - start - interval))
@@ -18,8 +18,38 @@ XHEADERS = config.get_bool('XHEADERS', False)
 CORS_ALLOW_ORIGIN = config.get('CORS_ALLOW_ORIGIN', '*')
 
 CHUNK_SIZE = int(config.get('CHUNK_SIZE', 65536))  # 64KB
+# Streaming transfers grow or shrink their chunks from CHUNK_SIZE, between CHUNK_SIZE_MIN and
+# CHUNK_SIZE_MAX, aiming for chunks that take about CHUNK_TARGET_SECONDS to send.  See
+# `core.chunking.AdaptiveChunkSize`
+ADAPTIVE_CHUNK_SIZE = config.get_bool('ADAPTIVE_CHUNK_SIZE', True)
+CHUNK_SIZE_MIN = int(config.get('CHUNK_SIZE_MIN', 16384))  # 16KB
+CHUNK_SIZE_MAX = int(config.get('CHUNK_SIZE_MAX', 262144))  # 256KB
+CHUNK_TARGET_SECONDS = float(config.get('CHUNK_TARGET_SECONDS', 0.05))
+# Downloads read up to WRITE_STREAM_READ_AHEAD chunks (at least one) ahead of the client, so up to
+# WRITE_STREAM_READ_AHEAD * CHUNK_SIZE_MAX bytes are buffered per download.  Writes are flushed once
+# WRITE_STREAM_FLUSH_SIZE bytes are waiting to be sent, see `UtilMixin.write_stream`
+WRITE_STREAM_READ_AHEAD = max(int(config.get('WRITE_STREAM_READ_AHEAD', 4)), 1)
+WRITE_STREAM_FLUSH_SIZE = int(config.get('WRITE_STREAM_FLUSH_SIZE', 4 * 65536))  # 256KB
+# Send local files with sendfile instead of reading them through, see `UtilMixin.write_file`
+ZERO_COPY_DOWNLOADS = config.get_bool('ZERO_COPY_DOWNLOADS', True)
+# Folder listing entries serialized and encoded at a time, see `server.utils.encode_listing`
+LISTING_BATCH_SIZE = int(config.get('LISTING_BATCH_SIZE', 500))
+# Folder listings bigger than this many encoded bytes are streamed without being kept for the
+# metadata cache, see `core.cache.MetadataCache`
+MAX_CACHED_LISTING_SIZE = int(config.get('MAX_CACHED_LISTING_SIZE', 4194304))  # 4MB
+# Largest ``page_size`` a paged folder listing may ask for, also the default page size
+MAX_PAGE_SIZE = int(config.get('MAX_PAGE_SIZE', 1000))
 MAX_BODY_SIZE = int(config.get('MAX_BODY_SIZE', int(50 * (1024 ** 3))))  # 50 GB
 
+# Bearer token internal callers send to see details not meant for the public API port, such as
+# the circuit breaker state of each upstream host on /status.  Unset, nobody sees them.
+INTERNAL_API_TOKEN = config.get_nullable('INTERNAL_API_TOKEN', None)
+# Serve process metrics on /metrics.  They name providers, endpoints and upstream hosts, so they are
+# off by default, and only sent with the INTERNAL_API_TOKEN when that is set.
+METRICS_ENABLED = config.get_bool('METRICS_ENABLED', False)
+
+LOOP_LAG_INTERVAL = float(config.get('LOOP_LAG_INTERVAL', 1))  # seconds between event loop lag probes
+
 AUTH_HANDLERS = config.get('AUTH_HANDLERS', [
     'osf',
 ])
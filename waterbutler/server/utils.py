@@ -1,6 +1,20 @@
+import os
+import time
+import typing
+import asyncio
+
+import tornado.escape
 import tornado.iostream
+import tornado.http1connection
 
 from waterbutler.server import settings
+from waterbutler.core.chunking import AdaptiveChunkSize
+
+# `UtilMixin._sendfile` writes to the socket behind tornado's back: it waits on the fd of the
+# connection's IOStream with the event loop's own add_writer/remove_writer, and accounts for what it
+# sent in HTTP1Connection's private ``_expected_content_remaining``.  Both were checked against
+# tornado 6.0 (the version pinned in requirements.txt); other versions read files through.
+SENDFILE_TORNADO_VERSIONS = ((6, 0), )
 
 CORS_ACCEPT_HEADERS = [
     'Range',
@@ -72,6 +86,38 @@ def parse_request_range(range_header):
     return (start, end)
 
 
+def encode_listing(items: typing.Iterable, resource: str, next_token: str=None,
+                   batch_size: int=None, extra: dict=None) -> typing.Iterator[bytes]:
+    """Encode a folder listing as the JSON document ``{"data": [...], "next_token": ...}`` in
+    chunks of ``batch_size`` entries, serializing each entry only when its chunk is encoded.  The
+    result is byte for byte what ``RequestHandler.write`` would produce for the whole document,
+    without ever holding every serialized entry at once.
+
+    :param items: the metadata objects to list
+    :param str resource: the resource ids in the serialized links refer to
+    :param str next_token: if not None, appended as ``next_token``
+    :param int batch_size: entries per chunk, ``LISTING_BATCH_SIZE`` by default
+    :param dict extra: more top-level keys, appended after ``data`` and ``next_token``
+    :rtype: iterator of `bytes`
+    """
+    batch_size = batch_size or settings.LISTING_BATCH_SIZE
+    head, batch = '{"data": [', []
+    for item in items:
+        batch.append(tornado.escape.json_encode(item.json_api_serialized(resource)))
+        if len(batch) == batch_size:
+            yield (head + ', '.join(batch)).encode('utf-8')
+            head, batch = ', ', []
+
+    tail = ']'
+    if next_token is not None:
+        tail += ', "next_token": ' + tornado.escape.json_encode(next_token)
+    for name, value in (extra or {}).items():
+        tail += ', {}: {}'.format(tornado.escape.json_encode(name), tornado.escape.json_encode(value))
+    if not batch and head == ', ':  # nothing left to separate from the previous chunk
+        head = ''
+    yield (head + ', '.join(batch) + tail + '}').encode('utf-8')
+
+
 class CORsMixin:
 
     def _cross_origin_is_allowed(self):
@@ -122,19 +168,133 @@ class UtilMixin:
         return super().set_status(code, reason or HTTP_REASONS.get(code))
 
     async def write_stream(self, stream):
+        """Send ``stream`` as the response body.  Reading from the stream and writing to the
+        client overlap: a reader task keeps up to ``WRITE_STREAM_READ_AHEAD`` chunks queued while
+        the client drains what's been written.  Writes are flushed once ``WRITE_STREAM_FLUSH_SIZE``
+        bytes are waiting, or as soon as the queue runs dry.  Chunks are sized by an
+        `AdaptiveChunkSize` fed with how long flushes take and how full the queue is.  Streams that
+        can be closed are closed once sent, or once the client goes away."""
+        try:
+            file_range = self._zero_copy_range(stream)
+            if file_range is not None and (await self.write_file(*file_range)):
+                return
+            return (await self._write_chunks(stream))
+        finally:
+            if hasattr(stream, 'close'):
+                stream.close()
+
+    async def _write_chunks(self, stream):
+        # a maxsize of 0 would make the queue unbounded
+        queue = asyncio.Queue(maxsize=max(settings.WRITE_STREAM_READ_AHEAD, 1))
+        chunking = AdaptiveChunkSize('download')
+        reader = asyncio.ensure_future(self._read_ahead(stream, queue, chunking))
+        unflushed = 0
         try:
             while True:
-                chunk = await stream.read(settings.CHUNK_SIZE)
-                if not chunk:
+                chunk = await queue.get()
+                if chunk is None:
                     break
-                # Temp fix, write does not accept bytearrays currently
-                if isinstance(chunk, bytearray):
-                    chunk = bytes(chunk)
                 self.write(chunk)
                 self.bytes_downloaded += len(chunk)
+                unflushed += len(chunk)
                 del chunk
+                if unflushed >= settings.WRITE_STREAM_FLUSH_SIZE or queue.empty():
+                    backlog = queue.qsize() / queue.maxsize
+                    start = time.monotonic()
+                    await self.flush()
+                    chunking.record(unflushed, time.monotonic() - start, backlog)
+                    unflushed = 0
+            if unflushed:
                 await self.flush()
+            # re-raises whatever stopped the reader early
+            await reader
         except tornado.iostream.StreamClosedError:
             # Client has disconnected early.
             # No need for any exception to be raised
             return
+        finally:
+            reader.cancel()
+
+    async def _read_ahead(self, stream, queue, chunking):
+        """Read ``stream`` into ``queue`` until it's exhausted or fails, then queue None."""
+        try:
+            while True:
+                chunk = await stream.read(chunking.size)
+                if not chunk:
+                    break
+                # Temp fix, write does not accept bytearrays currently
+                if isinstance(chunk, bytearray):
+                    chunk = bytes(chunk)
+                await queue.put(chunk)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            await queue.put(None)
+            raise
+        await queue.put(None)
+
+    def _zero_copy_range(self, stream):
+        """The ``(file_pointer, offset, count)`` to send for ``stream`` with `write_file`, or None
+        if it has to be read through.  Only plain HTTP/1 responses with a matching Content-Length
+        qualify, as anything else needs the body framed or encoded on its way out."""
+        if not settings.ZERO_COPY_DOWNLOADS or not hasattr(stream, 'file_range'):
+            return None
+        if not isinstance(self.request.connection, tornado.http1connection.HTTP1Connection):
+            return None
+
+        file_range = stream.file_range()
+        if file_range is None or self._headers.get('Content-Length') != str(file_range[2]):
+            return None
+        return file_range
+
+    async def write_file(self, file_pointer, offset, count):
+        """Send ``count`` bytes of ``file_pointer`` from ``offset`` as the response body, without
+        copying them through Python: the kernel copies them straight to the socket with
+        ``os.sendfile``.  Returns False, with only the headers sent, where `_can_sendfile` says
+        no, e.g. over TLS.  The file then has to be read through the stream's own ``pread`` calls,
+        which simply come up short if the file is truncated meanwhile."""
+        try:
+            await self.flush()
+            if count == 0:
+                return True
+            connection = self.request.connection
+            if not self._can_sendfile(connection):
+                return False
+            await self._sendfile(connection, file_pointer.fileno(), offset, count)
+        except (tornado.iostream.StreamClosedError, ConnectionError):
+            # Client has disconnected early.
+            # No need for any exception to be raised
+            pass
+        return True
+
+    @staticmethod
+    def _can_sendfile(connection):
+        """Whether `_sendfile` can be used on ``connection``, see ``SENDFILE_TORNADO_VERSIONS``."""
+        return (
+            hasattr(os, 'sendfile') and
+            tornado.version_info[:2] in SENDFILE_TORNADO_VERSIONS and
+            type(connection.stream) is tornado.iostream.IOStream and
+            isinstance(getattr(connection, '_expected_content_remaining', None), int)
+        )
+
+    async def _sendfile(self, connection, file_fd, offset, count):
+        sock_fd = connection.stream.socket.fileno()
+        loop = asyncio.get_event_loop()
+        end = offset + count
+        while offset < end:
+            try:
+                sent = os.sendfile(sock_fd, file_fd, offset, end - offset)
+            except BlockingIOError:
+                writable = loop.create_future()
+                loop.add_writer(sock_fd, writable.set_result, None)
+                try:
+                    await writable
+                finally:
+                    loop.remove_writer(sock_fd)
+                continue
+            if sent == 0:  # the file was truncated under us
+                raise tornado.iostream.StreamClosedError()
+            offset += sent
+            self.bytes_downloaded += sent
+            # tornado checks the body it wrote against Content-Length when the request finishes
+            connection._expected_content_remaining -= sent
@@ -156,6 +156,25 @@ def child(key):
 
 DEBUG = config.get_bool('DEBUG', True)
 OP_CONCURRENCY = int(config.get('OP_CONCURRENCY', 5))
+# Folder listings in flight at once while walking a tree, see `BaseProvider.walk`
+WALK_CONCURRENCY = int(config.get('WALK_CONCURRENCY', 10))
+# Local files are read on a pool of FILE_READ_WORKERS threads, each stream keeping up to
+# FILE_READ_AHEAD chunks past the one being read in flight, see `streams.FileStreamReader`
+FILE_READ_WORKERS = int(config.get('FILE_READ_WORKERS', 8))
+FILE_READ_AHEAD = int(config.get('FILE_READ_AHEAD', 2))
+# Downloads from object stores that support it ask for the first PARALLEL_DOWNLOAD_THRESHOLD
+# bytes, and fetch whatever is past that as PARALLEL_DOWNLOAD_PART_SIZE byte ranges, up to
+# PARALLEL_DOWNLOAD_CONCURRENCY at a time, see `BaseProvider.ranged_download`.  Only copies and
+# moves run by celery do so unless PARALLEL_DOWNLOADS_SERVER is set: downloads sent to clients are
+# usually paced by the client, and parts fetched ahead would just sit in the server's memory.
+PARALLEL_DOWNLOADS = config.get_bool('PARALLEL_DOWNLOADS', True)
+PARALLEL_DOWNLOADS_SERVER = config.get_bool('PARALLEL_DOWNLOADS_SERVER', False)
+PARALLEL_DOWNLOAD_THRESHOLD = int(config.get('PARALLEL_DOWNLOAD_THRESHOLD', 16 * 1024 * 1024))
+PARALLEL_DOWNLOAD_PART_SIZE = int(config.get('PARALLEL_DOWNLOAD_PART_SIZE', 8 * 1024 * 1024))
+PARALLEL_DOWNLOAD_CONCURRENCY = int(config.get('PARALLEL_DOWNLOAD_CONCURRENCY', 4))
+# Parts fetched ahead by every parallel download of the process hold at most
+# PARALLEL_DOWNLOAD_MAX_BUFFER bytes, past that downloads read their parts as they arrive
+PARALLEL_DOWNLOAD_MAX_BUFFER = int(config.get('PARALLEL_DOWNLOAD_MAX_BUFFER', 128 * 1024 * 1024))
 
 logging_config = config.get('LOGGING', DEFAULT_LOGGING_CONFIG)
 logging.config.dictConfig(logging_config)
@@ -182,5 +201,62 @@ WEBDAV_METHODS = {'PROPFIND', 'MKCOL', 'MOVE', 'COPY'}
 
 AIOHTTP_TIMEOUT = int(config.get('AIOHTTP_TIMEOUT', 3600))  # time in seconds
 
+# Upstream sessions are pooled process-wide, one per event loop and upstream origin.  See
+# `waterbutler.core.sessions.SessionPool` for what each of these control.
+SESSION_POOL_LIMIT = int(config.get('SESSION_POOL_LIMIT', 100))
+SESSION_POOL_LIMIT_PER_HOST = int(config.get('SESSION_POOL_LIMIT_PER_HOST', 0))
+SESSION_POOL_KEEPALIVE_TIMEOUT = float(config.get('SESSION_POOL_KEEPALIVE_TIMEOUT', 15))  # seconds
+SESSION_POOL_DNS_CACHE_TTL = int(config.get('SESSION_POOL_DNS_CACHE_TTL', 10))  # seconds
+SESSION_POOL_IDLE_TIMEOUT = float(config.get('SESSION_POOL_IDLE_TIMEOUT', 300))  # seconds
+
+# Default pacing of upstream requests, per provider, upstream host and credentials.  Providers may
+# set their own `RATE_LIMIT`.  A rate of 0 disables rate limiting.
+RATE_LIMIT = float(config.get('RATE_LIMIT', 10))  # requests per second
+RATE_LIMIT_BURST = float(config.get('RATE_LIMIT_BURST', 10))
+
+# Timing of `make_request` retries.  See `waterbutler.core.retry.RetryPolicy`.
+RETRY_BACKOFF_BASE = float(config.get('RETRY_BACKOFF_BASE', 1))  # seconds
+RETRY_BACKOFF_CAP = float(config.get('RETRY_BACKOFF_CAP', 30))  # seconds
+RETRY_DEADLINE = float(config.get('RETRY_DEADLINE', 60)) or None  # seconds, 0 disables
+RETRY_MAX_RETRY_AFTER = float(config.get('RETRY_MAX_RETRY_AFTER', 60))  # seconds
+
+# Per upstream host circuit breaking in `make_request`.  See `waterbutler.core.circuitbreaker`.  A
+# threshold of 0 disables it.
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = int(config.get('CIRCUIT_BREAKER_FAILURE_THRESHOLD', 5))
+CIRCUIT_BREAKER_RECOVERY_TIMEOUT = float(config.get('CIRCUIT_BREAKER_RECOVERY_TIMEOUT', 30))  # seconds
+
+# Per phase latency histograms of upstream requests.  See `waterbutler.core.tracing`.
+UPSTREAM_TRACING = config.get_bool('UPSTREAM_TRACING', True)
+TRACE_MAX_ENDPOINTS = int(config.get('TRACE_MAX_ENDPOINTS', 50))  # per provider
+
+# Providers this deployment may use, all of them if empty.  Provider modules are imported on first
+# use unless PRELOAD_PROVIDERS is set, in which case they are all imported at startup and the
+# time spent on each is logged.  See `waterbutler.core.registry.ProviderRegistry`.
+ENABLED_PROVIDERS = set(config.get_object('ENABLED_PROVIDERS', []))
+PRELOAD_PROVIDERS = config.get_bool('PRELOAD_PROVIDERS', False)
+
+# Idle provider instances kept for reuse by later requests with the same auth, credentials and
+# settings.  See `waterbutler.core.registry.ProviderPool`.  A size of 0 disables the pool.
+PROVIDER_POOL_SIZE = int(config.get('PROVIDER_POOL_SIZE', 0))
+PROVIDER_POOL_IDLE_TIMEOUT = float(config.get('PROVIDER_POOL_IDLE_TIMEOUT', 60))  # seconds
+
+# Path segment to id lookups remembered by ID-based providers.  See
+# `waterbutler.core.cache.PathIdCache`.  A ttl or size of 0 disables the cache.
+PATH_ID_CACHE_TTL = float(config.get('PATH_ID_CACHE_TTL', 30))  # seconds
+PATH_ID_CACHE_MAX_SIZE = int(config.get('PATH_ID_CACHE_MAX_SIZE', 10000))
+
+# Folder listings served from memory.  See `waterbutler.core.cache.MetadataCache`.  A listing is
+# served as is for METADATA_CACHE_TTL seconds, after which providers that can cheaply tell whether
+# a folder changed keep serving it until METADATA_CACHE_MAX_AGE.  A ttl or size of 0 disables the
+# cache.  At most METADATA_CACHE_MAX_SIZE listings adding up to METADATA_CACHE_MAX_BYTES are kept.
+# The cache lives in each server process and a write only drops the listings of the process that
+# handled it.  Other processes and hosts, and every process after a write made outside WaterButler,
+# keep serving the old listing for up to METADATA_CACHE_TTL seconds.  Set it to 0 where that
+# staleness is not acceptable.
+METADATA_CACHE_TTL = float(config.get('METADATA_CACHE_TTL', 10))  # seconds
+METADATA_CACHE_MAX_AGE = float(config.get('METADATA_CACHE_MAX_AGE', 300))  # seconds
+METADATA_CACHE_MAX_SIZE = int(config.get('METADATA_CACHE_MAX_SIZE', 1000))
+METADATA_CACHE_MAX_BYTES = int(config.get('METADATA_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
 OSF_URL = config.get('OSF_URL', 'http://192.168.168.167:5000')
 FILENAME_NORMALIZATION_RULE = config.get('FILENAME_NORMALIZATION_RULE', 'NFC')
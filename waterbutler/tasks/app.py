@@ -1,7 +1,7 @@
 import logging
 
 from celery import Celery
-from celery.signals import task_failure
+from celery.signals import task_failure, worker_init
 
 import sentry_sdk
 from sentry_sdk.integrations.celery import CeleryIntegration
@@ -9,6 +9,7 @@ from sentry_sdk.integrations.logging import LoggingIntegration
 
 from waterbutler.settings import config
 from waterbutler.version import __version__
+from waterbutler.core.registry import preload_providers
 from waterbutler.tasks import settings as tasks_settings
 
 logger = logging.getLogger(__name__)
@@ -16,6 +17,9 @@ logger = logging.getLogger(__name__)
 app = Celery()
 app.config_from_object(tasks_settings)
 
+# Forked worker processes inherit whatever the parent imported
+worker_init.connect(lambda **_: preload_providers(), weak=False)
+
 
 def register_signal():
     """Adapted from `raven.contrib.celery.register_signal`. Remove args and
@@ -9,9 +9,16 @@ from celery.backends.base import DisabledBackend
 from waterbutler.tasks import app
 from waterbutler.tasks import settings
 from waterbutler.tasks import exceptions
+from waterbutler.core.metrics import CounterFamily, metrics_registry
 
 logger = logging.getLogger(__name__)
 
+tasks_enqueued = metrics_registry.register(CounterFamily(
+    'waterbutler_celery_tasks_enqueued_total',
+    'Tasks sent to celery from this process, by task name',
+    ('task', ),
+))
+
 
 def ensure_event_loop():
     """Ensure the existance of an eventloop
@@ -100,7 +107,14 @@ def celery_task(func, *args, **kwargs):
     logger.debug('celery_task: task_func:({})'.format(task_func))
 
     task = app.task(task_func, **kwargs)
-    task.adelay = backgroundify(task.delay)
+    delay = backgroundify(task.delay)
+
+    @functools.wraps(delay)
+    async def adelay(*args, **kwargs):
+        tasks_enqueued.inc(task.name)
+        return (await delay(*args, **kwargs))
+
+    task.adelay = adelay
 
     return task
 